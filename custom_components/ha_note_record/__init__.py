@@ -2,76 +2,213 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+from functools import partial
+import importlib
 import logging
+import time
+from types import ModuleType
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN, PLATFORMS
-from .panel import async_register_panel, async_unregister_panel
-from .store import HaNoteRecordStore
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.start import async_at_started
+
+from . import startup
+from .archive import NoteArchive, async_archive_stale
+from .attachments import async_setup_attachments
+from .const import (
+    ARCHIVE_CHECK_INTERVAL,
+    CONF_ARCHIVE_AFTER_DAYS,
+    CONF_DEDUPLICATE_BODIES,
+    CONF_DURABLE_WRITES,
+    CONF_STATISTICS_SENSORS,
+    DOMAIN,
+    PLATFORMS,
+    STATISTICS_PLATFORMS,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .registry import UNIQUE_ID_MINOR_VERSION, async_migrate_unique_ids
+from .rest_api import async_register_rest_api
+from .services import async_setup_services
+from .store import HaNoteRecordStorage, HaNoteRecordStore, journal_path
 from .websocket_api import async_register_websocket_api
 
+# Our modules' import cost; the panel module is imported when the panel is
+# registered, after startup
+IMPORT_DURATION = time.perf_counter() - startup.IMPORT_STARTED
+
 _LOGGER = logging.getLogger(__name__)
 
 type HaNoteRecordConfigEntry = ConfigEntry[HaNoteRecordStore]
 
 DATA_PANEL_REGISTERED = f"{DOMAIN}_panel_registered"
+DATA_PANEL_UNSUB = f"{DOMAIN}_panel_unsub"
 DATA_WS_REGISTERED = f"{DOMAIN}_ws_registered"
+DATA_TIMINGS = "timings"
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Ha Note Record component."""
-    hass.data.setdefault(DOMAIN, {})
+    hass.data.setdefault(DOMAIN, {})[DATA_TIMINGS] = {
+        "import": IMPORT_DURATION,
+        "panel": None,
+        "entries": {},
+    }
+    async_setup_services(hass)
+    async_setup_attachments(hass)
+    return True
+
+
+async def _async_import_panel(hass: HomeAssistant) -> ModuleType:
+    """Import the panel module without blocking the event loop."""
+    return await hass.async_add_import_executor_job(
+        importlib.import_module, f"{__name__}.panel"
+    )
+
+
+async def _async_register_panel(hass: HomeAssistant) -> None:
+    """Build the panel assets and register the panel."""
+    hass.data.pop(DATA_PANEL_UNSUB, None)
+    start = time.perf_counter()
+    panel = await _async_import_panel(hass)
+    await panel.async_register_panel(hass)
+    if not hass.data.get(DATA_PANEL_REGISTERED):
+        # The last notebook was unloaded while the assets were being built
+        await panel.async_unregister_panel(hass)
+        return
+    hass.data[DOMAIN][DATA_TIMINGS]["panel"] = time.perf_counter() - start
+
+
+def _storage_key(entry: ConfigEntry) -> str:
+    """Return the storage key of a notebook.
+
+    The original single-instance entry keeps the legacy file; every other
+    notebook gets its own file, so saves never contend across notebooks.
+    """
+    if entry.unique_id == DOMAIN:
+        return STORAGE_KEY
+    return f"{STORAGE_KEY}.{entry.entry_id}"
+
+
+def _platforms(entry: ConfigEntry) -> list[str]:
+    """Return the platforms a notebook sets up."""
+    if entry.options.get(CONF_STATISTICS_SENSORS, False):
+        return [*PLATFORMS, *STATISTICS_PLATFORMS]
+    return list(PLATFORMS)
+
+
+async def async_migrate_entry(
+    hass: HomeAssistant, entry: HaNoteRecordConfigEntry
+) -> bool:
+    """Migrate a notebook's config entry to the current version."""
+    if entry.version > 1:
+        return False
+    if entry.minor_version < UNIQUE_ID_MINOR_VERSION:
+        await async_migrate_unique_ids(hass, entry)
+        hass.config_entries.async_update_entry(
+            entry, minor_version=UNIQUE_ID_MINOR_VERSION
+        )
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: HaNoteRecordConfigEntry) -> bool:
     """Set up Ha Note Record from a config entry."""
-    store = HaNoteRecordStore(hass)
+    start = time.perf_counter()
+    store = HaNoteRecordStore(
+        hass,
+        _storage_key(entry),
+        dedupe_storage=entry.options.get(CONF_DEDUPLICATE_BODIES, False),
+        durable=entry.options.get(CONF_DURABLE_WRITES, False),
+    )
     await store.async_load()
+    entry.async_on_unload(store.expiry.async_stop)
 
     entry.runtime_data = store
-    hass.data[DOMAIN]["store"] = store
 
     # Register WebSocket API (once, idempotent)
     if not hass.data.get(DATA_WS_REGISTERED):
         async_register_websocket_api(hass)
         hass.data[DATA_WS_REGISTERED] = True
+    async_register_rest_api(hass)
 
-    # Register panel (only once) — set flag before await to prevent race
+    # Register the panel once. Hashing and compressing its assets waits
+    # until Home Assistant has started, so it does not delay boot.
     if not hass.data.get(DATA_PANEL_REGISTERED):
         hass.data[DATA_PANEL_REGISTERED] = True
-        await async_register_panel(hass)
-
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        if hass.state is CoreState.running:
+            await _async_register_panel(hass)
+        else:
+            hass.data[DATA_PANEL_UNSUB] = async_at_started(
+                hass, _async_register_panel
+            )
+
+    await hass.config_entries.async_forward_entry_setups(entry, _platforms(entry))
+
+    if archive_after_days := entry.options.get(CONF_ARCHIVE_AFTER_DAYS, 0):
+        max_age = timedelta(days=archive_after_days)
+
+        async def _async_archive_stale(now: datetime) -> None:
+            """Archive notes untouched for the configured period."""
+            await async_archive_stale(hass, store, max_age, now)
+
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass,
+                _async_archive_stale,
+                timedelta(seconds=ARCHIVE_CHECK_INTERVAL),
+                cancel_on_shutdown=True,
+            )
+        )
 
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
+    hass.data[DOMAIN][DATA_TIMINGS]["entries"][entry.entry_id] = (
+        time.perf_counter() - start
+    )
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: HaNoteRecordConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, _platforms(entry)
+    )
 
-    # Unregister panel if this is the last entry
     if unload_ok:
+        # A journaled mutation returns before its snapshot is written; let
+        # that write finish before a reload opens the same files
+        await entry.runtime_data.async_flush()
+
+        # Unregister panel if this is the last entry
         remaining_entries = [
             e for e in hass.config_entries.async_entries(DOMAIN)
             if e.entry_id != entry.entry_id
         ]
         if not remaining_entries and hass.data.get(DATA_PANEL_REGISTERED):
-            await async_unregister_panel(hass)
+            # Cancel a registration still waiting for startup, then remove
+            # the panel if it was registered
+            if (unsub := hass.data.pop(DATA_PANEL_UNSUB, None)) is not None:
+                unsub()
+            panel = await _async_import_panel(hass)
+            await panel.async_unregister_panel(hass)
             hass.data[DATA_PANEL_REGISTERED] = False
-
-    # Clean up hass.data
-    if DOMAIN in hass.data:
-        hass.data[DOMAIN].pop("store", None)
+        hass.data[DOMAIN][DATA_TIMINGS]["entries"].pop(entry.entry_id, None)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the storage files of a removed notebook."""
+    storage_key = _storage_key(entry)
+    await HaNoteRecordStorage(hass, STORAGE_VERSION, storage_key).async_remove()
+    await hass.async_add_executor_job(
+        partial(journal_path(hass, storage_key).unlink, missing_ok=True)
+    )
+    await NoteArchive(hass, storage_key).async_remove()
+
+
 async def async_update_options(hass: HomeAssistant, entry: HaNoteRecordConfigEntry) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
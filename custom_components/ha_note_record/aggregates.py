@@ -0,0 +1,85 @@
+"""Running note statistics for Ha Note Record."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .util import timestamp_to_int
+
+if TYPE_CHECKING:
+    from .store import Note
+
+
+@dataclass(slots=True)
+class NoteAggregate:
+    """Counters over a set of notes."""
+
+    notes: int = 0
+    pinned: int = 0
+    characters: int = 0
+    # Latest change, in microseconds since the epoch; deletions count too
+    last_updated: int | None = None
+
+    def add(self, note: Note) -> None:
+        """Count a note."""
+        self.notes += 1
+        self.pinned += note.pinned
+        self.characters += len(note.content)
+        self.touch(timestamp_to_int(note.updated_at))
+
+    def remove(self, note: Note) -> None:
+        """Stop counting a note."""
+        self.notes -= 1
+        self.pinned -= note.pinned
+        self.characters -= len(note.content)
+
+    def touch(self, timestamp: int) -> None:
+        """Record a change made at timestamp."""
+        if self.last_updated is None or timestamp > self.last_updated:
+            self.last_updated = timestamp
+
+
+class NoteAggregates:
+    """Per-category and notebook-wide statistics, updated per mutation.
+
+    The store adds and removes notes as it indexes them, so reading a
+    statistic never scans the notes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.total = NoteAggregate()
+        self._categories: dict[str, NoteAggregate] = {}
+
+    def get(self, category_id: str) -> NoteAggregate:
+        """Return the statistics of a category."""
+        return self._categories.get(category_id) or NoteAggregate()
+
+    def rebuild(self, notes: Iterable[Note]) -> None:
+        """Recount from a full set of notes."""
+        self.total = NoteAggregate()
+        self._categories = {}
+        for note in notes:
+            self.add(note)
+
+    def add(self, note: Note) -> None:
+        """Count a created or updated note."""
+        self.total.add(note)
+        self._categories.setdefault(note.category_id, NoteAggregate()).add(note)
+
+    def remove(self, note: Note) -> None:
+        """Stop counting a note that is being updated or deleted."""
+        self.total.remove(note)
+        if (aggregate := self._categories.get(note.category_id)) is not None:
+            aggregate.remove(note)
+
+    def touch(self, category_id: str, timestamp: int) -> None:
+        """Record a change, such as a deletion, that added no note."""
+        self.total.touch(timestamp)
+        self._categories.setdefault(category_id, NoteAggregate()).touch(timestamp)
+
+    def discard_category(self, category_id: str) -> None:
+        """Forget a deleted category."""
+        self._categories.pop(category_id, None)
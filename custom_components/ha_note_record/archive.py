@@ -0,0 +1,328 @@
+"""Cold archive tier for Ha Note Record."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import time
+from typing import TYPE_CHECKING, Any
+import uuid
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .attachments import attachment_refs
+from .const import ARCHIVE_SEGMENT_MAX_BYTES, ARCHIVE_SEGMENT_MAX_NOTES
+from .registry import async_remove_note_entities
+from .search import TrigramIndex
+from .util import timestamp_to_int, utcnow_iso
+
+if TYPE_CHECKING:
+    from .store import HaNoteRecordStore
+
+_LOGGER = logging.getLogger(__name__)
+
+ARCHIVE_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class ArchivedNote:
+    """Index entry of an archived note; its body stays in the segment."""
+
+    id: str
+    category_id: str
+    title: str
+    tags: tuple[str, ...]
+    created_at: str
+    updated_at: str
+    archived_at: str
+    segment: str
+    # Attachment blobs the body references, so they outlive cleanup
+    attachments: tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ArchivedNote:
+        """Create from dictionary."""
+        return cls(
+            id=data["id"],
+            category_id=data["category_id"],
+            title=data["title"],
+            tags=tuple(data.get("tags", ())),
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+            archived_at=data["archived_at"],
+            segment=data["segment"],
+            attachments=tuple(data.get("attachments", ())),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "id": self.id,
+            "category_id": self.category_id,
+            "title": self.title,
+            "tags": list(self.tags),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "archived_at": self.archived_at,
+            "segment": self.segment,
+            "attachments": list(self.attachments),
+        }
+
+
+def archive_dir(hass: HomeAssistant, storage_key: str) -> Path:
+    """Return the segment directory of a storage key."""
+    return Path(hass.config.path(STORAGE_DIR, f"{storage_key}.archive"))
+
+
+def _write_segment(path: Path, notes: list[dict[str, Any]]) -> None:
+    """Write a compressed segment and fsync it before it appears (executor)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as file:
+        with gzip.GzipFile(fileobj=file, mode="wb") as compressed:
+            compressed.write(json.dumps(notes, ensure_ascii=False).encode("utf-8"))
+        file.flush()
+        os.fsync(file.fileno())
+    tmp_path.replace(path)
+
+
+def _read_segment(path: Path) -> list[dict[str, Any]]:
+    """Read a compressed segment (executor)."""
+    with gzip.open(path, "rb") as file:
+        return json.loads(file.read())
+
+
+def _remove_unused_segments(directory: Path, used: set[str]) -> int:
+    """Delete files in the segment directory no index entry uses (executor).
+
+    These are segments whose notes were all restored, and segments or
+    partial writes of an archive operation interrupted before its index
+    was saved. Returns the number of files deleted.
+    """
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    for path in directory.iterdir():
+        if path.name not in used:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def _split_segments(notes: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Split notes into segments within the note count and content size caps.
+
+    A note larger than the size cap gets a segment of its own.
+    """
+    segments: list[list[dict[str, Any]]] = []
+    current: list[dict[str, Any]] = []
+    size = 0
+    for note in notes:
+        note_size = len(note["content"].encode("utf-8"))
+        if current and (
+            len(current) >= ARCHIVE_SEGMENT_MAX_NOTES
+            or size + note_size > ARCHIVE_SEGMENT_MAX_BYTES
+        ):
+            segments.append(current)
+            current, size = [], 0
+        current.append(note)
+        size += note_size
+    if current:
+        segments.append(current)
+    return segments
+
+
+class NoteArchive:
+    """Read-only, compressed segments of notes moved out of the hot store.
+
+    Every archive operation writes new gzip segments, each capped in notes
+    and content size, which are never rewritten. An index of note metadata,
+    without bodies, is kept in memory for searching; bodies are read from
+    their segment on demand. A segment is deleted once none of its notes
+    remain archived.
+    """
+
+    def __init__(self, hass: HomeAssistant, storage_key: str) -> None:
+        """Initialize an empty archive."""
+        self._hass = hass
+        self._dir = archive_dir(hass, storage_key)
+        self._index: Store[dict[str, Any]] = Store(
+            hass, ARCHIVE_INDEX_VERSION, f"{storage_key}.archive_index"
+        )
+        self._notes: dict[str, ArchivedNote] = {}
+        self._titles = TrigramIndex()
+        # Archived notes still held by each segment
+        self._segments: Counter[str] = Counter()
+        self.segment_reads = 0
+
+    def __len__(self) -> int:
+        """Return the number of archived notes."""
+        return len(self._notes)
+
+    async def async_load(self, hot_ids: set[str]) -> None:
+        """Load the index.
+
+        Notes also present in the hot store were restored or archived by an
+        operation interrupted before it finished; the hot copy wins. Their
+        entries are dropped from the saved index, and segment files left
+        without entries are deleted.
+        """
+        data = await self._index.async_load()
+        self._notes = {}
+        self._titles.clear()
+        stored = (data or {}).get("notes", [])
+        for raw in stored:
+            entry = ArchivedNote.from_dict(raw)
+            if entry.id not in hot_ids:
+                self._notes[entry.id] = entry
+                self._titles.add(entry.id, entry.title)
+        self._segments = Counter(entry.segment for entry in self._notes.values())
+        if data is None:
+            # Without an index, leave any segments alone for manual recovery
+            return
+        if len(self._notes) < len(stored):
+            # The index must stop referring to a segment before it is deleted
+            await self._async_save_index()
+        if removed := await self._hass.async_add_executor_job(
+            _remove_unused_segments, self._dir, set(self._segments)
+        ):
+            _LOGGER.debug("Deleted %d unused archive segment files", removed)
+
+    def get(self, note_id: str) -> ArchivedNote | None:
+        """Return the index entry of an archived note."""
+        return self._notes.get(note_id)
+
+    def search(
+        self,
+        query: str | None = None,
+        *,
+        category_id: str | None = None,
+        tags: list[str] | None = None,
+    ) -> list[ArchivedNote]:
+        """Return archived notes matching every given filter.
+
+        With a query, results are ranked by title similarity; otherwise the
+        most recently updated come first.
+        """
+        if query:
+            entries = [
+                self._notes[note_id]
+                for note_id, _ in self._titles.search(query, len(self._notes))
+            ]
+        else:
+            entries = sorted(
+                self._notes.values(),
+                key=lambda entry: timestamp_to_int(entry.updated_at),
+                reverse=True,
+            )
+        if category_id is not None:
+            entries = [e for e in entries if e.category_id == category_id]
+        if tags:
+            wanted = set(tags)
+            entries = [e for e in entries if wanted.issubset(e.tags)]
+        return entries
+
+    async def async_add(self, notes: list[dict[str, Any]]) -> None:
+        """Write notes to new segments, then index them with one save."""
+        archived_at = utcnow_iso()
+        batches = _split_segments(notes)
+        for batch in batches:
+            segment = f"{int(time.time())}-{uuid.uuid4().hex[:8]}.json.gz"
+            await self._hass.async_add_executor_job(
+                _write_segment, self._dir / segment, batch
+            )
+            for note in batch:
+                entry = ArchivedNote.from_dict(
+                    {
+                        **note,
+                        "archived_at": archived_at,
+                        "segment": segment,
+                        "attachments": sorted(attachment_refs(note["content"])),
+                    }
+                )
+                if (old := self._notes.get(entry.id)) is not None:
+                    self._segments[old.segment] -= 1
+                self._notes[entry.id] = entry
+                self._titles.add(entry.id, entry.title)
+                self._segments[segment] += 1
+        await self._async_save_index()
+        _LOGGER.debug("Archived %d notes to %d segments", len(notes), len(batches))
+
+    def attachments(self) -> set[str]:
+        """Return the attachment blobs archived notes reference."""
+        return {name for entry in self._notes.values() for name in entry.attachments}
+
+    async def async_read(self, note_id: str) -> dict[str, Any] | None:
+        """Return the stored form of an archived note, read from its segment."""
+        if (entry := self._notes.get(note_id)) is None:
+            return None
+        self.segment_reads += 1
+        notes = await self._hass.async_add_executor_job(
+            _read_segment, self._dir / entry.segment
+        )
+        return next((note for note in notes if note["id"] == note_id), None)
+
+    async def async_discard(self, note_ids: list[str]) -> None:
+        """Drop notes from the archive, deleting segments left empty."""
+        empty: list[Path] = []
+        for note_id in note_ids:
+            if (entry := self._notes.pop(note_id, None)) is None:
+                continue
+            self._titles.remove(note_id)
+            self._segments[entry.segment] -= 1
+            if self._segments[entry.segment] <= 0:
+                del self._segments[entry.segment]
+                empty.append(self._dir / entry.segment)
+        # The index must stop referring to a segment before it is deleted
+        await self._async_save_index()
+        for path in empty:
+            await self._hass.async_add_executor_job(
+                partial(path.unlink, missing_ok=True)
+            )
+
+    async def _async_save_index(self) -> None:
+        """Write the index."""
+        await self._index.async_save(
+            {"notes": [entry.to_dict() for entry in self._notes.values()]}
+        )
+
+    async def async_remove(self) -> None:
+        """Delete the index and every segment."""
+        await self._index.async_remove()
+        await self._hass.async_add_executor_job(
+            partial(shutil.rmtree, self._dir, ignore_errors=True)
+        )
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return archive statistics."""
+        return {
+            "notes": len(self._notes),
+            "segments": len(self._segments),
+            "segment_reads": self.segment_reads,
+        }
+
+
+async def async_archive_stale(
+    hass: HomeAssistant, store: HaNoteRecordStore, max_age: timedelta, now: datetime
+) -> None:
+    """Archive unpinned notes not updated for max_age, with their entities."""
+    cutoff = timestamp_to_int((now - max_age).isoformat())
+    stale = [
+        note.id
+        for note in store.notes
+        if not note.pinned and timestamp_to_int(note.updated_at) < cutoff
+    ]
+    if not stale:
+        return
+    archived = await store.async_archive_notes(stale)
+    async_remove_note_entities(hass, (note.id for note in archived))
+    _LOGGER.info("Archived %d notes not updated since %s", len(archived), now - max_age)
@@ -0,0 +1,242 @@
+"""Content-addressed attachment blobs for Ha Note Record."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import hashlib
+from http import HTTPStatus
+import logging
+import os
+from pathlib import Path
+import re
+import time
+import uuid
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import (
+    ATTACHMENT_GC_GRACE,
+    ATTACHMENT_GC_INTERVAL,
+    DOMAIN,
+    MAX_ATTACHMENT_SIZE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTACHMENT_URL = f"/api/{DOMAIN}/attachments"
+DATA_ATTACHMENTS = f"{DOMAIN}_attachments"
+
+# SVG is left out: it can carry script and is served from our origin.
+CONTENT_TYPES = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "application/pdf": "pdf",
+}
+_FILENAME = re.compile(r"[0-9a-f]{64}\.(?:png|jpg|gif|webp|pdf)")
+_REFERENCE = re.compile(
+    rf"{re.escape(ATTACHMENT_URL)}/({_FILENAME.pattern})(?![0-9a-z])"
+)
+
+# Blob names are content hashes, so a given URL never changes content.
+# Private: blobs are only readable by authenticated users.
+BLOB_CACHE_CONTROL = "private, max-age=31536000, immutable"
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def attachment_dir(hass: HomeAssistant) -> Path:
+    """Return the blob directory, shared by every notebook."""
+    return Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.attachments"))
+
+
+def attachment_refs(content: str) -> set[str]:
+    """Return the blob names referenced by note content."""
+    if ATTACHMENT_URL not in content:
+        return set()
+    return set(_REFERENCE.findall(content))
+
+
+def _blob_path(directory: Path, name: str) -> Path:
+    """Return where a blob lives; a two-character fan-out keeps dirs small."""
+    return directory / name[:2] / name
+
+
+def _store_blob(directory: Path, name: str, data: bytes) -> None:
+    """Write a blob unless it already exists (executor)."""
+    path = _blob_path(directory, name)
+    if path.exists():
+        # Same content; refresh mtime so a pending GC keeps it
+        path.touch()
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{name}.{uuid.uuid4().hex[:8]}.tmp")
+    with tmp_path.open("wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    tmp_path.replace(path)
+
+
+def _sweep(directory: Path, referenced: set[str], cutoff: float) -> int:
+    """Delete unreferenced blobs and stray temp files older than cutoff (executor).
+
+    Returns the number of files deleted.
+    """
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    for path in directory.glob("*/*"):
+        if path.name in referenced:
+            continue
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+    return removed
+
+
+class HaNoteRecordAttachmentView(HomeAssistantView):
+    """Stream attachment blobs."""
+
+    url = ATTACHMENT_URL + "/{filename}"
+    name = f"{DOMAIN}:attachment"
+    requires_auth = True
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize the view."""
+        self.directory = directory
+
+    async def get(self, request: web.Request, filename: str) -> web.StreamResponse:
+        """Serve a blob; aiohttp handles streaming, Range and ETag."""
+        if not _FILENAME.fullmatch(filename):
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        return web.FileResponse(
+            _blob_path(self.directory, filename),
+            headers={
+                hdrs.CACHE_CONTROL: BLOB_CACHE_CONTROL,
+                "X-Content-Type-Options": "nosniff",
+            },
+        )
+
+
+class HaNoteRecordAttachmentUploadView(HomeAssistantView):
+    """Store uploaded attachment blobs."""
+
+    url = ATTACHMENT_URL
+    name = f"{DOMAIN}:attachments"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant, directory: Path) -> None:
+        """Initialize the view."""
+        self.hass = hass
+        self.directory = directory
+
+    async def post(self, request: web.Request) -> web.Response:
+        """Store the request body as a blob and return its URL."""
+        extension = CONTENT_TYPES.get(request.content_type)
+        if extension is None:
+            return self.json_message(
+                f"Unsupported content type {request.content_type}",
+                HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            )
+        if (request.content_length or 0) > MAX_ATTACHMENT_SIZE:
+            return self._too_large()
+
+        digest = hashlib.sha256()
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in request.content.iter_chunked(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_ATTACHMENT_SIZE:
+                return self._too_large()
+            digest.update(chunk)
+            chunks.append(chunk)
+        if not size:
+            return self.json_message("Empty attachment", HTTPStatus.BAD_REQUEST)
+
+        name = f"{digest.hexdigest()}.{extension}"
+        await self.hass.async_add_executor_job(
+            _store_blob, self.directory, name, b"".join(chunks)
+        )
+        return self.json(
+            {
+                "url": f"{ATTACHMENT_URL}/{name}",
+                "size": size,
+                "content_type": request.content_type,
+            },
+            HTTPStatus.CREATED,
+        )
+
+    def _too_large(self) -> web.Response:
+        """Return the response for an oversized upload."""
+        return self.json_message(
+            f"Attachment exceeds maximum size of {MAX_ATTACHMENT_SIZE} bytes",
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        )
+
+
+def _referenced(hass: HomeAssistant) -> set[str] | None:
+    """Return the blobs referenced by any notebook.
+
+    Returns None unless every notebook is loaded, since the references of
+    one that is not are unknown.
+    """
+    entries = hass.config_entries.async_entries(DOMAIN)
+    if not entries or any(e.state is not ConfigEntryState.LOADED for e in entries):
+        return None
+    referenced: set[str] = set()
+    for entry in entries:
+        store = entry.runtime_data
+        for note in store.notes:
+            referenced |= attachment_refs(note.content)
+        referenced |= store.archive.attachments()
+    return referenced
+
+
+async def async_collect_garbage(hass: HomeAssistant, directory: Path) -> int:
+    """Delete every blob no note references, in one executor job.
+
+    Blobs younger than the grace period are kept: they may have been
+    uploaded for a note that has not been saved yet.
+    """
+    if (referenced := _referenced(hass)) is None:
+        _LOGGER.debug("Skipping attachment cleanup; not every notebook is loaded")
+        return 0
+    cutoff = time.time() - ATTACHMENT_GC_GRACE
+    removed = await hass.async_add_executor_job(_sweep, directory, referenced, cutoff)
+    if removed:
+        _LOGGER.info("Removed %d unreferenced attachments", removed)
+    return removed
+
+
+@callback
+def async_setup_attachments(hass: HomeAssistant) -> None:
+    """Register the attachment view and the periodic cleanup."""
+    if DATA_ATTACHMENTS in hass.data:
+        return
+    directory = attachment_dir(hass)
+    hass.data[DATA_ATTACHMENTS] = directory
+    hass.http.register_view(HaNoteRecordAttachmentView(directory))
+    hass.http.register_view(HaNoteRecordAttachmentUploadView(hass, directory))
+
+    async def _async_collect_garbage(now: datetime) -> None:
+        """Delete unreferenced blobs."""
+        await async_collect_garbage(hass, directory)
+
+    async_track_time_interval(
+        hass,
+        _async_collect_garbage,
+        timedelta(seconds=ATTACHMENT_GC_INTERVAL),
+        cancel_on_shutdown=True,
+    )
+
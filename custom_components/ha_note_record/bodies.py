@@ -0,0 +1,70 @@
+"""Content-addressed pool of note bodies for Ha Note Record."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .util import content_hash
+
+
+class BodyPool:
+    """Hold each distinct note body once, with a reference count.
+
+    Notes with identical content share one string object. Strings are
+    immutable, so an update is copy-on-write: the note releases its old
+    body and acquires the new one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the pool."""
+        self._bodies: dict[str, str] = {}
+        self._refs: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct bodies."""
+        return len(self._bodies)
+
+    def acquire(self, content: str) -> tuple[str, str]:
+        """Add a reference to content; return its hash and shared string."""
+        key = content_hash(content)
+        if (shared := self._bodies.get(key)) is None:
+            self._bodies[key] = shared = content
+            self._refs[key] = 1
+        else:
+            self._refs[key] += 1
+        return key, shared
+
+    def release(self, key: str) -> None:
+        """Drop a reference, freeing the body when none remain."""
+        refs = self._refs.get(key)
+        if refs is None:
+            return
+        if refs > 1:
+            self._refs[key] = refs - 1
+        else:
+            del self._refs[key]
+            del self._bodies[key]
+
+    def refcount(self, key: str) -> int:
+        """Return the number of notes referring to a body."""
+        return self._refs.get(key, 0)
+
+    def clear(self) -> None:
+        """Drop every body."""
+        self._bodies.clear()
+        self._refs.clear()
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return deduplication statistics (sizes in characters)."""
+        stored = sum(len(body) for body in self._bodies.values())
+        logical = sum(
+            len(body) * self._refs[key] for key, body in self._bodies.items()
+        )
+        return {
+            "unique_bodies": len(self._bodies),
+            "references": sum(self._refs.values()),
+            "stored_chars": stored,
+            "logical_chars": logical,
+            "chars_saved": logical - stored,
+            "dedupe_ratio": round(logical / stored, 3) if stored else 1.0,
+        }
@@ -0,0 +1,137 @@
+"""Bounded change log for Ha Note Record."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from .checklist import ItemChange
+    from .patches import Splice
+    from .store import Category, Note
+
+type ChangeKind = Literal["category", "note"]
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    """A record put or deleted at a store revision."""
+
+    revision: int
+    kind: ChangeKind
+    id: str
+    # The record after the change; None for a deletion (tombstone)
+    record: Category | Note | None
+    # Set when only the note content changed, by these splices
+    patch: tuple[Splice, ...] | None = None
+    # Set when only this checklist item changed
+    item: ItemChange | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary.
+
+        A patch is sent as the note without its content plus the splices
+        that turn the previous content into the new one, and an item
+        change as the note without content or checklist plus the item.
+        """
+        if self.record is None:
+            return {
+                "revision": self.revision,
+                "type": self.kind,
+                "action": "delete",
+                "id": self.id,
+                "data": None,
+            }
+        data = self.record.to_dict()
+        if self.item is not None:
+            del data["content"], data["checklist"]
+            return {
+                "revision": self.revision,
+                "type": self.kind,
+                "action": "item",
+                "id": self.id,
+                "data": data,
+                "item": self.item.to_dict(),
+            }
+        if self.patch is None:
+            return {
+                "revision": self.revision,
+                "type": self.kind,
+                "action": "put",
+                "id": self.id,
+                "data": data,
+            }
+        del data["content"]
+        return {
+            "revision": self.revision,
+            "type": self.kind,
+            "action": "patch",
+            "id": self.id,
+            "data": data,
+            "patch": [splice.to_dict() for splice in self.patch],
+        }
+
+
+class ChangeLog:
+    """The most recent changes, for clients catching up from a cursor.
+
+    Records are immutable, so entries hold references rather than copies.
+    """
+
+    def __init__(self, max_changes: int) -> None:
+        """Initialize an empty log."""
+        self._max_changes = max_changes
+        self._changes: deque[Change] = deque()
+        # Changes up to this revision may be missing from the log
+        self._floor = 0
+
+    def reset(self, revision: int) -> None:
+        """Forget everything up to revision, e.g. after a reload."""
+        self._changes.clear()
+        self._floor = revision
+
+    def append(
+        self,
+        revision: int,
+        kind: ChangeKind,
+        item_id: str,
+        record: Any,
+        patch: tuple[Splice, ...] | None = None,
+        item: ItemChange | None = None,
+    ) -> None:
+        """Record a put (record given) or a deletion (record None)."""
+        if len(self._changes) >= self._max_changes:
+            self._floor = self._changes.popleft().revision
+        self._changes.append(Change(revision, kind, item_id, record, patch, item))
+
+    def since(self, revision: int) -> list[Change] | None:
+        """Return changes after revision, latest per record, oldest first.
+
+        Returns None if some of them are no longer in the log and the
+        client has to fetch everything again. Patches and item changes only
+        apply to the note they were made against, so one compacted over
+        earlier changes of the same note is sent as a put.
+        """
+        if revision < self._floor:
+            return None
+        latest: dict[tuple[str, str], Change] = {}
+        for change in reversed(self._changes):
+            if change.revision <= revision:
+                break
+            key = (change.kind, change.id)
+            if (newer := latest.get(key)) is None:
+                latest[key] = change
+            elif newer.patch is not None or newer.item is not None:
+                latest[key] = replace(newer, patch=None, item=None)
+        changes = list(latest.values())
+        changes.reverse()
+        return changes
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return log statistics."""
+        return {
+            "changes": len(self._changes),
+            "max_changes": self._max_changes,
+            "floor": self._floor,
+        }
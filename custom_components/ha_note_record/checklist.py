@@ -0,0 +1,75 @@
+"""Checklist items for Ha Note Record."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import voluptuous as vol
+
+from .const import MAX_CHECKLIST_ITEM_LENGTH, MAX_CHECKLIST_ITEMS
+
+
+@dataclass(frozen=True, slots=True)
+class ChecklistItem:
+    """Represent one item of a checklist note."""
+
+    id: str
+    text: str
+    checked: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ChecklistItem:
+        """Create from dictionary."""
+        return cls(id=data["id"], text=data["text"], checked=data["checked"])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {"id": self.id, "text": self.text, "checked": self.checked}
+
+
+@dataclass(frozen=True, slots=True)
+class ItemChange:
+    """A single checklist item put at index, or removed (item None)."""
+
+    item_id: str
+    item: ChecklistItem | None
+    index: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        if self.item is None:
+            return {"action": "delete", "id": self.item_id}
+        return {"action": "put", "index": self.index, "item": self.item.to_dict()}
+
+
+def item_index(items: tuple[ChecklistItem, ...], item_id: str) -> int | None:
+    """Return the position of an item, or None if it is not in items."""
+    for index, item in enumerate(items):
+        if item.id == item_id:
+            return index
+    return None
+
+
+def put_item(
+    items: tuple[ChecklistItem, ...], item: ChecklistItem, index: int | None
+) -> tuple[tuple[ChecklistItem, ...], int]:
+    """Return items with item inserted or replaced, and where it ended up.
+
+    An existing item keeps its place unless index is given. A new item is
+    appended unless index is given. Indexes are clamped to the list.
+    """
+    current = item_index(items, item.id)
+    if current is not None:
+        if index is None:
+            return (*items[:current], item, *items[current + 1 :]), current
+        items = items[:current] + items[current + 1 :]
+    index = len(items) if index is None else min(index, len(items))
+    return (*items[:index], item, *items[index:]), index
+
+
+ITEM_TEXT_SCHEMA = vol.All(
+    str, vol.Strip, vol.Length(min=1, max=MAX_CHECKLIST_ITEM_LENGTH)
+)
+
+CHECKLIST_SCHEMA = vol.All([ITEM_TEXT_SCHEMA], vol.Length(max=MAX_CHECKLIST_ITEMS))
@@ -13,19 +13,27 @@ from homeassistant.config_entries import (
     ConfigFlowResult,
     OptionsFlow,
 )
+from homeassistant.const import CONF_NAME
 from homeassistant.core import callback
 from homeassistant.helpers import selector
+from homeassistant.util import slugify
 
 from .const import (
     ACTION_CREATE_CATEGORY,
     ACTION_CREATE_NOTE,
     ACTION_DELETE_CATEGORY,
     ACTION_DELETE_NOTE,
+    ACTION_SETTINGS,
+    CONF_ARCHIVE_AFTER_DAYS,
+    CONF_DEDUPLICATE_BODIES,
+    CONF_DURABLE_WRITES,
+    CONF_STATISTICS_SENSORS,
     DEFAULT_CONTENT,
+    DEFAULT_NOTEBOOK_NAME,
     DEFAULT_PINNED,
     DOMAIN,
 )
-from .store import HaNoteRecordStore
+from .store import DuplicateNameError, HaNoteRecordStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,6 +43,7 @@ ACTION_LABELS = {
     ACTION_CREATE_NOTE: "create_note",
     ACTION_DELETE_NOTE: "delete_note",
     ACTION_DELETE_CATEGORY: "delete_category",
+    ACTION_SETTINGS: "settings",
 }
 
 
@@ -42,20 +51,33 @@ class HaNoteRecordConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Ha Note Record."""
 
     VERSION = 1
+    # 2: note entity unique ids no longer include the category id
+    MINOR_VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the initial step."""
-        # Only allow one instance
-        await self.async_set_unique_id(DOMAIN)
-        self._abort_if_unique_id_configured()
-
         if user_input is not None:
-            return self.async_create_entry(title="Ha Note Record", data={})
+            name = user_input.get(CONF_NAME, "").strip() or DEFAULT_NOTEBOOK_NAME
+            # The first notebook keeps the original unique id (and storage
+            # file); further notebooks are keyed by name.
+            if self._async_current_entries(include_ignore=False):
+                await self.async_set_unique_id(slugify(name))
+            else:
+                await self.async_set_unique_id(DOMAIN)
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(title=name, data={})
 
         return self.async_show_form(
             step_id="user",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_NAME, default=DEFAULT_NOTEBOOK_NAME
+                    ): selector.TextSelector(),
+                }
+            ),
             description_placeholders={},
         )
 
@@ -78,6 +100,11 @@ class HaNoteRecordOptionsFlow(OptionsFlow):
         """Get the store from runtime data."""
         return self._config_entry.runtime_data
 
+    @callback
+    def _async_finish(self) -> ConfigFlowResult:
+        """Finish an action step, keeping the entry's current options."""
+        return self.async_create_entry(data=dict(self._config_entry.options))
+
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -92,6 +119,8 @@ class HaNoteRecordOptionsFlow(OptionsFlow):
                 return await self.async_step_delete_note()
             if action == ACTION_DELETE_CATEGORY:
                 return await self.async_step_delete_category()
+            if action == ACTION_SETTINGS:
+                return await self.async_step_settings()
 
         # Build action options using translation keys
         actions = [
@@ -128,6 +157,13 @@ class HaNoteRecordOptionsFlow(OptionsFlow):
                 )
             )
 
+        actions.append(
+            selector.SelectOptionDict(
+                value=ACTION_SETTINGS,
+                label=ACTION_LABELS[ACTION_SETTINGS],
+            )
+        )
+
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
@@ -154,15 +190,12 @@ class HaNoteRecordOptionsFlow(OptionsFlow):
             if not name:
                 errors["name"] = "name_required"
             else:
-                # Check for duplicate name
-                for category in self._store.categories:
-                    if category.name.lower() == name.lower():
-                        errors["name"] = "name_exists"
-                        break
-
-            if not errors:
-                await self._store.async_create_category(name)
-                return self.async_create_entry(data={})
+                try:
+                    await self._store.async_create_category(name)
+                except DuplicateNameError:
+                    errors["name"] = "name_exists"
+                else:
+                    return self._async_finish()
 
         return self.async_show_form(
             step_id="create_category",
@@ -190,24 +223,21 @@ class HaNoteRecordOptionsFlow(OptionsFlow):
 
             if not title:
                 errors["title"] = "title_required"
-            elif category_id:
-                # Check for duplicate title within the same category
-                for note in self._store.get_notes_by_category(category_id):
-                    if note.title.lower() == title.lower():
-                        errors["title"] = "title_exists"
-                        break
-
             if not category_id:
                 errors["category"] = "category_required"
 
             if not errors:
-                await self._store.async_create_note(
-                    category_id=category_id,
-                    title=title,
-                    content=content,
-                    pinned=pinned,
-                )
-                return self.async_create_entry(data={})
+                try:
+                    await self._store.async_create_note(
+                        category_id=category_id,
+                        title=title,
+                        content=content,
+                        pinned=pinned,
+                    )
+                except DuplicateNameError:
+                    errors["title"] = "title_exists"
+                else:
+                    return self._async_finish()
 
         # Build category options
         category_options = [
@@ -250,7 +280,7 @@ class HaNoteRecordOptionsFlow(OptionsFlow):
             note_id = user_input.get("note")
             if note_id:
                 await self._store.async_delete_note(note_id)
-                return self.async_create_entry(data={})
+                return self._async_finish()
             errors["note"] = "note_required"
 
         # Build note options with category prefix
@@ -293,19 +323,18 @@ class HaNoteRecordOptionsFlow(OptionsFlow):
             category_id = user_input.get("category")
             if category_id:
                 # Check if category has notes
-                notes = self._store.get_notes_by_category(category_id)
-                if notes:
+                if self._store.count_notes_in_category(category_id):
                     errors["category"] = "category_not_empty"
                 else:
                     await self._store.async_delete_category(category_id)
-                    return self.async_create_entry(data={})
+                    return self._async_finish()
             else:
                 errors["category"] = "category_required"
 
         # Build category options with note count
         category_options = []
         for category in self._store.categories:
-            note_count = len(self._store.get_notes_by_category(category.id))
+            note_count = self._store.count_notes_in_category(category.id)
             label = f"{category.name} ({note_count} notes)"
             category_options.append(
                 selector.SelectOptionDict(value=category.id, label=label)
@@ -328,3 +357,55 @@ class HaNoteRecordOptionsFlow(OptionsFlow):
             ),
             errors=errors,
         )
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle notebook settings step."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={**self._config_entry.options, **user_input}
+            )
+
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_DEDUPLICATE_BODIES,
+                        default=self._config_entry.options.get(
+                            CONF_DEDUPLICATE_BODIES, False
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_DURABLE_WRITES,
+                        default=self._config_entry.options.get(
+                            CONF_DURABLE_WRITES, False
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_STATISTICS_SENSORS,
+                        default=self._config_entry.options.get(
+                            CONF_STATISTICS_SENSORS, False
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_ARCHIVE_AFTER_DAYS,
+                        default=self._config_entry.options.get(
+                            CONF_ARCHIVE_AFTER_DAYS, 0
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=0,
+                                max=3650,
+                                step=1,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="days",
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                }
+            ),
+        )
@@ -7,9 +7,11 @@ DOMAIN: Final = "ha_note_record"
 # Storage
 STORAGE_KEY: Final = DOMAIN
 STORAGE_VERSION: Final = 1
+STORAGE_MINOR_VERSION: Final = 2
 
 # Platforms
 PLATFORMS: Final = ["text", "switch"]
+STATISTICS_PLATFORMS: Final = ["sensor"]
 
 # Attributes
 ATTR_RAW_CONTENT: Final = "raw_content"
@@ -18,22 +20,89 @@ ATTR_CATEGORY: Final = "category"
 ATTR_CREATED_AT: Final = "created_at"
 ATTR_UPDATED_AT: Final = "updated_at"
 ATTR_NOTE_ID: Final = "note_id"
+ATTR_NOTE_IDS: Final = "note_ids"
 ATTR_CATEGORY_ID: Final = "category_id"
+ATTR_TAGS: Final = "tags"
+ATTR_TAGS_ALL: Final = "tags_all"
+ATTR_TAGS_ANY: Final = "tags_any"
+ATTR_DURATION: Final = "duration"
+ATTR_TOP: Final = "top"
+ATTR_QUERY: Final = "query"
+ATTR_LIMIT: Final = "limit"
+ATTR_ITEM_ID: Final = "item_id"
+ATTR_TEXT: Final = "text"
+ATTR_CHECKED: Final = "checked"
+ATTR_INDEX: Final = "index"
+ATTR_DELETED: Final = "deleted"
+
+# Fired for every note change, so trigger-based template entities can
+# re-render only for the notes they show
+EVENT_NOTE_CHANGED: Final = f"{DOMAIN}_note_changed"
+
+# Services
+SERVICE_QUERY_NOTES: Final = "query_notes"
+SERVICE_PROFILE: Final = "profile"
+SERVICE_FIND_NOTE: Final = "find_note"
+SERVICE_GET_NOTE: Final = "get_note"
+SERVICE_LIST_NOTES: Final = "list_notes"
+SERVICE_ADD_CHECKLIST_ITEM: Final = "add_checklist_item"
+SERVICE_UPDATE_CHECKLIST_ITEM: Final = "update_checklist_item"
+SERVICE_REMOVE_CHECKLIST_ITEM: Final = "remove_checklist_item"
 
 # Options Flow Actions
 ACTION_CREATE_CATEGORY: Final = "create_category"
 ACTION_CREATE_NOTE: Final = "create_note"
 ACTION_DELETE_NOTE: Final = "delete_note"
 ACTION_DELETE_CATEGORY: Final = "delete_category"
+ACTION_SETTINGS: Final = "settings"
+
+# Options
+CONF_DEDUPLICATE_BODIES: Final = "deduplicate_bodies"
+CONF_DURABLE_WRITES: Final = "durable_writes"
+CONF_STATISTICS_SENSORS: Final = "statistics_sensors"
+CONF_ARCHIVE_AFTER_DAYS: Final = "archive_after_days"
 
 # Default values
 DEFAULT_CONTENT: Final = ""
 DEFAULT_PINNED: Final = False
+DEFAULT_NOTEBOOK_NAME: Final = "Ha Note Record"
 
 # Input validation limits
 MAX_CATEGORY_NAME_LENGTH: Final = 100
 MAX_NOTE_TITLE_LENGTH: Final = 200
 MAX_NOTE_CONTENT_LENGTH: Final = 100000  # 100KB
+MAX_TAG_LENGTH: Final = 50
+MAX_TAGS_PER_NOTE: Final = 20
+MAX_CHECKLIST_ITEMS: Final = 200
+MAX_CHECKLIST_ITEM_LENGTH: Final = 500
+
+# Paged listings
+DEFAULT_PAGE_SIZE: Final = 50
+MAX_PAGE_SIZE: Final = 500
+
+# Changes kept for clients catching up with changes_since
+CHANGE_LOG_SIZE: Final = 1000
+
+# Server-side markdown rendering
+RENDER_CACHE_MAX_BYTES: Final = 4 * 1024 * 1024  # 4MB of rendered HTML
+
+# A failed expiry purge is retried after this long
+EXPIRY_RETRY_DELAY: Final = 60  # seconds
+
+# Notes untouched for the configured period are archived this often
+ARCHIVE_CHECK_INTERVAL: Final = 3600  # seconds
+# Archive segments are split at whichever cap is reached first
+ARCHIVE_SEGMENT_MAX_NOTES: Final = 500
+ARCHIVE_SEGMENT_MAX_BYTES: Final = 4 * 1024 * 1024  # 4MB of note content
+
+# Attachment blobs
+MAX_ATTACHMENT_SIZE: Final = 10 * 1024 * 1024  # 10MB
+ATTACHMENT_GC_INTERVAL: Final = 6 * 3600  # seconds
+# Unreferenced blobs younger than this may belong to an unsaved note
+ATTACHMENT_GC_GRACE: Final = 24 * 3600  # seconds
+
+# Statistics sensors write state at most once per cooldown
+STATISTICS_UPDATE_COOLDOWN: Final = 10  # seconds
 
 # Icon
 ICON_PINNED: Final = "mdi:pin"
@@ -0,0 +1,35 @@
+"""Diagnostics support for Ha Note Record."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import DATA_TIMINGS, HaNoteRecordConfigEntry
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: HaNoteRecordConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    store = entry.runtime_data
+    timings = hass.data[DOMAIN][DATA_TIMINGS]
+    return {
+        "startup": {
+            "import_duration": timings["import"],
+            "setup_duration": timings["entries"].get(entry.entry_id),
+            "panel_duration": timings["panel"],
+        },
+        "categories": len(store.categories),
+        "notes": len(store.notes),
+        "load": store.load_report.as_dict(),
+        "bodies": store.bodies.as_diagnostics(),
+        "render_cache": store.render_cache.as_diagnostics(),
+        "expiry": store.expiry.as_diagnostics(),
+        "saves": store.save_count,
+        "archive": store.archive.as_diagnostics(),
+        "changes": store.changes.as_diagnostics(),
+        "journal": store.journal.as_diagnostics(),
+    }
@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from abc import abstractmethod
+
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 
-from .const import DOMAIN
+from .registry import category_device_info
 from .store import Category, HaNoteRecordStore, Note
 
 
 class HaNoteRecordEntity(Entity):
-    """Base class for Ha Note Record entities."""
+    """Base class for Ha Note Record entities.
+
+    State is computed into _attr_ values when the note or its category
+    changes, so Home Assistant's cached properties serve every read in
+    between. Notes and categories are immutable, so one that is the same
+    object as last time is unchanged.
+    """
 
     _attr_has_entity_name = True
     _attr_should_poll = False
@@ -25,37 +33,44 @@ class HaNoteRecordEntity(Entity):
         self._store = store
         self._note = note
         self._category = category
-        self._note_exists = True
+        self._attr_device_info = category_device_info(category.id, category.name)
+        self._update_from_note()
 
     @property
     def note_id(self) -> str:
         """Return the note ID."""
         return self._note.id
 
-    @property
-    def available(self) -> bool:
-        """Return True if the entity is available."""
-        return self._note_exists and self._store.get_note(self._note.id) is not None
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._category.id)},
-            name=self._category.name,
-            manufacturer="Ha Note Record",
-            model="Note Category",
+    async def async_added_to_hass(self) -> None:
+        """Follow updates of this entity's note."""
+        self.async_on_remove(
+            self._store.async_add_note_listener(
+                self._note.id, self._async_note_updated
+            )
         )
 
-    def _refresh_note(self) -> bool:
-        """Refresh note data from store.
-
-        Returns True if note still exists, False otherwise.
-        """
+    @callback
+    def _async_note_updated(self) -> None:
+        """Write state if the note changed in a way this entity shows."""
         note = self._store.get_note(self._note.id)
-        if note:
-            self._note = note
-            self._note_exists = True
-            return True
-        self._note_exists = False
-        return False
+        if note is None:
+            if self._attr_available:
+                self._attr_available = False
+                self.async_write_ha_state()
+            return
+        category = self._store.get_category(note.category_id) or self._category
+        if note is self._note and category is self._category and self._attr_available:
+            return
+        self._note = note
+        if category is not self._category:
+            # The registry entry is moved by the operation that moved the note
+            self._category = category
+            self._attr_device_info = category_device_info(category.id, category.name)
+        changed = self._update_from_note() or not self._attr_available
+        self._attr_available = True
+        if changed and self.hass is not None:
+            self.async_write_ha_state()
+
+    @abstractmethod
+    def _update_from_note(self) -> bool:
+        """Compute state from self._note; return True if any of it changed."""
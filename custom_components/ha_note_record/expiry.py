@@ -0,0 +1,186 @@
+"""Note expiry scheduling for Ha Note Record."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+import heapq
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+
+from .const import EXPIRY_RETRY_DELAY
+from .registry import async_remove_note_entities
+from .util import int_to_datetime, timestamp_to_int
+
+if TYPE_CHECKING:
+    from .store import HaNoteRecordStore, Note
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rebuild the heap once stale entries outnumber live deadlines by this much
+HEAP_COMPACT_SLACK = 64
+
+
+class NoteExpiryScheduler:
+    """Purge expired notes using a min-heap and a single timer.
+
+    Only the earliest deadline has a timer armed. Heap entries made stale by
+    updates or deletions are skipped when they reach the top, instead of
+    being searched for and removed.
+    """
+
+    def __init__(self, hass: HomeAssistant, store: HaNoteRecordStore) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._store = store
+        self._heap: list[tuple[int, str]] = []
+        self._deadlines: dict[str, int] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._armed_for: int | None = None
+        # After a failed purge, no timer fires before this retry time
+        self._retry_at = 0
+        self._stopped = False
+        self.purge_runs = 0
+        self.purged_notes = 0
+        self.last_purge_count = 0
+        self.last_purge_duration: float | None = None
+        self.last_purge_at: str | None = None
+
+    @callback
+    def async_rebuild(self, notes: Iterable[Note]) -> None:
+        """Reset the schedule from a full set of notes."""
+        self._deadlines = {
+            note.id: timestamp_to_int(note.expires_at)
+            for note in notes
+            if note.expires_at is not None
+        }
+        self._heap = [(ts, note_id) for note_id, ts in self._deadlines.items()]
+        heapq.heapify(self._heap)
+        self._stopped = False
+        self._async_arm()
+
+    @callback
+    def async_schedule(self, note: Note) -> None:
+        """Track (or stop tracking) the expiry of a created or updated note."""
+        if note.expires_at is None:
+            self.async_unschedule(note.id)
+            return
+        deadline = timestamp_to_int(note.expires_at)
+        if self._deadlines.get(note.id) == deadline:
+            return
+        self._deadlines[note.id] = deadline
+        heapq.heappush(self._heap, (deadline, note.id))
+        self._async_arm()
+
+    @callback
+    def async_unschedule(self, note_id: str) -> None:
+        """Stop tracking a note; its heap entry goes stale."""
+        if self._deadlines.pop(note_id, None) is None:
+            return
+        if len(self._heap) > 2 * len(self._deadlines) + HEAP_COMPACT_SLACK:
+            self._heap = [(ts, nid) for nid, ts in self._deadlines.items()]
+            heapq.heapify(self._heap)
+        self._async_arm()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the armed timer."""
+        self._stopped = True
+        self._async_cancel_timer()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the armed timer, if any."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_for = None
+
+    def _is_live(self, entry: tuple[int, str]) -> bool:
+        """Return True if a heap entry is the current deadline of its note."""
+        deadline, note_id = entry
+        return self._deadlines.get(note_id) == deadline
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm a timer for the earliest live deadline."""
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        if self._stopped or not self._heap:
+            self._async_cancel_timer()
+            return
+        deadline = max(self._heap[0][0], self._retry_at)
+        if deadline == self._armed_for:
+            return
+        self._async_cancel_timer()
+        self._armed_for = deadline
+        self._unsub_timer = async_track_point_in_time(
+            self._hass, self._async_purge_due, int_to_datetime(deadline)
+        )
+
+    async def _async_purge_due(self, now: datetime) -> None:
+        """Delete every note whose deadline has passed."""
+        self._unsub_timer = None
+        self._armed_for = None
+        now_ts = timestamp_to_int(now.isoformat())
+
+        due: list[str] = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            entry = heapq.heappop(self._heap)
+            if self._is_live(entry):
+                due.append(entry[1])
+
+        try:
+            if due:
+                await self._async_purge(due, now)
+            self._retry_at = 0
+        except Exception:
+            _LOGGER.exception(
+                "Purging %d expired notes failed; retrying in %ds",
+                len(due),
+                EXPIRY_RETRY_DELAY,
+            )
+            for note_id in due:
+                if (deadline := self._deadlines.get(note_id)) is not None:
+                    heapq.heappush(self._heap, (deadline, note_id))
+            self._retry_at = now_ts + EXPIRY_RETRY_DELAY * 1_000_000
+        finally:
+            # Always re-armed, or expiry would stop for the rest of the run
+            self._async_arm()
+
+    async def _async_purge(self, due: list[str], now: datetime) -> None:
+        """Delete due notes and their entities, and record the run."""
+        start = time.perf_counter()
+        removed = await self._store.async_delete_notes(due)
+        async_remove_note_entities(self._hass, (note.id for note in removed))
+        self.purge_runs += 1
+        self.purged_notes += len(removed)
+        self.last_purge_count = len(removed)
+        self.last_purge_duration = time.perf_counter() - start
+        self.last_purge_at = now.isoformat()
+        _LOGGER.debug(
+            "Purged %d expired notes in %.3fs",
+            len(removed),
+            self.last_purge_duration,
+        )
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return scheduler statistics."""
+        return {
+            "scheduled": len(self._deadlines),
+            "heap_size": len(self._heap),
+            "next_deadline": (
+                int_to_datetime(self._armed_for).isoformat()
+                if self._armed_for is not None
+                else None
+            ),
+            "purge_runs": self.purge_runs,
+            "purged_notes": self.purged_notes,
+            "last_purge_count": self.last_purge_count,
+            "last_purge_duration": self.last_purge_duration,
+            "last_purge_at": self.last_purge_at,
+        }
@@ -10,6 +10,18 @@ import {
 import { marked } from "./vendor/marked.esm.js";
 import DOMPurify from "./vendor/dompurify.esm.js";
 
+// Attachments are uploaded to, and served from, an authenticated view.
+// <img> cannot send the auth header, so their paths are signed first.
+const ATTACHMENT_URL = "/api/ha_note_record/attachments";
+const ATTACHMENT_TYPES = [
+  "image/png",
+  "image/jpeg",
+  "image/gif",
+  "image/webp",
+  "application/pdf",
+];
+const ATTACHMENT_SIGN_EXPIRES = 24 * 3600; // seconds
+
 // Translations are loaded from a local JSON file at init time.
 // The _translations module-level variable holds the parsed data.
 let _translations = null;
@@ -18,8 +30,9 @@ async function loadTranslations() {
   if (_translations) return _translations;
   try {
     // Resolve the translations.json URL relative to this module's location.
+    // The module URL is content-hashed, so the browser cache stays valid.
     const base = new URL(".", import.meta.url).href;
-    const resp = await fetch(base + "translations.json?v=" + Date.now());
+    const resp = await fetch(base + "translations.json");
     _translations = await resp.json();
   } catch (e) {
     console.warn("ha-note-record: failed to load translations.json, using built-in English fallback", e);
@@ -48,6 +61,19 @@ async function loadTranslations() {
   return _translations;
 }
 
+// Parsed updated_at per note object. Notes are replaced, never mutated,
+// on update, so each timestamp is parsed once rather than per comparison.
+const _updatedTsCache = new WeakMap();
+
+function _updatedTs(note) {
+  let ts = _updatedTsCache.get(note);
+  if (ts === undefined) {
+    ts = Date.parse(note.updated_at) || 0;
+    _updatedTsCache.set(note, ts);
+  }
+  return ts;
+}
+
 /**
  * Resolve the language key for the translations object.
  * zh-TW / zh-HK map to zh-Hant; other zh-* to zh-Hans; everything else to en.
@@ -291,6 +317,17 @@ class HaNoteRecordPanel extends LitElement {
         padding: 16px 0;
       }
 
+      .checklist {
+        list-style: none;
+        margin: 8px 0 0;
+        padding: 0;
+      }
+
+      .checklist li.checked span {
+        text-decoration: line-through;
+        color: var(--secondary-text-color);
+      }
+
       .notes-grid {
         display: grid;
         grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
@@ -524,6 +561,12 @@ class HaNoteRecordPanel extends LitElement {
         margin-top: 0;
       }
 
+      .note-card-content img,
+      .preview-content img {
+        max-width: 100%;
+        height: auto;
+      }
+
       .preview-content ul,
       .preview-content ol {
         padding-left: 20px;
@@ -648,6 +691,9 @@ class HaNoteRecordPanel extends LitElement {
     this._deleteCategoryTarget = null;
     this._deleteCategoryInput = "";
     this._prevLanguage = null;
+    // Attachment path -> { path, expires } of its signed form
+    this._signedAttachments = new Map();
+    this._signingAttachments = new Set();
   }
 
   connectedCallback() {
@@ -705,7 +751,7 @@ class HaNoteRecordPanel extends LitElement {
     return notes.sort((a, b) => {
       if (a.pinned && !b.pinned) return -1;
       if (!a.pinned && b.pinned) return 1;
-      return new Date(b.updated_at) - new Date(a.updated_at);
+      return _updatedTs(b) - _updatedTs(a);
     });
   }
 
@@ -713,7 +759,7 @@ class HaNoteRecordPanel extends LitElement {
     if (!content) return "";
     try {
       const rawHtml = marked.parse(content);
-      return DOMPurify.sanitize(rawHtml);
+      return this._prepareImages(DOMPurify.sanitize(rawHtml));
     } catch (e) {
       // If markdown parsing fails, escape the content as plain text
       // instead of passing raw content through DOMPurify (which could
@@ -728,6 +774,76 @@ class HaNoteRecordPanel extends LitElement {
     }
   }
 
+  _prepareImages(sanitized) {
+    if (!sanitized.includes("<img")) return sanitized;
+    const template = document.createElement("template");
+    template.innerHTML = sanitized;
+    for (const img of template.content.querySelectorAll("img")) {
+      img.setAttribute("loading", "lazy");
+      const src = img.getAttribute("src") || "";
+      if (!src.startsWith(`${ATTACHMENT_URL}/`)) continue;
+      const signed = this._signedAttachments.get(src);
+      if (signed && signed.expires > Date.now()) {
+        img.setAttribute("src", signed.path);
+      } else {
+        img.removeAttribute("src");
+        this._signAttachment(src);
+      }
+    }
+    return template.innerHTML;
+  }
+
+  async _signAttachment(path) {
+    if (this._signingAttachments.has(path)) return;
+    this._signingAttachments.add(path);
+    try {
+      const result = await this.hass.callWS({
+        type: "auth/sign_path",
+        path,
+        expires: ATTACHMENT_SIGN_EXPIRES,
+      });
+      // Re-sign well before the signature runs out
+      this._signedAttachments.set(path, {
+        path: result.path,
+        expires: Date.now() + (ATTACHMENT_SIGN_EXPIRES * 1000) / 2,
+      });
+      this.requestUpdate();
+    } catch (error) {
+      console.error("Failed to sign attachment path:", error);
+    } finally {
+      this._signingAttachments.delete(path);
+    }
+  }
+
+  async _onContentPaste(e) {
+    const file = [...(e.clipboardData?.files || [])].find((f) =>
+      ATTACHMENT_TYPES.includes(f.type)
+    );
+    if (!file) return;
+    e.preventDefault();
+    const { selectionStart, selectionEnd } = e.target;
+    try {
+      const response = await this.hass.fetchWithAuth(ATTACHMENT_URL, {
+        method: "POST",
+        headers: { "Content-Type": file.type },
+        body: file,
+      });
+      const result = await response.json();
+      if (!response.ok) throw new Error(result.message);
+      const link = file.type.startsWith("image/")
+        ? `![${file.name}](${result.url})`
+        : `[${file.name}](${result.url})`;
+      const content = this._editingNote?.content || "";
+      this._updateNoteField(
+        "content",
+        content.slice(0, selectionStart) + link + content.slice(selectionEnd)
+      );
+    } catch (error) {
+      console.error("Failed to upload attachment:", error);
+      this._showError(error.message || "Failed to upload attachment");
+    }
+  }
+
   _formatDate(dateStr) {
     try {
       const date = new Date(dateStr);
@@ -842,6 +958,51 @@ class HaNoteRecordPanel extends LitElement {
     }
   }
 
+  _renderChecklist(note) {
+    return html`
+      <ul class="checklist" @click=${(e) => e.stopPropagation()}>
+        ${note.checklist.map(
+          (item) => html`
+            <li class=${item.checked ? "checked" : ""}>
+              <label>
+                <input
+                  type="checkbox"
+                  .checked=${item.checked}
+                  @change=${(e) =>
+                    this._toggleChecklistItem(note, item, e.target.checked)}
+                />
+                <span>${item.text}</span>
+              </label>
+            </li>
+          `
+        )}
+      </ul>
+    `;
+  }
+
+  async _toggleChecklistItem(note, item, checked) {
+    try {
+      const updated = await this.hass.callWS({
+        type: "ha_note_record/update_checklist_item",
+        note_id: note.id,
+        item_id: item.id,
+        checked,
+      });
+      // Replace only the changed item; the note's content is untouched
+      this._notes = this._notes.map((n) =>
+        n.id === note.id
+          ? {
+              ...n,
+              checklist: n.checklist.map((i) => (i.id === updated.id ? updated : i)),
+            }
+          : n
+      );
+    } catch (error) {
+      console.error("Failed to update checklist item:", error);
+      this._showError(error.message || "Failed to update checklist item");
+    }
+  }
+
   // Note actions
   _openNoteDialog(mode = "create", note = null) {
     this._dialogMode = mode;
@@ -1027,6 +1188,9 @@ class HaNoteRecordPanel extends LitElement {
                                 this._truncateContent(note.content)
                               )}
                             ></div>
+                            ${note.checklist
+                              ? this._renderChecklist(note)
+                              : ""}
                             <div class="note-card-footer">
                               ${this._localize("updated")}: ${this._formatDate(note.updated_at)}
                             </div>
@@ -1080,6 +1244,7 @@ class HaNoteRecordPanel extends LitElement {
                   .value=${this._editingNote?.content || ""}
                   @input=${(e) =>
                     this._updateNoteField("content", e.target.value)}
+                  @paste=${this._onContentPaste}
                   placeholder="${this._localize("note_content_placeholder")}"
                 ></textarea>
               </div>
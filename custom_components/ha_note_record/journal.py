@@ -0,0 +1,250 @@
+"""Write-ahead intent journal for Ha Note Record."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Intent records carry the full resulting state of what they touch, so
+# replaying one that the snapshot already contains is harmless.
+OP_PUT_CATEGORY = "put_category"
+OP_DELETE_CATEGORY = "delete_category"
+OP_PUT_NOTE = "put_note"
+OP_PUT_NOTES = "put_notes"
+OP_DELETE_NOTES = "delete_notes"
+# Checklist item records carry the item and its position instead of the note
+OP_PUT_CHECKLIST_ITEM = "put_checklist_item"
+OP_DELETE_CHECKLIST_ITEM = "delete_checklist_item"
+
+# Rewrite the journal once this many already-snapshotted records pile up
+CHECKPOINT_RECORDS = 100
+
+
+def _append_lines(path: Path, lines: list[str]) -> None:
+    """Append lines and fsync them (executor)."""
+    with path.open("a", encoding="utf-8") as file:
+        file.write("".join(f"{line}\n" for line in lines))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _rewrite_lines(path: Path, lines: list[str]) -> None:
+    """Replace the journal with lines, or remove it when empty (executor)."""
+    if not lines:
+        path.unlink(missing_ok=True)
+        return
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as file:
+        file.write("".join(f"{line}\n" for line in lines))
+        file.flush()
+        os.fsync(file.fileno())
+    tmp_path.replace(path)
+
+
+def _read_intents(path: Path) -> list[dict[str, Any]]:
+    """Read complete journal records, ignoring a torn final write (executor)."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    intents: list[dict[str, Any]] = []
+    for line in text.splitlines():
+        try:
+            intent = json.loads(line)
+        except ValueError:
+            # Only the last record can be partial; anything after it was
+            # never acknowledged either.
+            _LOGGER.warning("Discarding incomplete journal record in %s", path)
+            break
+        if isinstance(intent, dict) and isinstance(intent.get("seq"), int):
+            intents.append(intent)
+    return intents
+
+
+def apply_intents(data: dict[str, Any], intents: list[dict[str, Any]]) -> None:
+    """Replay intents onto raw stored data in place."""
+    categories: list[dict[str, Any]] = data.setdefault("categories", [])
+    notes: list[dict[str, Any]] = data.setdefault("notes", [])
+    for intent in intents:
+        op = intent.get("op")
+        if op == OP_PUT_CATEGORY:
+            _put(categories, intent["category"])
+        elif op == OP_PUT_NOTE:
+            _put(notes, intent["note"])
+        elif op == OP_PUT_NOTES:
+            for note in intent["notes"]:
+                _put(notes, note)
+        elif op == OP_DELETE_NOTES:
+            _delete(notes, set(intent["note_ids"]))
+        elif op == OP_DELETE_CATEGORY:
+            _delete(notes, set(intent.get("note_ids", [])))
+            _delete(categories, {intent["category_id"]})
+        elif op in (OP_PUT_CHECKLIST_ITEM, OP_DELETE_CHECKLIST_ITEM):
+            _apply_item(notes, intent)
+
+
+def _apply_item(notes: list[dict[str, Any]], intent: dict[str, Any]) -> None:
+    """Put or delete one checklist item of a stored note."""
+    for note in notes:
+        if isinstance(note, dict) and note.get("id") == intent["note_id"]:
+            break
+    else:
+        return
+    items = [
+        item
+        for item in note.get("checklist") or []
+        if not (isinstance(item, dict) and item.get("id") == intent["item_id"])
+    ]
+    if intent["op"] == OP_PUT_CHECKLIST_ITEM:
+        items.insert(intent["index"], intent["item"])
+    note["checklist"] = items
+    note["updated_at"] = intent["updated_at"]
+
+
+def _put(records: list[dict[str, Any]], record: dict[str, Any]) -> None:
+    """Insert or replace a record by id."""
+    for index, existing in enumerate(records):
+        if isinstance(existing, dict) and existing.get("id") == record["id"]:
+            records[index] = record
+            return
+    records.append(record)
+
+
+def _delete(records: list[dict[str, Any]], ids: set[str]) -> None:
+    """Remove records by id."""
+    records[:] = [
+        r for r in records if not (isinstance(r, dict) and r.get("id") in ids)
+    ]
+
+
+class IntentJournal:
+    """Append-only, group-committed log of store mutations.
+
+    Appends made while a write is in flight are batched into the next
+    write, so concurrent mutations share one fsync. A record is dropped
+    from the journal once a snapshot containing it has been saved.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        """Initialize the journal."""
+        self._hass = hass
+        self._path = path
+        self._pending: list[tuple[int, str, asyncio.Future[None]]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._uncheckpointed: list[tuple[int, str]] = []
+        # Serializes appends and rewrites of the journal file
+        self._file_lock = asyncio.Lock()
+        self._written_seq = 0
+        self._file_records = 0
+        self.seq = 0
+        self.commits = 0
+        self.records = 0
+
+    @property
+    def has_records(self) -> bool:
+        """Return True if the journal file holds any records."""
+        return self._file_records > 0
+
+    async def async_read(self, after_seq: int) -> list[dict[str, Any]]:
+        """Return journal records newer than a snapshot's sequence number."""
+        intents = await self._hass.async_add_executor_job(_read_intents, self._path)
+        self._file_records = len(intents)
+        if intents:
+            self.seq = max(self.seq, intents[-1]["seq"])
+        self.seq = max(self.seq, after_seq)
+        self._written_seq = self.seq
+        return [intent for intent in intents if intent["seq"] > after_seq]
+
+    @callback
+    def async_append(self, intent: dict[str, Any]) -> asyncio.Future[None]:
+        """Queue an intent; the future resolves once it is on disk.
+
+        Sequence numbers are assigned here, so the journal order matches
+        the order in which callers applied their mutations.
+        """
+        self.seq += 1
+        line = json.dumps({"seq": self.seq, **intent}, separators=(",", ":"))
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        self._pending.append((self.seq, line, future))
+        self._uncheckpointed.append((self.seq, line))
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_background_task(
+                self._async_flush(), "ha_note_record journal flush"
+            )
+        return future
+
+    async def _async_flush(self) -> None:
+        """Write pending records in batches until none are left."""
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                try:
+                    async with self._file_lock:
+                        await self._hass.async_add_executor_job(
+                            _append_lines, self._path, [line for _, line, _ in batch]
+                        )
+                        self._written_seq = batch[-1][0]
+                        self._file_records += len(batch)
+                except OSError as err:
+                    failed = {seq for seq, _, _ in batch}
+                    self._uncheckpointed = [
+                        entry for entry in self._uncheckpointed if entry[0] not in failed
+                    ]
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(err)
+                    continue
+                self.commits += 1
+                self.records += len(batch)
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+        finally:
+            self._flush_task = None
+
+    async def async_checkpoint(self, seq: int, *, force: bool = False) -> None:
+        """Drop records up to seq, which a saved snapshot now contains.
+
+        The file is only rewritten once enough such records accumulate;
+        until then replaying them on load is harmless.
+        """
+        self._uncheckpointed = [
+            (s, line) for s, line in self._uncheckpointed if s > seq
+        ]
+        if not force and (
+            self._file_records - len(self._uncheckpointed) < CHECKPOINT_RECORDS
+        ):
+            return
+        async with self._file_lock:
+            # Records still pending are appended by the flush task after this
+            lines = [
+                line for s, line in self._uncheckpointed if s <= self._written_seq
+            ]
+            await self._hass.async_add_executor_job(_rewrite_lines, self._path, lines)
+            self._file_records = len(lines)
+
+    async def async_remove(self) -> None:
+        """Delete the journal file."""
+        async with self._file_lock:
+            await self._hass.async_add_executor_job(_rewrite_lines, self._path, [])
+            self._file_records = 0
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return journal statistics."""
+        return {
+            "seq": self.seq,
+            "commits": self.commits,
+            "records": self.records,
+            "records_per_commit": (
+                round(self.records / self.commits, 2) if self.commits else None
+            ),
+            "uncheckpointed": len(self._uncheckpointed),
+        }
@@ -0,0 +1,236 @@
+"""Versioned, chunked storage migrations for Ha Note Record."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+import time
+from typing import Any
+
+from .util import utcnow_iso
+
+_LOGGER = logging.getLogger(__name__)
+
+# Records handled between yields to the event loop
+MIGRATION_CHUNK_SIZE = 500
+
+type RecordMigration = Callable[[dict[str, Any]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class MigrationStep:
+    """Upgrade records to a storage version, one record at a time in place."""
+
+    version: tuple[int, int]
+    description: str
+    category: RecordMigration | None = None
+    note: RecordMigration | None = None
+
+
+def _add_note_tags(note: dict[str, Any]) -> None:
+    """Give a note an empty tag list."""
+    note.setdefault("tags", [])
+
+
+# Ordered oldest first; each step runs when the stored version is older.
+MIGRATIONS: tuple[MigrationStep, ...] = (
+    MigrationStep((1, 2), "Add note tags", note=_add_note_tags),
+)
+
+
+@dataclass(slots=True)
+class MigrationReport:
+    """Outcome of one migration step."""
+
+    version: tuple[int, int]
+    description: str
+    records: int
+    duration: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as a dictionary."""
+        return {
+            "version": ".".join(map(str, self.version)),
+            "description": self.description,
+            "records": self.records,
+            "duration": round(self.duration, 4),
+        }
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """Result of loading and repairing stored records."""
+
+    migrations: list[MigrationReport] = field(default_factory=list)
+    repaired: int = 0
+    dropped: int = 0
+    duration: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as a dictionary."""
+        return {
+            "migrations": [m.as_dict() for m in self.migrations],
+            "repaired": self.repaired,
+            "dropped": self.dropped,
+            "duration": round(self.duration, 4),
+        }
+
+
+async def async_migrate(
+    data: dict[str, Any], old_version: tuple[int, int]
+) -> list[MigrationReport]:
+    """Apply every step newer than old_version to data in place.
+
+    Records are mutated where they are, so peak memory stays close to the
+    size of the loaded document.
+    """
+    reports: list[MigrationReport] = []
+    for step in MIGRATIONS:
+        if step.version <= old_version:
+            continue
+        start = time.perf_counter()
+        count = 0
+        for key, migrate in (("categories", step.category), ("notes", step.note)):
+            if migrate is None:
+                continue
+            records = data.get(key) or []
+            for index, record in enumerate(records):
+                if isinstance(record, dict):
+                    migrate(record)
+                if index % MIGRATION_CHUNK_SIZE == MIGRATION_CHUNK_SIZE - 1:
+                    await asyncio.sleep(0)
+            count += len(records)
+        report = MigrationReport(
+            step.version, step.description, count, time.perf_counter() - start
+        )
+        _LOGGER.info(
+            "Migrated %d records to storage version %s (%s) in %.3fs",
+            count,
+            ".".join(map(str, step.version)),
+            step.description,
+            report.duration,
+        )
+        reports.append(report)
+    return reports
+
+
+def _valid_timestamp(value: Any) -> bool:
+    """Return True if value is a parseable ISO timestamp."""
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def repair_category(raw: Any, now: str) -> bool | None:
+    """Fix a stored category in place.
+
+    Returns None if it cannot be kept, True if it was changed.
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get("id"), str):
+        return None
+    repaired = False
+    if not isinstance(raw.get("name"), str) or not raw["name"].strip():
+        raw["name"] = raw["id"][:8]
+        repaired = True
+    if not _valid_timestamp(raw.get("created_at")):
+        raw["created_at"] = now
+        repaired = True
+    if (ttl := raw.get("default_ttl")) is not None and (
+        not isinstance(ttl, int) or isinstance(ttl, bool) or ttl <= 0
+    ):
+        # Notes created in the category would fail to compute their expiry
+        raw["default_ttl"] = None
+        repaired = True
+    return repaired
+
+
+def repair_note(raw: Any, now: str) -> bool | None:
+    """Fix a stored note in place.
+
+    Returns None if it cannot be kept, True if it was changed.
+    """
+    if (
+        not isinstance(raw, dict)
+        or not isinstance(raw.get("id"), str)
+        or not isinstance(raw.get("category_id"), str)
+    ):
+        return None
+    repaired = False
+    for key, default in (("title", raw["id"][:8]), ("content", "")):
+        if not isinstance(raw.get(key), str):
+            raw[key] = default
+            repaired = True
+    if not isinstance(raw.get("pinned"), bool):
+        raw["pinned"] = bool(raw.get("pinned"))
+        repaired = True
+    for key in ("created_at", "updated_at"):
+        if not _valid_timestamp(raw.get(key)):
+            raw[key] = now
+            repaired = True
+    if raw.get("expires_at") is not None and not _valid_timestamp(raw["expires_at"]):
+        raw["expires_at"] = None
+        repaired = True
+    tags = raw.get("tags")
+    if not isinstance(tags, list):
+        raw["tags"] = []
+        repaired = True
+    elif not all(isinstance(tag, str) for tag in tags):
+        raw["tags"] = [tag for tag in tags if isinstance(tag, str)]
+        repaired = True
+    checklist = raw.get("checklist")
+    if checklist is not None:
+        if not isinstance(checklist, list):
+            raw["checklist"] = None
+            repaired = True
+        elif not all(_valid_item(item) for item in checklist):
+            raw["checklist"] = [item for item in checklist if _valid_item(item)]
+            repaired = True
+    return repaired
+
+
+def _valid_item(raw: Any) -> bool:
+    """Return True if raw is a well-formed checklist item."""
+    return (
+        isinstance(raw, dict)
+        and isinstance(raw.get("id"), str)
+        and isinstance(raw.get("text"), str)
+        and isinstance(raw.get("checked"), bool)
+    )
+
+
+async def async_build_records[T](
+    raw_records: list[Any],
+    repair: Callable[[Any, str], bool | None],
+    factory: Callable[[dict[str, Any]], T],
+    report: LoadReport,
+) -> list[T]:
+    """Validate and convert raw records, releasing each dict as it is used.
+
+    raw_records is consumed: it is emptied from the end so the raw and
+    converted forms of the whole corpus never coexist.
+    """
+    now = utcnow_iso()
+    seen: set[str] = set()
+    records: list[T] = []
+    raw_records.reverse()
+    while raw_records:
+        raw = raw_records.pop()
+        result = repair(raw, now)
+        if result is None or raw["id"] in seen:
+            report.dropped += 1
+            _LOGGER.warning("Dropping malformed stored record: %.200r", raw)
+            continue
+        if result:
+            report.repaired += 1
+        seen.add(raw["id"])
+        records.append(factory(raw))
+        if len(records) % MIGRATION_CHUNK_SIZE == 0:
+            await asyncio.sleep(0)
+    return records
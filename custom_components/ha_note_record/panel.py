@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+from http import HTTPStatus
 import logging
 from pathlib import Path
+import shutil
+
+from aiohttp import hdrs, web
 
 from homeassistant.components import frontend, panel_custom
-from homeassistant.components.http import StaticPathConfig
+from homeassistant.components.http import HomeAssistantView
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
@@ -17,22 +23,108 @@ PANEL_URL_PATH = "ha-note-record"
 PANEL_COMPONENT_NAME = "ha-note-record-panel"
 PANEL_TITLE = "Note Record"
 PANEL_ICON = "mdi:note-text"
-PANEL_VERSION = "1.0.0"
+
+FRONTEND_URL = f"/{DOMAIN}/frontend"
+DATA_FRONTEND_VIEW = f"{DOMAIN}_frontend_view"
+
+# Asset URLs embed a content hash, so a given URL never changes content.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPRESSIBLE_SUFFIXES = {".js", ".json", ".css", ".svg"}
+COMPLETE_MARKER = ".complete"
+
+
+def _hash_assets(files: list[Path], source: Path) -> str:
+    """Return a short content hash over all frontend files."""
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(path.relative_to(source).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _write_compressed(path: Path) -> None:
+    """Write .gz (and .br when available) siblings that beat the original."""
+    data = path.read_bytes()
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli  # noqa: PLC0415
+    except ImportError:
+        pass
+    else:
+        variants[".br"] = brotli.compress(data, quality=11)
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data):
+            path.with_name(path.name + suffix).write_bytes(compressed)
+
+
+def build_asset_cache(source: Path, cache_root: Path) -> tuple[str, Path]:
+    """Copy frontend assets into a content-hashed, precompressed cache dir.
+
+    Runs in the executor. Returns the asset version and the directory to
+    serve. Stale versions are removed when a new one is built.
+    """
+    files = sorted(p for p in source.rglob("*") if p.is_file())
+    version = _hash_assets(files, source)
+    target = cache_root / version
+    if (target / COMPLETE_MARKER).exists():
+        return version, target
+
+    shutil.rmtree(cache_root, ignore_errors=True)
+    for path in files:
+        dest = target / path.relative_to(source)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, dest)
+        if dest.suffix in COMPRESSIBLE_SUFFIXES:
+            _write_compressed(dest)
+    (target / COMPLETE_MARKER).touch()
+    return version, target
+
+
+class HaNoteRecordFrontendView(HomeAssistantView):
+    """Serve versioned panel assets with immutable cache headers."""
+
+    url = FRONTEND_URL + "/{version}/{filename:.+}"
+    name = f"{DOMAIN}:frontend"
+    requires_auth = False
+
+    def __init__(self, version: str, directory: Path) -> None:
+        """Initialize the view."""
+        self.version = version
+        self.directory = directory
+
+    async def get(
+        self, request: web.Request, version: str, filename: str
+    ) -> web.StreamResponse:
+        """Serve an asset, letting aiohttp pick a precompressed variant."""
+        if version != self.version:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        path = (self.directory / filename).resolve()
+        if not path.is_relative_to(self.directory) or path.name == COMPLETE_MARKER:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        # FileResponse handles ETag/If-Modified-Since and serves the .br/.gz
+        # sibling when the client accepts it; existence is checked there too.
+        return web.FileResponse(
+            path, headers={hdrs.CACHE_CONTROL: IMMUTABLE_CACHE_CONTROL}
+        )
 
 
 async def async_register_panel(hass: HomeAssistant) -> None:
     """Register the panel."""
-    frontend_dir = Path(__file__).parent / "frontend"
-
-    await hass.http.async_register_static_paths(
-        [
-            StaticPathConfig(
-                f"/{DOMAIN}/frontend",
-                str(frontend_dir),
-                cache_headers=False,
-            )
-        ]
+    version, directory = await hass.async_add_executor_job(
+        build_asset_cache,
+        Path(__file__).parent / "frontend",
+        Path(hass.config.cache_path(DOMAIN, "frontend")),
     )
+    directory = directory.resolve()
+
+    if (view := hass.data.get(DATA_FRONTEND_VIEW)) is None:
+        view = HaNoteRecordFrontendView(version, directory)
+        hass.http.register_view(view)
+        hass.data[DATA_FRONTEND_VIEW] = view
+    else:
+        view.version = version
+        view.directory = directory
 
     await panel_custom.async_register_panel(
         hass,
@@ -40,12 +132,12 @@ async def async_register_panel(hass: HomeAssistant) -> None:
         frontend_url_path=PANEL_URL_PATH,
         sidebar_title=PANEL_TITLE,
         sidebar_icon=PANEL_ICON,
-        module_url=f"/{DOMAIN}/frontend/ha-note-record-panel.js?v={PANEL_VERSION}",
+        module_url=f"{FRONTEND_URL}/{version}/ha-note-record-panel.js",
         require_admin=False,
         config={},
     )
 
-    _LOGGER.info("Registered Ha Note Record panel")
+    _LOGGER.info("Registered Ha Note Record panel (assets %s)", version)
 
 
 async def async_unregister_panel(hass: HomeAssistant) -> bool:
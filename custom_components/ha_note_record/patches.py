@@ -0,0 +1,78 @@
+"""Splice patches for note content."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import re
+from typing import Any
+
+from .const import MAX_NOTE_CONTENT_LENGTH
+
+_SURROGATE = re.compile("[\ud800-\udfff]")
+
+
+@dataclass(frozen=True, slots=True)
+class Splice:
+    """Replace delete characters at offset with insert.
+
+    offset and delete count UTF-16 code units, as JavaScript string indices
+    do, so the frontend can send and apply splices without converting.
+    """
+
+    offset: int
+    delete: int = 0
+    insert: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Splice:
+        """Create from dictionary."""
+        return cls(
+            offset=data["offset"],
+            delete=data.get("delete", 0),
+            insert=data.get("insert", ""),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {"offset": self.offset, "delete": self.delete, "insert": self.insert}
+
+
+def _utf16_index(content: str, encoded: bytes, offset: int) -> int:
+    """Return the index in content of a UTF-16 code unit offset.
+
+    Raises ValueError if the offset falls inside a surrogate pair.
+    """
+    if len(encoded) == 2 * len(content):
+        return offset  # No characters outside the BMP
+    unit = int.from_bytes(encoded[2 * offset : 2 * offset + 2], "little")
+    if 0xDC00 <= unit <= 0xDFFF:
+        raise ValueError(f"Splice offset {offset} is inside a surrogate pair")
+    return len(encoded[: 2 * offset].decode("utf-16-le", "surrogatepass"))
+
+
+def apply_splices(content: str, splices: Iterable[Splice]) -> str:
+    """Apply splices in order, each against the result of the previous one.
+
+    Raises ValueError if a splice falls outside the content or inside a
+    surrogate pair, inserts an unpaired surrogate, or the result is longer
+    than MAX_NOTE_CONTENT_LENGTH.
+    """
+    for splice in splices:
+        encoded = content.encode("utf-16-le", "surrogatepass")
+        end = splice.offset + splice.delete
+        if splice.offset < 0 or splice.delete < 0 or end > len(encoded) // 2:
+            raise ValueError(
+                f"Splice {splice.offset}+{splice.delete} is outside the content "
+                f"of length {len(encoded) // 2}"
+            )
+        if _SURROGATE.search(splice.insert):
+            raise ValueError("Splice inserts an unpaired surrogate")
+        start = _utf16_index(content, encoded, splice.offset)
+        stop = _utf16_index(content, encoded, end)
+        if len(content) - (stop - start) + len(splice.insert) > MAX_NOTE_CONTENT_LENGTH:
+            raise ValueError(
+                f"Note content exceeds maximum length of {MAX_NOTE_CONTENT_LENGTH} characters"
+            )
+        content = content[:start] + splice.insert + content[stop:]
+    return content
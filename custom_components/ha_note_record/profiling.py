@@ -0,0 +1,87 @@
+"""On-demand profiling for Ha Note Record."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PROFILE_SESSION = f"{DOMAIN}_profile_session"
+
+
+class ProfileSession:
+    """Collect cProfile data for a bounded window.
+
+    On the Python versions Home Assistant supports, cProfile records every
+    thread, so executor jobs such as snapshot serialization are included.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the session."""
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start profiling.
+
+        Raises ValueError if another profiler is active.
+        """
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        self._profile.disable()
+
+    def write(self, prof_path: str, summary_path: str, top: int) -> None:
+        """Write the profile and a text summary (executor)."""
+        summary = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=summary)
+        stats.dump_stats(prof_path)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        summary.write(f"Top {top} Ha Note Record functions by cumulative time\n")
+        stats.print_stats(DOMAIN, top)
+        summary.write(f"\nTop {top} functions overall by internal time\n")
+        stats.sort_stats(pstats.SortKey.TIME)
+        stats.print_stats(top)
+        with open(summary_path, "w", encoding="utf-8") as file:
+            file.write(summary.getvalue())
+
+
+async def async_profile(
+    hass: HomeAssistant, duration: float, top: int
+) -> dict[str, str]:
+    """Profile for duration seconds and write the results to the config dir.
+
+    Returns the paths of the .prof file and the text summary. Raises
+    RuntimeError if a session is already running and ValueError if another
+    profiler is active on the event loop.
+    """
+    if DATA_PROFILE_SESSION in hass.data:
+        raise RuntimeError("A profile is already running")
+    session = ProfileSession()
+    session.start()
+    hass.data[DATA_PROFILE_SESSION] = session
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        session.stop()
+        del hass.data[DATA_PROFILE_SESSION]
+
+    stamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+    paths = {
+        "profile": hass.config.path(f"{DOMAIN}_profile_{stamp}.prof"),
+        "summary": hass.config.path(f"{DOMAIN}_profile_{stamp}.txt"),
+    }
+    await hass.async_add_executor_job(
+        session.write, paths["profile"], paths["summary"], top
+    )
+    _LOGGER.info("Wrote profile to %s", paths["profile"])
+    return paths
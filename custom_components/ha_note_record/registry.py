@@ -0,0 +1,119 @@
+"""Entity and device registry helpers for Ha Note Record."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+
+NOTE_ENTITY_SUFFIXES = (("text", "_content"), ("switch", "_pinned"))
+
+# Config entry minor version from which note unique ids omit the category
+UNIQUE_ID_MINOR_VERSION = 2
+
+
+def note_unique_id(note_id: str, suffix: str) -> str:
+    """Return the unique id of a note entity.
+
+    It does not depend on the category, so moving a note keeps its
+    entities and their history.
+    """
+    return f"{DOMAIN}_{note_id}{suffix}"
+
+
+def category_device_info(category_id: str, name: str) -> DeviceInfo:
+    """Return the device info of a category."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, category_id)},
+        name=name,
+        manufacturer="Ha Note Record",
+        model="Note Category",
+    )
+
+
+@callback
+def async_remove_note_entities(hass: HomeAssistant, note_ids: Iterable[str]) -> None:
+    """Remove registry entries for notes."""
+    ent_reg = er.async_get(hass)
+    for note_id in note_ids:
+        for platform, suffix in NOTE_ENTITY_SUFFIXES:
+            unique_id = note_unique_id(note_id, suffix)
+            entity_id = ent_reg.async_get_entity_id(platform, DOMAIN, unique_id)
+            if entity_id:
+                ent_reg.async_remove(entity_id)
+
+
+@callback
+def async_remove_category_device(hass: HomeAssistant, category_id: str) -> None:
+    """Remove the device registry entry of a category."""
+    dev_reg = dr.async_get(hass)
+    device = dev_reg.async_get_device(identifiers={(DOMAIN, category_id)})
+    if device:
+        dev_reg.async_remove_device(device.id)
+
+
+@callback
+def async_move_note_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    category_id: str,
+    name: str,
+    note_ids: Iterable[str],
+) -> None:
+    """Attach the entities of moved notes to their new category's device."""
+    dev_reg = dr.async_get(hass)
+    device = dev_reg.async_get_or_create(
+        config_entry_id=entry.entry_id, **category_device_info(category_id, name)
+    )
+    ent_reg = er.async_get(hass)
+    for note_id in note_ids:
+        for platform, suffix in NOTE_ENTITY_SUFFIXES:
+            unique_id = note_unique_id(note_id, suffix)
+            entity_id = ent_reg.async_get_entity_id(platform, DOMAIN, unique_id)
+            if entity_id:
+                ent_reg.async_update_entity(entity_id, device_id=device.id)
+
+
+@callback
+def async_rename_category_device(
+    hass: HomeAssistant, category_id: str, name: str
+) -> None:
+    """Rename the device of a category; a name set by the user is kept."""
+    dev_reg = dr.async_get(hass)
+    device = dev_reg.async_get_device(identifiers={(DOMAIN, category_id)})
+    if device:
+        dev_reg.async_update_device(device.id, name=name)
+
+
+async def async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the category from note entity unique ids.
+
+    Old ids were "<domain>_<category_id>_<note_id><suffix>". Ids are
+    UUIDs, which contain no underscores.
+    """
+    prefix = f"{DOMAIN}_"
+    suffixes = dict(NOTE_ENTITY_SUFFIXES)
+
+    @callback
+    def _migrate(entity_entry: er.RegistryEntry) -> dict[str, Any] | None:
+        """Return the new unique id of an old note entity."""
+        suffix = suffixes.get(entity_entry.domain)
+        unique_id = entity_entry.unique_id
+        if (
+            suffix is None
+            or not unique_id.startswith(prefix)
+            or not unique_id.endswith(suffix)
+        ):
+            return None
+        ids = unique_id[len(prefix) : -len(suffix)].split("_")
+        if len(ids) != 2:
+            return None
+        return {"new_unique_id": note_unique_id(ids[1], suffix)}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate)
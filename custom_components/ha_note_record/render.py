@@ -0,0 +1,128 @@
+"""Server-side markdown rendering for Ha Note Record."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from html import unescape
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import RENDER_CACHE_MAX_BYTES
+from .util import content_hash
+
+_LOGGER = logging.getLogger(__name__)
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "sane_lists", "nl2br"]
+
+
+def render_markdown(content: str) -> str:
+    """Render markdown to sanitized HTML.
+
+    This is CPU bound and should run in the executor for large inputs.
+    """
+    if not content:
+        return ""
+
+    # Imported lazily: only clients that request HTML pay for these modules.
+    import markdown  # noqa: PLC0415
+    import nh3  # noqa: PLC0415
+
+    return nh3.clean(markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS))
+
+
+def render_text(content: str) -> str:
+    """Render markdown to plain text, for clients that cannot show markup.
+
+    CPU bound like render_markdown; run it in the executor.
+    """
+    if not content:
+        return ""
+
+    import nh3  # noqa: PLC0415
+
+    return unescape(nh3.clean(render_markdown(content), tags=set())).strip()
+
+
+class MarkdownRenderCache:
+    """LRU cache of rendered HTML keyed by content hash, capped by size."""
+
+    def __init__(self, max_bytes: int = RENDER_CACHE_MAX_BYTES) -> None:
+        """Initialize the cache."""
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, content: str) -> str | None:
+        """Return cached HTML for content, or None on a miss."""
+        key = content_hash(content)
+        html = self._entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return html
+
+    def put(self, content: str, html: str) -> None:
+        """Store rendered HTML for content, evicting least recently used."""
+        size = len(html)
+        if size > self._max_bytes:
+            return
+        key = content_hash(content)
+        if (old := self._entries.pop(key, None)) is not None:
+            self._size -= len(old)
+        self._entries[key] = html
+        self._size += size
+        while self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def discard(self, content: str) -> None:
+        """Drop the entry for content, e.g. after the note body changed."""
+        if (old := self._entries.pop(content_hash(content), None)) is not None:
+            self._size -= len(old)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._size = 0
+
+    async def async_render_many(
+        self, hass: HomeAssistant, contents: Iterable[str]
+    ) -> list[str]:
+        """Render several bodies, doing cache misses in one executor job."""
+        contents = list(contents)
+        results: list[str | None] = [self.get(c) for c in contents]
+        missing = [i for i, html in enumerate(results) if html is None]
+        if missing:
+            rendered = await hass.async_add_executor_job(
+                _render_all, [contents[i] for i in missing]
+            )
+            for i, html in zip(missing, rendered, strict=True):
+                self.put(contents[i], html)
+                results[i] = html
+        return results  # type: ignore[return-value]
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _render_all(contents: list[str]) -> list[str]:
+    """Render a batch of bodies (executor)."""
+    return [render_markdown(content) for content in contents]
@@ -0,0 +1,208 @@
+"""REST read API for Ha Note Record.
+
+Meant for clients that poll, such as e-ink displays and scripts. Every
+response carries an ETag, and a request whose If-None-Match still matches
+gets 304 Not Modified before any note is serialized or rendered.
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import hdrs, web
+from aiohttp.helpers import ETAG_ANY
+import voluptuous as vol
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import DEFAULT_PAGE_SIZE, DOMAIN, MAX_PAGE_SIZE
+from .render import render_text
+from .store import Note, async_get_store
+from .util import TAGS_SCHEMA
+
+NOTES_URL = f"/api/{DOMAIN}/notes"
+DATA_REST_API = f"{DOMAIN}_rest_api"
+
+# Clients may keep a response but must revalidate it; a 304 is cheap.
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+FORMAT_CONTENT_TYPES = {
+    "markdown": "text/markdown",
+    "html": "text/html",
+    "text": "text/plain",
+}
+
+LIST_QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): str,
+        vol.Optional("category_id"): str,
+        vol.Optional("tags"): vol.All(cv.ensure_list_csv, TAGS_SCHEMA),
+        vol.Optional("offset", default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional("include_html", default=False): cv.boolean,
+    }
+)
+
+NOTE_QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): str,
+        vol.Optional("format", default="json"): vol.In(
+            ["json", *FORMAT_CONTENT_TYPES]
+        ),
+    }
+)
+
+
+def _parse_query(
+    request: web.Request, schema: vol.Schema
+) -> dict[str, Any] | web.Response:
+    """Validate query parameters, or return the error response."""
+    try:
+        return schema(dict(request.query))
+    except vol.Invalid as err:
+        return HomeAssistantView.json_message(
+            f"Invalid query: {err}", HTTPStatus.BAD_REQUEST
+        )
+
+
+def _not_modified(request: web.Request, etag: str) -> web.Response | None:
+    """Return a 304 response if the client already has etag."""
+    if not (tags := request.if_none_match):
+        return None
+    if not any(tag.value in (etag, ETAG_ANY) for tag in tags):
+        return None
+    response = web.Response(status=HTTPStatus.NOT_MODIFIED)
+    return _cacheable(response, etag)
+
+
+def _cacheable(response: web.StreamResponse, etag: str) -> web.StreamResponse:
+    """Tag a response so clients can revalidate it."""
+    response.etag = etag
+    response.headers[hdrs.CACHE_CONTROL] = REVALIDATE_CACHE_CONTROL
+    return response
+
+
+def note_markdown(note: Note) -> str:
+    """Return a note as markdown, with checklist items as task list lines."""
+    if note.checklist is None:
+        return note.content
+    items = "\n".join(
+        f"- [{'x' if item.checked else ' '}] {item.text}" for item in note.checklist
+    )
+    return f"{note.content}\n\n{items}" if note.content else items
+
+
+class HaNoteRecordNotesView(HomeAssistantView):
+    """List notes, optionally filtered by category and tags."""
+
+    url = NOTES_URL
+    name = f"{DOMAIN}:api:notes"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request) -> web.StreamResponse:
+        """Return a page of notes, pinned first then most recently updated.
+
+        The ETag follows the notebook's revision, so any change to the
+        notebook invalidates it.
+        """
+        query = _parse_query(request, LIST_QUERY_SCHEMA)
+        if isinstance(query, web.Response):
+            return query
+        store = async_get_store(self.hass, query.get("entry_id"))
+        if store is None:
+            return self.json_message("Notebook not found", HTTPStatus.NOT_FOUND)
+        category_id = query.get("category_id")
+        if category_id is not None and store.get_category(category_id) is None:
+            return self.json_message("Category not found", HTTPStatus.NOT_FOUND)
+
+        etag = store.cursor
+        if (response := _not_modified(request, etag)) is not None:
+            return response
+
+        matched = store.query_notes(tags_all=query.get("tags"), category_id=category_id)
+        offset = query["offset"]
+        notes = matched[offset : offset + query["limit"]]
+        note_dicts = [note.to_dict() for note in notes]
+        if query["include_html"]:
+            for note_dict, html in zip(
+                note_dicts, await store.async_render_html(notes), strict=True
+            ):
+                note_dict["html"] = html
+        next_offset = offset + len(notes)
+        return _cacheable(
+            self.json(
+                {
+                    "notes": note_dicts,
+                    "total": len(matched),
+                    "next_offset": next_offset if next_offset < len(matched) else None,
+                    "cursor": store.cursor,
+                }
+            ),
+            etag,
+        )
+
+
+class HaNoteRecordNoteView(HomeAssistantView):
+    """Return one note as JSON, markdown, HTML or plain text."""
+
+    url = NOTES_URL + "/{note_id}"
+    name = f"{DOMAIN}:api:note"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, note_id: str) -> web.StreamResponse:
+        """Return a note; its ETag changes only when the note does."""
+        query = _parse_query(request, NOTE_QUERY_SCHEMA)
+        if isinstance(query, web.Response):
+            return query
+        store = async_get_store(self.hass, query.get("entry_id"))
+        if store is None:
+            return self.json_message("Notebook not found", HTTPStatus.NOT_FOUND)
+        if (note := store.get_note(note_id)) is None:
+            return self.json_message("Note not found", HTTPStatus.NOT_FOUND)
+
+        etag = store.note_version(note_id)
+        if (response := _not_modified(request, etag)) is not None:
+            return response
+
+        fmt = query["format"]
+        if fmt == "json":
+            return _cacheable(self.json(note.to_dict()), etag)
+        text = note_markdown(note)
+        if fmt == "html":
+            text = (
+                await store.render_cache.async_render_many(self.hass, [text])
+            )[0]
+        elif fmt == "text":
+            text = await self.hass.async_add_executor_job(render_text, text)
+        response = web.Response(
+            text=text, content_type=FORMAT_CONTENT_TYPES[fmt], charset="utf-8"
+        )
+        if fmt == "html":
+            # Opened directly, the page must not run anything on our origin
+            response.headers["Content-Security-Policy"] = "sandbox"
+        return _cacheable(response, etag)
+
+
+@callback
+def async_register_rest_api(hass: HomeAssistant) -> None:
+    """Register the REST views once."""
+    if hass.data.get(DATA_REST_API):
+        return
+    hass.data[DATA_REST_API] = True
+    hass.http.register_view(HaNoteRecordNotesView(hass))
+    hass.http.register_view(HaNoteRecordNoteView(hass))
@@ -0,0 +1,93 @@
+"""Typo-tolerant title lookup for Ha Note Record."""
+
+from __future__ import annotations
+
+from collections import Counter
+import heapq
+
+# Matches scoring below this are not returned
+MIN_SCORE = 0.25
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the padded character trigrams of text, case-folded.
+
+    Words are padded so that word starts and ends weigh in, which ranks
+    "wifi" closer to "Wifi password" than to "Hawaii fish".
+    """
+    grams: set[str] = set()
+    for word in text.casefold().split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Inverted index from trigrams to keys, updated per key.
+
+    Lookups only touch the postings of the query's trigrams, so their
+    cost depends on the query and on how common its trigrams are, not on
+    the number of indexed titles.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: dict[str, set[str]] = {}
+        self._grams: dict[str, frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed keys."""
+        return len(self._grams)
+
+    def add(self, key: str, text: str) -> None:
+        """Index text under key, replacing what key had."""
+        self.remove(key)
+        grams = trigrams(text)
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """Drop key from the index."""
+        if (grams := self._grams.pop(key, None)) is None:
+            return
+        for gram in grams:
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def clear(self) -> None:
+        """Drop every key."""
+        self._postings.clear()
+        self._grams.clear()
+
+    def search(
+        self, text: str, limit: int, min_score: float = MIN_SCORE
+    ) -> list[tuple[str, float]]:
+        """Return up to limit (key, score) pairs, best first.
+
+        The score is the Dice coefficient of the trigram sets: 1.0 for the
+        same words, falling off with each differing character.
+        """
+        query = trigrams(text)
+        if not query:
+            return []
+        shared: Counter[str] = Counter()
+        for gram in query:
+            if (keys := self._postings.get(gram)) is not None:
+                shared.update(keys)
+        # Dice <= 2c / (q + c) for c shared trigrams, so keys sharing fewer
+        # than this cannot reach min_score and are skipped before scoring.
+        needed = min_score * len(query) / (2 - min_score)
+        grams = self._grams
+        size = len(query)
+        best = heapq.nlargest(
+            limit,
+            (
+                (2 * count / (size + len(grams[key])), key)
+                for key, count in shared.items()
+                if count >= needed
+            ),
+        )
+        return [(key, round(score, 4)) for score, key in best if score >= min_score]
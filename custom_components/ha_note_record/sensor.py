@@ -0,0 +1,194 @@
+"""Statistics sensors for Ha Note Record integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .aggregates import NoteAggregate
+from .const import DOMAIN, STATISTICS_UPDATE_COOLDOWN
+from .store import HaNoteRecordStore
+from .util import int_to_datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class HaNoteRecordSensorEntityDescription(SensorEntityDescription):
+    """Describe a note statistics sensor."""
+
+    value_fn: Callable[[NoteAggregate], StateType | datetime]
+
+
+SENSORS: tuple[HaNoteRecordSensorEntityDescription, ...] = (
+    HaNoteRecordSensorEntityDescription(
+        key="notes",
+        translation_key="notes",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.notes,
+    ),
+    HaNoteRecordSensorEntityDescription(
+        key="pinned_notes",
+        translation_key="pinned_notes",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.pinned,
+    ),
+    HaNoteRecordSensorEntityDescription(
+        key="characters",
+        translation_key="characters",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.characters,
+    ),
+    HaNoteRecordSensorEntityDescription(
+        key="last_updated",
+        translation_key="last_updated",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda stats: (
+            int_to_datetime(stats.last_updated)
+            if stats.last_updated is not None
+            else None
+        ),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up statistics sensors from a config entry."""
+    store: HaNoteRecordStore = entry.runtime_data
+    sensors: list[HaNoteRecordStatisticSensor] = []
+    known_category_ids: set[str] = set()
+
+    def _build(category_id: str | None) -> list[HaNoteRecordStatisticSensor]:
+        """Create the sensors of a category, or of the notebook for None."""
+        new = [
+            HaNoteRecordStatisticSensor(store, entry, description, category_id)
+            for description in SENSORS
+        ]
+        sensors.extend(new)
+        return new
+
+    @callback
+    def async_write_changed() -> None:
+        """Write the state of every sensor whose value changed."""
+        for sensor in sensors:
+            sensor.async_write_if_changed()
+
+    # Bursts of mutations result in one write now and one after the cooldown
+    debouncer = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=STATISTICS_UPDATE_COOLDOWN,
+        immediate=True,
+        function=async_write_changed,
+    )
+    entry.async_on_unload(debouncer.async_shutdown)
+
+    entities = _build(None)
+    for category in store.categories:
+        entities.extend(_build(category.id))
+        known_category_ids.add(category.id)
+    async_add_entities(entities)
+
+    @callback
+    def async_store_updated() -> None:
+        """Add sensors for new categories and schedule a state write."""
+        current_ids = {category.id for category in store.categories}
+        removed_ids = known_category_ids - current_ids
+        if removed_ids:
+            for sensor in sensors:
+                if sensor.category_id in removed_ids and sensor.hass is not None:
+                    # Shown unavailable once; nothing updates them after this
+                    sensor.async_write_ha_state()
+            sensors[:] = [s for s in sensors if s.category_id not in removed_ids]
+            known_category_ids.difference_update(removed_ids)
+        if new_ids := current_ids - known_category_ids:
+            new_entities: list[HaNoteRecordStatisticSensor] = []
+            for category_id in new_ids:
+                new_entities.extend(_build(category_id))
+            known_category_ids.update(new_ids)
+            async_add_entities(new_entities)
+        debouncer.async_schedule_call()
+
+    entry.async_on_unload(store.async_add_listener(async_store_updated))
+
+
+class HaNoteRecordStatisticSensor(SensorEntity):
+    """Sensor reporting a running statistic of a category or notebook."""
+
+    entity_description: HaNoteRecordSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        store: HaNoteRecordStore,
+        entry: ConfigEntry,
+        description: HaNoteRecordSensorEntityDescription,
+        category_id: str | None,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._store = store
+        self.category_id = category_id
+        self._attr_native_value = description.value_fn(self._aggregate())
+        scope = category_id if category_id is not None else entry.entry_id
+        self._attr_unique_id = f"{DOMAIN}_{scope}_stat_{description.key}"
+        if category_id is None:
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, entry.entry_id)},
+                name=entry.title,
+                manufacturer="Ha Note Record",
+                model="Notebook",
+                entry_type=DeviceEntryType.SERVICE,
+            )
+        else:
+            category = store.get_category(category_id)
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, category_id)},
+                name=category.name if category else None,
+                manufacturer="Ha Note Record",
+                model="Note Category",
+            )
+
+    def _aggregate(self) -> NoteAggregate:
+        """Return the statistics this sensor reports."""
+        if self.category_id is None:
+            return self._store.aggregates.total
+        return self._store.aggregates.get(self.category_id)
+
+    @property
+    def available(self) -> bool:
+        """Return True if the category still exists."""
+        return (
+            self.category_id is None
+            or self._store.get_category(self.category_id) is not None
+        )
+
+    @callback
+    def async_write_if_changed(self) -> None:
+        """Take the current statistic, writing state only if it changed."""
+        value = self.entity_description.value_fn(self._aggregate())
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        if self.hass is not None:
+            self.async_write_ha_state()
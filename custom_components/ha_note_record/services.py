@@ -0,0 +1,334 @@
+"""Services for Ha Note Record integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.const import CONF_ENTRY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_register_admin_service
+
+from .checklist import ITEM_TEXT_SCHEMA
+from .const import (
+    ATTR_CATEGORY,
+    ATTR_CATEGORY_ID,
+    ATTR_CHECKED,
+    ATTR_DURATION,
+    ATTR_INDEX,
+    ATTR_ITEM_ID,
+    ATTR_LIMIT,
+    ATTR_NOTE_ID,
+    ATTR_QUERY,
+    ATTR_TAGS_ALL,
+    ATTR_TAGS_ANY,
+    ATTR_TEXT,
+    ATTR_TITLE,
+    ATTR_TOP,
+    DOMAIN,
+    SERVICE_ADD_CHECKLIST_ITEM,
+    SERVICE_FIND_NOTE,
+    SERVICE_GET_NOTE,
+    SERVICE_LIST_NOTES,
+    SERVICE_PROFILE,
+    SERVICE_QUERY_NOTES,
+    SERVICE_REMOVE_CHECKLIST_ITEM,
+    SERVICE_UPDATE_CHECKLIST_ITEM,
+)
+from .profiling import async_profile
+from .store import Category, HaNoteRecordStore, async_get_store
+from .util import TAGS_SCHEMA
+
+QUERY_NOTES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_ENTRY_ID): str,
+        vol.Optional(ATTR_TAGS_ALL): TAGS_SCHEMA,
+        vol.Optional(ATTR_TAGS_ANY): TAGS_SCHEMA,
+        vol.Optional(ATTR_CATEGORY_ID): str,
+    }
+)
+
+FIND_NOTE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_ENTRY_ID): str,
+        vol.Required(ATTR_QUERY): vol.All(str, vol.Length(min=1)),
+        vol.Optional(ATTR_CATEGORY_ID): str,
+        vol.Optional(ATTR_LIMIT, default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+    }
+)
+
+GET_NOTE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(CONF_ENTRY_ID): str,
+            vol.Exclusive(ATTR_NOTE_ID, "note"): str,
+            vol.Exclusive(ATTR_TITLE, "note"): str,
+            vol.Optional(ATTR_CATEGORY): str,
+            vol.Optional(ATTR_CATEGORY_ID): str,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_NOTE_ID, ATTR_TITLE),
+)
+
+LIST_NOTES_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(CONF_ENTRY_ID): str,
+            vol.Exclusive(ATTR_CATEGORY, "category"): str,
+            vol.Exclusive(ATTR_CATEGORY_ID, "category"): str,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_CATEGORY, ATTR_CATEGORY_ID),
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=30): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+        vol.Optional(ATTR_TOP, default=40): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+
+ADD_CHECKLIST_ITEM_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_ENTRY_ID): str,
+        vol.Required(ATTR_NOTE_ID): str,
+        vol.Required(ATTR_TEXT): ITEM_TEXT_SCHEMA,
+        vol.Optional(ATTR_INDEX): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+UPDATE_CHECKLIST_ITEM_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(CONF_ENTRY_ID): str,
+            vol.Required(ATTR_NOTE_ID): str,
+            vol.Required(ATTR_ITEM_ID): str,
+            vol.Optional(ATTR_TEXT): ITEM_TEXT_SCHEMA,
+            vol.Optional(ATTR_CHECKED): cv.boolean,
+            vol.Optional(ATTR_INDEX): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_TEXT, ATTR_CHECKED, ATTR_INDEX),
+)
+
+REMOVE_CHECKLIST_ITEM_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_ENTRY_ID): str,
+        vol.Required(ATTR_NOTE_ID): str,
+        vol.Required(ATTR_ITEM_ID): str,
+    }
+)
+
+
+def _get_store(hass: HomeAssistant, call: ServiceCall) -> HaNoteRecordStore:
+    """Return the addressed notebook's store, raising if it is not loaded."""
+    store = async_get_store(hass, call.data.get(CONF_ENTRY_ID))
+    if store is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="not_loaded"
+        )
+    return store
+
+
+def _get_category(store: HaNoteRecordStore, call: ServiceCall) -> Category:
+    """Return the category named by id or by name, raising if there is none."""
+    if (category_id := call.data.get(ATTR_CATEGORY_ID)) is not None:
+        category = store.get_category(category_id)
+    else:
+        category = store.get_category_by_name(call.data.get(ATTR_CATEGORY, ""))
+    if category is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="category_not_found"
+        )
+    return category
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    @callback
+    def async_query_notes(call: ServiceCall) -> ServiceResponse:
+        """Return notes matching a tag filter."""
+        notes = _get_store(hass, call).query_notes(
+            tags_all=call.data.get(ATTR_TAGS_ALL),
+            tags_any=call.data.get(ATTR_TAGS_ANY),
+            category_id=call.data.get(ATTR_CATEGORY_ID),
+        )
+        return {"notes": [note.to_dict() for note in notes]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_NOTES,
+        async_query_notes,
+        schema=QUERY_NOTES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def async_find_note(call: ServiceCall) -> ServiceResponse:
+        """Return notes and categories whose titles resemble the query."""
+        store = _get_store(hass, call)
+        query = call.data[ATTR_QUERY]
+        limit = call.data[ATTR_LIMIT]
+        notes = store.find_notes(
+            query, category_id=call.data.get(ATTR_CATEGORY_ID), limit=limit
+        )
+        categories = store.find_categories(query, limit=limit)
+        return {
+            "notes": [{**note.to_dict(), "score": score} for note, score in notes],
+            "categories": [
+                {**category.to_dict(), "score": score}
+                for category, score in categories
+            ],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_NOTE,
+        async_find_note,
+        schema=FIND_NOTE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def async_get_note(call: ServiceCall) -> ServiceResponse:
+        """Return one note, by id or by category and title."""
+        store = _get_store(hass, call)
+        if (note_id := call.data.get(ATTR_NOTE_ID)) is not None:
+            note = store.get_note(note_id)
+        else:
+            category = _get_category(store, call)
+            note = store.get_note_by_title(category.id, call.data[ATTR_TITLE])
+        if note is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="note_not_found"
+            )
+        return note.to_dict()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_NOTE,
+        async_get_note,
+        schema=GET_NOTE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def async_list_notes(call: ServiceCall) -> ServiceResponse:
+        """Return a category's notes, pinned first then most recently updated."""
+        store = _get_store(hass, call)
+        category = _get_category(store, call)
+        return {
+            "notes": [
+                note.to_dict() for note in store.iter_notes_by_category(category.id)
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LIST_NOTES,
+        async_list_notes,
+        schema=LIST_NOTES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_run_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the integration for a while and write the results."""
+        try:
+            return await async_profile(
+                hass, call.data[ATTR_DURATION], call.data[ATTR_TOP]
+            )
+        except (RuntimeError, ValueError) as err:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="profile_unavailable",
+                translation_placeholders={"error": str(err)},
+            ) from err
+
+    # Profiling slows the whole instance and writes files to the config dir
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_run_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_add_checklist_item(call: ServiceCall) -> ServiceResponse:
+        """Add an item to a checklist note."""
+        try:
+            item = await _get_store(hass, call).async_add_checklist_item(
+                call.data[ATTR_NOTE_ID], call.data[ATTR_TEXT], call.data.get(ATTR_INDEX)
+            )
+        except ValueError as err:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="checklist_error",
+                translation_placeholders={"error": str(err)},
+            ) from err
+        if item is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="note_not_found"
+            )
+        return item.to_dict()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ADD_CHECKLIST_ITEM,
+        async_add_checklist_item,
+        schema=ADD_CHECKLIST_ITEM_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_update_checklist_item(call: ServiceCall) -> None:
+        """Check, uncheck, rename or move a checklist item."""
+        item = await _get_store(hass, call).async_update_checklist_item(
+            call.data[ATTR_NOTE_ID],
+            call.data[ATTR_ITEM_ID],
+            text=call.data.get(ATTR_TEXT),
+            checked=call.data.get(ATTR_CHECKED),
+            index=call.data.get(ATTR_INDEX),
+        )
+        if item is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="item_not_found"
+            )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPDATE_CHECKLIST_ITEM,
+        async_update_checklist_item,
+        schema=UPDATE_CHECKLIST_ITEM_SCHEMA,
+    )
+
+    async def async_remove_checklist_item(call: ServiceCall) -> None:
+        """Remove a checklist item."""
+        if not await _get_store(hass, call).async_remove_checklist_item(
+            call.data[ATTR_NOTE_ID], call.data[ATTR_ITEM_ID]
+        ):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="item_not_found"
+            )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REMOVE_CHECKLIST_ITEM,
+        async_remove_checklist_item,
+        schema=REMOVE_CHECKLIST_ITEM_SCHEMA,
+    )
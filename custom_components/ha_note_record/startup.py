@@ -0,0 +1,11 @@
+"""Startup timing for Ha Note Record.
+
+The package imports this module before any of its others, so
+IMPORT_STARTED marks the start of the integration's own import work.
+"""
+
+from __future__ import annotations
+
+import time
+
+IMPORT_STARTED = time.perf_counter()
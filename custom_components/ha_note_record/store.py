@@ -2,28 +2,87 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
+import asyncio
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
 import logging
+from pathlib import Path
+import time
 from typing import Any
 import uuid
 
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.storage import Store
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 
-from .const import STORAGE_KEY, STORAGE_VERSION
+from .const import (
+    ATTR_CATEGORY_ID,
+    ATTR_DELETED,
+    ATTR_NOTE_ID,
+    ATTR_NOTE_IDS,
+    ATTR_TITLE,
+    CHANGE_LOG_SIZE,
+    DOMAIN,
+    EVENT_NOTE_CHANGED,
+    MAX_CHECKLIST_ITEMS,
+    STORAGE_KEY,
+    STORAGE_MINOR_VERSION,
+    STORAGE_VERSION,
+)
+from .aggregates import NoteAggregates
+from .archive import NoteArchive
+from .bodies import BodyPool
+from .changes import Change, ChangeKind, ChangeLog
+from .checklist import ChecklistItem, ItemChange, item_index, put_item
+from .expiry import NoteExpiryScheduler
+from .journal import (
+    OP_DELETE_CATEGORY,
+    OP_DELETE_CHECKLIST_ITEM,
+    OP_DELETE_NOTES,
+    OP_PUT_CATEGORY,
+    OP_PUT_CHECKLIST_ITEM,
+    OP_PUT_NOTE,
+    OP_PUT_NOTES,
+    IntentJournal,
+    apply_intents,
+)
+from .migration import (
+    LoadReport,
+    async_build_records,
+    async_migrate,
+    repair_category,
+    repair_note,
+)
+from .patches import Splice, apply_splices
+from .render import MarkdownRenderCache
+from .search import TrigramIndex
+from .util import timestamp_to_int, utcnow_iso
 
 _LOGGER = logging.getLogger(__name__)
 
+type NoteSortKey = tuple[bool, int, str]
 
-@dataclass
+
+class DuplicateNameError(HomeAssistantError):
+    """Error raised when a category name or note title is already taken."""
+
+
+class PatchConflictError(HomeAssistantError):
+    """Error raised when a note changed after the revision a patch is for."""
+
+
+@dataclass(frozen=True)
 class Category:
     """Represent a note category."""
 
     id: str
     name: str
     created_at: str
+    default_ttl: int | None = None  # seconds
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Category:
@@ -32,6 +91,7 @@ class Category:
             id=data["id"],
             name=data["name"],
             created_at=data["created_at"],
+            default_ttl=data.get("default_ttl"),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -40,12 +100,17 @@ class Category:
             "id": self.id,
             "name": self.name,
             "created_at": self.created_at,
+            "default_ttl": self.default_ttl,
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class Note:
-    """Represent a note."""
+    """Represent a note.
+
+    Notes are immutable: the store replaces a note with an updated copy,
+    so a note handed to a reader never changes underneath it.
+    """
 
     id: str
     category_id: str
@@ -54,6 +119,12 @@ class Note:
     pinned: bool
     created_at: str
     updated_at: str
+    expires_at: str | None = None
+    tags: tuple[str, ...] = ()
+    # Items of a checklist note; None for a plain note
+    checklist: tuple[ChecklistItem, ...] | None = None
+    # Address of content in the store's body pool; not serialized
+    content_hash: str = field(default="", repr=False, compare=False)
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Note:
@@ -66,6 +137,13 @@ class Note:
             pinned=data["pinned"],
             created_at=data["created_at"],
             updated_at=data["updated_at"],
+            expires_at=data.get("expires_at"),
+            tags=tuple(data.get("tags", ())),
+            checklist=(
+                tuple(ChecklistItem.from_dict(item) for item in checklist)
+                if (checklist := data.get("checklist")) is not None
+                else None
+            ),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -78,45 +156,305 @@ class Note:
             "pinned": self.pinned,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
+            "expires_at": self.expires_at,
+            "tags": list(self.tags),
+            "checklist": (
+                [item.to_dict() for item in self.checklist]
+                if self.checklist is not None
+                else None
+            ),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class StoreSnapshot:
+    """Consistent, immutable view of a store at one revision."""
+
+    revision: int
+    categories: tuple[Category, ...]
+    notes: tuple[Note, ...]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot as plain data.
+
+        Safe to call from the executor; nothing in a snapshot is mutated.
+        """
+        return {
+            "categories": [c.to_dict() for c in self.categories],
+            "notes": [n.to_dict() for n in self.notes],
         }
 
 
-@dataclass
-class StoreData:
-    """Store data structure."""
+class HaNoteRecordStorage(Store[dict[str, Any]]):
+    """Storage helper that migrates older data formats."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the storage helper."""
+        super().__init__(*args, **kwargs)
+        self.load_report = LoadReport()
 
-    categories: list[Category] = field(default_factory=list)
-    notes: list[Note] = field(default_factory=list)
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Migrate stored data to the current version."""
+        self.load_report.migrations = await async_migrate(
+            old_data, (old_major_version, old_minor_version)
+        )
+        return old_data
+
+
+def journal_path(hass: HomeAssistant, storage_key: str) -> Path:
+    """Return the intent journal file of a storage key."""
+    return Path(hass.config.path(STORAGE_DIR, f"{storage_key}.journal"))
 
 
 class HaNoteRecordStore:
     """Manage storage for Ha Note Record."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
-        """Initialize the store."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        storage_key: str = STORAGE_KEY,
+        *,
+        dedupe_storage: bool = False,
+        durable: bool = False,
+    ) -> None:
+        """Initialize the store.
+
+        With dedupe_storage, identical bodies are written to the storage
+        file once and notes refer to them by hash. With durable, mutations
+        return only after their intent is fsynced to a journal, which is
+        replayed on load if the snapshot save did not happen.
+        """
         self._hass = hass
-        self._store: Store[dict[str, Any]] = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY
+        self._dedupe_storage = dedupe_storage
+        self._durable = durable
+        self._store = HaNoteRecordStorage(
+            hass, STORAGE_VERSION, storage_key, minor_version=STORAGE_MINOR_VERSION
         )
-        self._data = StoreData()
+        self.journal = IntentJournal(hass, journal_path(hass, storage_key))
         self._listeners: list[Callable[[], None]] = []
+        # Entities follow only their own note; notified with the next save
+        self._note_listeners: dict[str, list[Callable[[], None]]] = {}
+        self._dirty_note_ids: set[str] = set()
+        # Primary collections, in creation order. Updates replace values.
         self._notes_by_id: dict[str, Note] = {}
         self._categories_by_id: dict[str, Category] = {}
+        # Bumped by every mutation; snapshots are built lazily per revision
+        self.revision = 0
+        self._epoch = ""
+        self.changes = ChangeLog(CHANGE_LOG_SIZE)
+        # Revision of each note's last change since load
+        self._note_revisions: dict[str, int] = {}
+        self._snapshot = StoreSnapshot(0, (), ())
+        # Case-insensitive uniqueness indexes
+        self._category_ids_by_name: dict[str, str] = {}
+        self._note_ids_by_title: dict[tuple[str, str], str] = {}
+        # Serializes validation and application of mutations
+        self._lock = asyncio.Lock()
+        self._save_waiters: list[asyncio.Future[None]] = []
+        self._save_task: asyncio.Task[None] | None = None
+        self.save_count = 0
+        # Per-category note order: pinned first, then most recently updated
+        self._category_order: dict[str, list[NoteSortKey]] = {}
+        self._note_sort_keys: dict[str, NoteSortKey] = {}
+        # Inverted index: tag -> ids of notes carrying it
+        self._notes_by_tag: dict[str, set[str]] = {}
+        # Fuzzy title lookup
+        self._note_titles = TrigramIndex()
+        self._category_names = TrigramIndex()
+        self.bodies = BodyPool()
+        self.aggregates = NoteAggregates()
+        self.render_cache = MarkdownRenderCache()
+        self.expiry = NoteExpiryScheduler(hass, self)
+        self.archive = NoteArchive(hass, storage_key)
 
     @property
-    def categories(self) -> list[Category]:
+    def load_report(self) -> LoadReport:
+        """Return migration and repair results of the last load."""
+        return self._store.load_report
+
+    @property
+    def categories(self) -> tuple[Category, ...]:
         """Return all categories."""
-        return self._data.categories
+        return self.snapshot().categories
 
     @property
-    def notes(self) -> list[Note]:
+    def notes(self) -> tuple[Note, ...]:
         """Return all notes."""
-        return self._data.notes
+        return self.snapshot().notes
+
+    @property
+    def cursor(self) -> str:
+        """Return a cursor for the current revision."""
+        return f"{self._epoch}:{self.revision}"
+
+    @callback
+    def note_version(self, note_id: str) -> str:
+        """Return a token that changes whenever the note changes."""
+        return f"{self._epoch}:{self._note_revisions.get(note_id, 0)}"
+
+    @callback
+    def changes_since(self, cursor: str) -> list[Change] | None:
+        """Return what changed after cursor, or None if a resync is needed.
+
+        Cursors from before the last load, and ones that have fallen out
+        of the bounded change log, cannot be resumed.
+        """
+        if (revision := self._cursor_revision(cursor)) is None:
+            return None
+        return self.changes.since(revision)
+
+    @callback
+    def _cursor_revision(self, cursor: str) -> int | None:
+        """Return the revision of a cursor, or None if it is not current."""
+        epoch, _, revision = cursor.partition(":")
+        if epoch != self._epoch or not revision.isdigit():
+            return None
+        if int(revision) > self.revision:
+            return None
+        return int(revision)
+
+    @callback
+    def snapshot(self) -> StoreSnapshot:
+        """Return an immutable view of the current revision.
+
+        Built on first use after a mutation and shared by every reader
+        until the next one.
+        """
+        if self._snapshot.revision != self.revision:
+            self._snapshot = StoreSnapshot(
+                self.revision,
+                tuple(self._categories_by_id.values()),
+                tuple(self._notes_by_id.values()),
+            )
+        return self._snapshot
 
     def _rebuild_indexes(self) -> None:
-        """Rebuild dictionary indexes from lists."""
-        self._notes_by_id = {note.id: note for note in self._data.notes}
-        self._categories_by_id = {cat.id: cat for cat in self._data.categories}
+        """Rebuild secondary indexes from the primary collections."""
+        notes = self._notes_by_id.values()
+        categories = self._categories_by_id.values()
+        self._category_ids_by_name = {cat.name.lower(): cat.id for cat in categories}
+        self._note_ids_by_title = {
+            (note.category_id, note.title.lower()): note.id for note in notes
+        }
+        self._note_sort_keys = {note.id: self._sort_key(note) for note in notes}
+        self._category_order = {}
+        for note in notes:
+            self._category_order.setdefault(note.category_id, []).append(
+                self._note_sort_keys[note.id]
+            )
+        for order in self._category_order.values():
+            order.sort()
+        self._notes_by_tag = {}
+        self._note_titles.clear()
+        for note in notes:
+            self._index_tags(note)
+            self._note_titles.add(note.id, note.title)
+        self.aggregates.rebuild(notes)
+        self._category_names.clear()
+        for category in categories:
+            self._category_names.add(category.id, category.name)
+
+    @staticmethod
+    def _sort_key(note: Note) -> NoteSortKey:
+        """Return the ordering key of a note within its category."""
+        return (not note.pinned, -timestamp_to_int(note.updated_at), note.id)
+
+    def _index_note(self, note: Note) -> None:
+        """Insert a note into its category order and statistics."""
+        key = self._sort_key(note)
+        self._note_sort_keys[note.id] = key
+        insort(self._category_order.setdefault(note.category_id, []), key)
+        self.aggregates.add(note)
+
+    def _unindex_note(self, note: Note) -> None:
+        """Remove a note from its category order and statistics."""
+        key = self._note_sort_keys.pop(note.id, None)
+        if key is None:
+            return
+        self.aggregates.remove(note)
+        order = self._category_order.get(note.category_id, [])
+        index = bisect_left(order, key)
+        if index < len(order) and order[index] == key:
+            del order[index]
+
+    def _index_tags(self, note: Note) -> None:
+        """Add a note to the tag index."""
+        for tag in note.tags:
+            self._notes_by_tag.setdefault(tag, set()).add(note.id)
+
+    def _unindex_tags(self, note: Note) -> None:
+        """Remove a note from the tag index."""
+        for tag in note.tags:
+            if (note_ids := self._notes_by_tag.get(tag)) is not None:
+                note_ids.discard(note.id)
+                if not note_ids:
+                    del self._notes_by_tag[tag]
+
+    def get_tags(self) -> dict[str, int]:
+        """Return every tag in use with its note count."""
+        return {tag: len(ids) for tag, ids in sorted(self._notes_by_tag.items())}
+
+    def query_notes(
+        self,
+        *,
+        tags_all: list[str] | None = None,
+        tags_any: list[str] | None = None,
+        category_id: str | None = None,
+    ) -> list[Note]:
+        """Return notes matching every tag in tags_all and any in tags_any.
+
+        Results come from intersecting the tag index, smallest set first,
+        and are ordered pinned first, then most recently updated.
+        """
+        matched: set[str] | None = None
+        if tags_all:
+            sets = sorted(
+                (self._notes_by_tag.get(tag, set()) for tag in tags_all), key=len
+            )
+            matched = set(sets[0])
+            for note_ids in sets[1:]:
+                if not matched:
+                    break
+                matched &= note_ids
+        if tags_any:
+            any_ids: set[str] = set()
+            for tag in tags_any:
+                any_ids |= self._notes_by_tag.get(tag, set())
+            matched = any_ids if matched is None else matched & any_ids
+        if matched is None:
+            matched = set(self._notes_by_id)
+
+        notes = [self._notes_by_id[note_id] for note_id in matched]
+        if category_id is not None:
+            notes = [note for note in notes if note.category_id == category_id]
+        notes.sort(key=lambda note: self._note_sort_keys[note.id])
+        return notes
+
+    def find_notes(
+        self, query: str, *, category_id: str | None = None, limit: int = 5
+    ) -> list[tuple[Note, float]]:
+        """Return notes whose titles best match query, tolerating typos."""
+        matches = self._note_titles.search(
+            query, limit if category_id is None else len(self._note_titles)
+        )
+        results = [(self._notes_by_id[note_id], score) for note_id, score in matches]
+        if category_id is not None:
+            results = [r for r in results if r[0].category_id == category_id][:limit]
+        return results
+
+    def find_categories(
+        self, query: str, *, limit: int = 5
+    ) -> list[tuple[Category, float]]:
+        """Return categories whose names best match query, tolerating typos."""
+        return [
+            (self._categories_by_id[category_id], score)
+            for category_id, score in self._category_names.search(query, limit)
+        ]
 
     def get_category(self, category_id: str) -> Category | None:
         """Get a category by ID."""
@@ -126,33 +464,242 @@ class HaNoteRecordStore:
         """Get a note by ID."""
         return self._notes_by_id.get(note_id)
 
+    def get_category_by_name(self, name: str) -> Category | None:
+        """Get a category by name, ignoring case."""
+        category_id = self._category_ids_by_name.get(name.lower())
+        return None if category_id is None else self._categories_by_id[category_id]
+
+    def get_note_by_title(self, category_id: str, title: str) -> Note | None:
+        """Get a note by its category and title, ignoring case."""
+        note_id = self._note_ids_by_title.get((category_id, title.lower()))
+        return None if note_id is None else self._notes_by_id[note_id]
+
     def get_notes_by_category(self, category_id: str) -> list[Note]:
-        """Get all notes in a category."""
-        return [note for note in self._data.notes if note.category_id == category_id]
+        """Get all notes in a category, pinned first then newest first."""
+        return list(self.iter_notes_by_category(category_id))
+
+    def count_notes_in_category(self, category_id: str) -> int:
+        """Return the number of notes in a category."""
+        return len(self._category_order.get(category_id, ()))
+
+    def iter_notes_by_category(
+        self, category_id: str, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Note]:
+        """Iterate a category's notes in display order, optionally paged."""
+        order = self._category_order.get(category_id, [])
+        stop = len(order) if limit is None else offset + limit
+        for _, _, note_id in order[offset:stop]:
+            yield self._notes_by_id[note_id]
 
     async def async_load(self) -> None:
         """Load data from storage."""
+        start = time.perf_counter()
         data = await self._store.async_load()
+        snapshot_seq = 0
         if data is not None:
-            self._data = StoreData(
-                categories=[Category.from_dict(c) for c in data.get("categories", [])],
-                notes=[Note.from_dict(n) for n in data.get("notes", [])],
+            snapshot_seq = data.pop("journal_seq", 0)
+            if bodies := data.pop("bodies", None):
+                # Deduplicated format: resolve body references in place
+                for raw in data.get("notes") or []:
+                    if isinstance(raw, dict) and "content" not in raw:
+                        body_hash = raw.pop("content_hash", None)
+                        raw["content"] = bodies.get(body_hash, "")
+                del bodies
+
+        # Redo acknowledged mutations the last snapshot missed. A journal
+        # left behind with durability since disabled is still honoured.
+        if intents := await self.journal.async_read(snapshot_seq):
+            if data is None:
+                data = {}
+            apply_intents(data, intents)
+            _LOGGER.warning(
+                "Recovered %d journaled changes missing from storage", len(intents)
+            )
+
+        categories: list[Category] = []
+        notes: list[Note] = []
+        if data is not None:
+            report = self._store.load_report
+            categories = await async_build_records(
+                data.pop("categories", None) or [],
+                repair_category,
+                Category.from_dict,
+                report,
+            )
+            notes = await async_build_records(
+                data.pop("notes", None) or [],
+                repair_note,
+                Note.from_dict,
+                report,
             )
+            if report.repaired or report.dropped:
+                _LOGGER.warning(
+                    "Repaired %d and dropped %d malformed stored records",
+                    report.repaired,
+                    report.dropped,
+                )
+        self.bodies.clear()
+        self._categories_by_id = {cat.id: cat for cat in categories}
+        self._notes_by_id = {}
+        for note in notes:
+            body_hash, content = self.bodies.acquire(note.content)
+            self._notes_by_id[note.id] = replace(
+                note, content=content, content_hash=body_hash
+            )
+        del categories, notes
         self._rebuild_indexes()
+        self.revision += 1
+        # Cursors handed out before this load cannot be resumed
+        self._epoch = uuid.uuid4().hex[:12]
+        self.changes.reset(self.revision)
+        self._note_revisions = {}
+        self.expiry.async_rebuild(self._notes_by_id.values())
+        await self.archive.async_load(set(self._notes_by_id))
+        self._store.load_report.duration = time.perf_counter() - start
         _LOGGER.debug(
-            "Loaded %d categories and %d notes",
-            len(self._data.categories),
-            len(self._data.notes),
+            "Loaded %d categories and %d notes in %.3fs",
+            len(self._categories_by_id),
+            len(self._notes_by_id),
+            self._store.load_report.duration,
         )
+        if intents:
+            await self.async_save()
+            await self.journal.async_checkpoint(self.journal.seq, force=True)
 
     async def async_save(self) -> None:
-        """Save data to storage."""
-        data = {
-            "categories": [c.to_dict() for c in self._data.categories],
-            "notes": [n.to_dict() for n in self._data.notes],
-        }
+        """Save data to storage.
+
+        Callers that arrive while a write is in flight share the next
+        write, so a burst of mutations costs one or two saves.
+        """
+        await self._async_request_save()
+
+    @callback
+    def _async_request_save(self) -> asyncio.Future[None]:
+        """Queue a snapshot write; the future resolves once it is saved."""
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        self._save_waiters.append(future)
+        if self._save_task is None:
+            self._save_task = self._hass.async_create_background_task(
+                self._async_save_pending(), "ha_note_record save"
+            )
+        return future
+
+    async def async_flush(self) -> None:
+        """Wait for a snapshot write in flight, e.g. before unloading."""
+        if (task := self._save_task) is not None:
+            await task
+
+    async def _async_save_pending(self) -> None:
+        """Write snapshots until no caller is waiting for one."""
+        try:
+            while self._save_waiters:
+                waiters, self._save_waiters = self._save_waiters, []
+                try:
+                    await self._async_write_snapshot()
+                except Exception as err:  # noqa: BLE001
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(err)
+                    continue
+                self.save_count += 1
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+                self._notify_listeners()
+        finally:
+            self._save_task = None
+
+    async def _async_write_snapshot(self) -> None:
+        """Serialize the current state and write it."""
+        seq = self.journal.seq
+        data = await self._hass.async_add_executor_job(
+            self._serialize, self.snapshot()
+        )
+        # Written without durability too, so a journal left from when it
+        # was on is never replayed over a newer snapshot
+        data["journal_seq"] = seq
         await self._store.async_save(data)
-        self._notify_listeners()
+        if self._durable:
+            await self.journal.async_checkpoint(seq)
+        elif self.journal.has_records:
+            await self.journal.async_remove()
+
+    def _serialize(self, snapshot: StoreSnapshot) -> dict[str, Any]:
+        """Build the stored document from a snapshot (executor)."""
+        data = snapshot.as_dict()
+        if self._dedupe_storage:
+            bodies: dict[str, str] = {}
+            for note, note_dict in zip(snapshot.notes, data["notes"], strict=True):
+                del note_dict["content"]
+                note_dict["content_hash"] = note.content_hash
+                bodies.setdefault(note.content_hash, note.content)
+            data["bodies"] = bodies
+        return data
+
+    @callback
+    def _advance(
+        self,
+        *changes: tuple[ChangeKind, str, Category | Note | None],
+        patch: tuple[Splice, ...] | None = None,
+        item: ItemChange | None = None,
+    ) -> dict[str, Any] | None:
+        """Start a new revision made of changes; call under the lock.
+
+        patch or item is given when the only change is a note content
+        patch or a checklist item change. Returns the note changed event
+        data to pass to _async_commit, or None if no note changed.
+        """
+        self.revision += 1
+        notes: list[tuple[str, Note | None]] = []
+        for kind, item_id, record in changes:
+            self.changes.append(self.revision, kind, item_id, record, patch, item)
+            if kind == "category":
+                if record is not None and self._note_listeners:
+                    # A renamed category changes the device of its notes
+                    self._dirty_note_ids.update(
+                        note.id for note in self.iter_notes_by_category(item_id)
+                    )
+                continue
+            self._dirty_note_ids.add(item_id)
+            if record is None:
+                self._note_revisions.pop(item_id, None)
+            else:
+                self._note_revisions[item_id] = self.revision
+            notes.append((item_id, record))  # type: ignore[arg-type]
+        return _note_changed_data(notes)
+
+    @callback
+    def _log(self, op: str, **payload: Any) -> asyncio.Future[None] | None:
+        """Journal a mutation; must be called while holding the lock."""
+        if not self._durable:
+            return None
+        return self.journal.async_append({"op": op, **payload})
+
+    async def _async_commit(
+        self,
+        logged: asyncio.Future[None] | None,
+        changed: dict[str, Any] | None = None,
+    ) -> None:
+        """Wait until a mutation is durable, then announce changed notes.
+
+        A journaled mutation is durable once its record is fsynced, and the
+        snapshot holding it is written in the background. Otherwise it is
+        durable once the snapshot is saved.
+        """
+        if logged is None:
+            await self.async_save()
+        else:
+            await logged
+            self._async_request_save().add_done_callback(_log_save_error)
+        if changed is not None:
+            self._hass.bus.async_fire(EVENT_NOTE_CHANGED, changed)
+
+    async def async_render_html(self, notes: Iterable[Note]) -> list[str]:
+        """Return sanitized HTML for the given notes, using the render cache."""
+        return await self.render_cache.async_render_many(
+            self._hass, (note.content for note in notes)
+        )
 
     def _generate_id(self) -> str:
         """Generate a unique ID using full UUID for collision resistance."""
@@ -160,72 +707,258 @@ class HaNoteRecordStore:
 
     def _get_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
-        return datetime.now(timezone.utc).isoformat()
-
-    async def async_create_category(self, name: str) -> Category:
-        """Create a new category."""
-        category = Category(
-            id=self._generate_id(),
-            name=name,
-            created_at=self._get_timestamp(),
-        )
-        self._data.categories.append(category)
-        self._categories_by_id[category.id] = category
-        await self.async_save()
+        return utcnow_iso()
+
+    @callback
+    def _check_category_name(self, name: str, category_id: str | None = None) -> None:
+        """Raise if a category name is used by another category."""
+        existing = self._category_ids_by_name.get(name.lower())
+        if existing is not None and existing != category_id:
+            raise DuplicateNameError(f"Category already exists: {name}")
+
+    @callback
+    def _check_note_title(
+        self, category_id: str, title: str, note_id: str | None = None
+    ) -> None:
+        """Raise if a title is used by another note in the category."""
+        existing = self._note_ids_by_title.get((category_id, title.lower()))
+        if existing is not None and existing != note_id:
+            raise DuplicateNameError(
+                f"Note title already exists in this category: {title}"
+            )
+
+    async def async_create_category(
+        self, name: str, default_ttl: int | None = None
+    ) -> Category:
+        """Create a new category.
+
+        Raises DuplicateNameError if the name (case-insensitive) is taken.
+        """
+        async with self._lock:
+            self._check_category_name(name)
+            category = Category(
+                id=self._generate_id(),
+                name=name,
+                created_at=self._get_timestamp(),
+                default_ttl=default_ttl,
+            )
+            self._categories_by_id[category.id] = category
+            self._category_ids_by_name[name.lower()] = category.id
+            self._category_names.add(category.id, name)
+            self._advance(("category", category.id, category))
+            logged = self._log(OP_PUT_CATEGORY, category=category.to_dict())
+        await self._async_commit(logged)
         _LOGGER.debug("Created category: %s", category.name)
         return category
 
+    async def async_rename_category(
+        self, category_id: str, name: str
+    ) -> Category | None:
+        """Rename a category.
+
+        Returns None if it does not exist. Raises DuplicateNameError if the
+        name (case-insensitive) is taken by another category.
+        """
+        async with self._lock:
+            if not (category := self.get_category(category_id)):
+                _LOGGER.warning("Category not found for rename: %s", category_id)
+                return None
+            self._check_category_name(name, category_id)
+            renamed = replace(category, name=name)
+            self._categories_by_id[category_id] = renamed
+            del self._category_ids_by_name[category.name.lower()]
+            self._category_ids_by_name[name.lower()] = category_id
+            self._category_names.add(category_id, name)
+            self._advance(("category", category_id, renamed))
+            logged = self._log(OP_PUT_CATEGORY, category=renamed.to_dict())
+        await self._async_commit(logged)
+        _LOGGER.debug("Renamed category %s to %s", category.name, name)
+        return renamed
+
     async def async_delete_category(self, category_id: str) -> bool:
         """Delete a category.
 
-        The caller (websocket handler) is responsible for cascade-deleting
-        notes before calling this method.
+        The caller is responsible for removing its notes first, or should
+        use async_delete_category_cascade.
         """
-        notes = self.get_notes_by_category(category_id)
-        if notes:
-            _LOGGER.warning(
-                "Category %s still has %d notes at deletion time; "
-                "caller should have cascade-deleted them first",
-                category_id,
-                len(notes),
-            )
-
-        self._data.categories = [
-            c for c in self._data.categories if c.id != category_id
-        ]
-        self._categories_by_id.pop(category_id, None)
-        await self.async_save()
+        async with self._lock:
+            if note_count := self.count_notes_in_category(category_id):
+                _LOGGER.warning(
+                    "Category %s still has %d notes at deletion time; "
+                    "caller should have cascade-deleted them first",
+                    category_id,
+                    note_count,
+                )
+            self._remove_category(category_id)
+            self._advance(("category", category_id, None))
+            logged = self._log(OP_DELETE_CATEGORY, category_id=category_id)
+        await self._async_commit(logged)
         _LOGGER.debug("Deleted category: %s", category_id)
         return True
 
+    async def async_delete_category_cascade(self, category_id: str) -> list[Note]:
+        """Delete a category and all of its notes as one operation.
+
+        Returns the removed notes.
+        """
+        async with self._lock:
+            removed = self._remove_notes(
+                [note.id for note in self.iter_notes_by_category(category_id)]
+            )
+            self._remove_category(category_id)
+            changed = self._advance(
+                *(("note", note.id, None) for note in removed),
+                ("category", category_id, None),
+            )
+            logged = self._log(
+                OP_DELETE_CATEGORY,
+                category_id=category_id,
+                note_ids=[note.id for note in removed],
+            )
+        await self._async_commit(logged, changed)
+        _LOGGER.debug(
+            "Deleted category %s with %d notes", category_id, len(removed)
+        )
+        return removed
+
+    def _remove_category(self, category_id: str) -> None:
+        """Remove a category from memory."""
+        if (category := self._categories_by_id.pop(category_id, None)) is None:
+            return
+        self._category_ids_by_name.pop(category.name.lower(), None)
+        self._category_order.pop(category_id, None)
+        self.aggregates.discard_category(category_id)
+        self._category_names.remove(category_id)
+
     async def async_create_note(
         self,
         category_id: str,
         title: str,
         content: str = "",
         pinned: bool = False,
+        expires_at: str | None = None,
+        tags: list[str] | None = None,
+        checklist: list[str] | None = None,
     ) -> Note | None:
-        """Create a new note."""
-        if not self.get_category(category_id):
-            _LOGGER.warning("Category not found: %s", category_id)
-            return None
+        """Create a new note.
 
-        timestamp = self._get_timestamp()
-        note = Note(
-            id=self._generate_id(),
-            category_id=category_id,
-            title=title,
-            content=content,
-            pinned=pinned,
-            created_at=timestamp,
-            updated_at=timestamp,
-        )
-        self._data.notes.append(note)
-        self._notes_by_id[note.id] = note
-        await self.async_save()
+        Without an explicit expires_at, the category's default TTL applies.
+        Passing checklist, even empty, makes a checklist note with those
+        items unchecked. Raises DuplicateNameError if the title is taken in
+        the category.
+        """
+        async with self._lock:
+            if not (category := self.get_category(category_id)):
+                _LOGGER.warning("Category not found: %s", category_id)
+                return None
+            self._check_note_title(category_id, title)
+
+            timestamp = self._get_timestamp()
+            if expires_at is None and category.default_ttl:
+                expires_at = (
+                    datetime.fromisoformat(timestamp)
+                    + timedelta(seconds=category.default_ttl)
+                ).isoformat()
+            note = Note(
+                id=self._generate_id(),
+                category_id=category_id,
+                title=title,
+                content=content,
+                pinned=pinned,
+                created_at=timestamp,
+                updated_at=timestamp,
+                expires_at=expires_at,
+                tags=tuple(tags or ()),
+                checklist=(
+                    tuple(
+                        ChecklistItem(self._generate_id(), text) for text in checklist
+                    )
+                    if checklist is not None
+                    else None
+                ),
+            )
+            note = self._insert_note(note)
+            changed = self._advance(("note", note.id, note))
+            logged = self._log(OP_PUT_NOTE, note=note.to_dict())
+        await self._async_commit(logged, changed)
         _LOGGER.debug("Created note: %s in category %s", note.title, category_id)
         return note
 
+    @callback
+    def _insert_note(self, note: Note) -> Note:
+        """Add a new note to memory and every index; call under the lock."""
+        body_hash, content = self.bodies.acquire(note.content)
+        note = replace(note, content=content, content_hash=body_hash)
+        self._notes_by_id[note.id] = note
+        self._note_ids_by_title[(note.category_id, note.title.lower())] = note.id
+        self._note_titles.add(note.id, note.title)
+        self._index_note(note)
+        self._index_tags(note)
+        self.expiry.async_schedule(note)
+        return note
+
+    async def async_archive_notes(self, note_ids: list[str]) -> list[Note]:
+        """Move notes into a new archive segment with a single save.
+
+        The segment and archive index are written before the notes leave
+        the hot store, so an interruption leaves a note in both places
+        rather than in neither. Returns the notes that were archived.
+        """
+        async with self._lock:
+            notes = [
+                note
+                for note_id in dict.fromkeys(note_ids)
+                if (note := self.get_note(note_id)) is not None
+            ]
+            if not notes:
+                return []
+            await self.archive.async_add([note.to_dict() for note in notes])
+            removed = self._remove_notes([note.id for note in notes])
+            changed = self._advance(*(("note", note.id, None) for note in removed))
+            logged = self._log(
+                OP_DELETE_NOTES, note_ids=[note.id for note in removed]
+            )
+        await self._async_commit(logged, changed)
+        return removed
+
+    async def async_read_archived_note(self, note_id: str) -> Note | None:
+        """Return an archived note, body included, without restoring it."""
+        if (data := await self.archive.async_read(note_id)) is None:
+            return None
+        return Note.from_dict(data)
+
+    async def async_restore_note(
+        self, note_id: str, category_id: str | None = None
+    ) -> Note | None:
+        """Move an archived note back into the hot store.
+
+        The note returns to its category unless category_id is given, and
+        counts as updated now, so it is not archived again as stale.
+        Returns None if it is not archived, or was restored meanwhile.
+        Raises ValueError if the category no longer exists and
+        DuplicateNameError if the title is taken there.
+        """
+        async with self._lock:
+            if self.get_note(note_id) is not None:
+                return None
+            if (note := await self.async_read_archived_note(note_id)) is None:
+                return None
+            if category_id is not None:
+                note = replace(note, category_id=category_id)
+            if not self.get_category(note.category_id):
+                raise ValueError(f"Category not found: {note.category_id}")
+            self._check_note_title(note.category_id, note.title)
+            note = self._insert_note(replace(note, updated_at=self._get_timestamp()))
+            changed = self._advance(("note", note.id, note))
+            logged = self._log(OP_PUT_NOTE, note=note.to_dict())
+            # Held until the archive entry is gone, so the note cannot be
+            # archived again meanwhile and lose its new entry. Committed
+            # first: a crash in between leaves it in both places, not neither.
+            await self._async_commit(logged, changed)
+            await self.archive.async_discard([note_id])
+        _LOGGER.debug("Restored archived note: %s", note_id)
+        return note
+
     async def async_update_note(
         self,
         note_id: str,
@@ -233,25 +966,261 @@ class HaNoteRecordStore:
         title: str | None = None,
         content: str | None = None,
         pinned: bool | None = None,
+        expires_at: str | None | UndefinedType = UNDEFINED,
+        tags: list[str] | None = None,
     ) -> bool:
-        """Update note fields atomically. Only provided fields are updated."""
-        note = self.get_note(note_id)
-        if not note:
-            _LOGGER.warning("Note not found for update: %s", note_id)
-            return False
+        """Update note fields atomically. Only provided fields are updated.
 
-        if title is not None:
-            note.title = title
-        if content is not None:
-            note.content = content
-        if pinned is not None:
-            note.pinned = pinned
+        Pass expires_at=None to clear a note's expiry. Fields equal to the
+        note's are ignored, and an update that changes nothing leaves the
+        note, its updated_at and the revision as they are. Raises
+        DuplicateNameError if the new title is taken in the category.
+        """
+        async with self._lock:
+            note = self.get_note(note_id)
+            if not note:
+                _LOGGER.warning("Note not found for update: %s", note_id)
+                return False
+            if title is not None:
+                self._check_note_title(note.category_id, title, note_id)
 
-        note.updated_at = self._get_timestamp()
-        await self.async_save()
+            changes: dict[str, Any] = {}
+            if title is not None and title != note.title:
+                changes["title"] = title
+            if pinned is not None and pinned != note.pinned:
+                changes["pinned"] = pinned
+            if expires_at is not UNDEFINED and expires_at != note.expires_at:
+                changes["expires_at"] = expires_at
+            if tags is not None and tuple(tags) != note.tags:
+                changes["tags"] = tuple(tags)
+            if content is not None and content != note.content:
+                self._release_body(note)
+                changes["content_hash"], changes["content"] = self.bodies.acquire(
+                    content
+                )
+            elif not changes:
+                return True
+            updated = replace(note, **changes, updated_at=self._get_timestamp())
+
+            self._replace_note(note, updated)
+            if "title" in changes:
+                self._note_titles.add(note_id, title)
+            if "expires_at" in changes:
+                self.expiry.async_schedule(updated)
+            changed = self._advance(("note", note_id, updated))
+            logged = self._log(OP_PUT_NOTE, note=updated.to_dict())
+        await self._async_commit(logged, changed)
         _LOGGER.debug("Updated note: %s", note_id)
         return True
 
+    async def async_patch_note(
+        self, note_id: str, splices: list[Splice], cursor: str
+    ) -> str | None:
+        """Apply splices to a note's content as of cursor.
+
+        Returns a cursor for the patched content, to base the next patch
+        on, or None if the note does not exist. Raises PatchConflictError
+        if the note changed after cursor, and ValueError if a splice does
+        not fit the content.
+        """
+        async with self._lock:
+            note = self.get_note(note_id)
+            if not note:
+                _LOGGER.warning("Note not found for patch: %s", note_id)
+                return None
+            base = self._cursor_revision(cursor)
+            if base is None or self._note_revisions.get(note_id, 0) > base:
+                raise PatchConflictError(f"Note changed since {cursor}: {note_id}")
+            content = apply_splices(note.content, splices)
+
+            self._release_body(note)
+            body_hash, content = self.bodies.acquire(content)
+            updated = replace(
+                note,
+                content=content,
+                content_hash=body_hash,
+                updated_at=self._get_timestamp(),
+            )
+            self._replace_note(note, updated)
+            changed = self._advance(("note", note_id, updated), patch=tuple(splices))
+            patched = self.cursor
+            logged = self._log(OP_PUT_NOTE, note=updated.to_dict())
+        await self._async_commit(logged, changed)
+        _LOGGER.debug("Patched note: %s", note_id)
+        return patched
+
+    async def async_move_notes(
+        self, note_ids: list[str], category_id: str
+    ) -> list[Note] | None:
+        """Move notes to another category with a single save.
+
+        Returns the notes that moved, or None if the category does not
+        exist. Unknown ids and notes already in the category are skipped.
+        Raises DuplicateNameError, moving nothing, if a title would clash
+        in the target category.
+        """
+        async with self._lock:
+            if not self.get_category(category_id):
+                _LOGGER.warning("Category not found: %s", category_id)
+                return None
+            notes = [
+                note
+                for note_id in dict.fromkeys(note_ids)
+                if (note := self.get_note(note_id)) and note.category_id != category_id
+            ]
+            titles: set[str] = set()
+            for note in notes:
+                self._check_note_title(category_id, note.title)
+                if note.title.lower() in titles:
+                    raise DuplicateNameError(
+                        f"Note title already exists in this category: {note.title}"
+                    )
+                titles.add(note.title.lower())
+            if not notes:
+                return []
+
+            timestamp = self._get_timestamp()
+            moved = [
+                replace(note, category_id=category_id, updated_at=timestamp)
+                for note in notes
+            ]
+            for note, updated in zip(notes, moved, strict=True):
+                self._replace_note(note, updated)
+                self.aggregates.touch(note.category_id, timestamp_to_int(timestamp))
+            changed = self._advance(*(("note", note.id, note) for note in moved))
+            logged = self._log(OP_PUT_NOTES, notes=[note.to_dict() for note in moved])
+        await self._async_commit(logged, changed)
+        _LOGGER.debug("Moved %d notes to category %s", len(moved), category_id)
+        return moved
+
+    async def async_add_checklist_item(
+        self, note_id: str, text: str, index: int | None = None
+    ) -> ChecklistItem | None:
+        """Add an unchecked item to a checklist note, at the end by default.
+
+        Returns None if the note does not exist. Raises ValueError if it is
+        not a checklist or is full.
+        """
+        async with self._lock:
+            note = self.get_note(note_id)
+            if not note:
+                _LOGGER.warning("Note not found for checklist: %s", note_id)
+                return None
+            if note.checklist is None:
+                raise ValueError(f"Note is not a checklist: {note_id}")
+            if len(note.checklist) >= MAX_CHECKLIST_ITEMS:
+                raise ValueError(
+                    f"Checklist exceeds maximum of {MAX_CHECKLIST_ITEMS} items"
+                )
+            item = ChecklistItem(self._generate_id(), text)
+            logged, changed = self._put_checklist_item(note, item, index)
+        await self._async_commit(logged, changed)
+        return item
+
+    async def async_update_checklist_item(
+        self,
+        note_id: str,
+        item_id: str,
+        *,
+        text: str | None = None,
+        checked: bool | None = None,
+        index: int | None = None,
+    ) -> ChecklistItem | None:
+        """Change an item's text or checked state, or move it to index.
+
+        Returns None if the note or item does not exist. With nothing to
+        change, returns the item without a revision or save.
+        """
+        async with self._lock:
+            note = self.get_note(note_id)
+            if not note or not note.checklist:
+                return None
+            if (current := item_index(note.checklist, item_id)) is None:
+                return None
+            item = note.checklist[current]
+            if text is None and checked is None and index is None:
+                return item
+            if text is not None:
+                item = replace(item, text=text)
+            if checked is not None:
+                item = replace(item, checked=checked)
+            logged, changed = self._put_checklist_item(note, item, index)
+        await self._async_commit(logged, changed)
+        return item
+
+    async def async_remove_checklist_item(self, note_id: str, item_id: str) -> bool:
+        """Remove an item from a checklist note."""
+        async with self._lock:
+            note = self.get_note(note_id)
+            if not note or not note.checklist:
+                return False
+            if (current := item_index(note.checklist, item_id)) is None:
+                return False
+            updated = replace(
+                note,
+                checklist=note.checklist[:current] + note.checklist[current + 1 :],
+                updated_at=self._get_timestamp(),
+            )
+            self._replace_note(note, updated)
+            changed = self._advance(
+                ("note", note_id, updated), item=ItemChange(item_id, None)
+            )
+            logged = self._log(
+                OP_DELETE_CHECKLIST_ITEM,
+                note_id=note_id,
+                item_id=item_id,
+                updated_at=updated.updated_at,
+            )
+        await self._async_commit(logged, changed)
+        return True
+
+    @callback
+    def _put_checklist_item(
+        self, note: Note, item: ChecklistItem, index: int | None
+    ) -> tuple[asyncio.Future[None] | None, dict[str, Any] | None]:
+        """Put one item into a checklist note; call under the lock.
+
+        Only the item is journaled and recorded in the change log, so the
+        cost of ticking a box does not grow with the note's content.
+        Returns what _async_commit takes.
+        """
+        assert note.checklist is not None
+        checklist, index = put_item(note.checklist, item, index)
+        updated = replace(note, checklist=checklist, updated_at=self._get_timestamp())
+        self._replace_note(note, updated)
+        changed = self._advance(
+            ("note", note.id, updated), item=ItemChange(item.id, item, index)
+        )
+        logged = self._log(
+            OP_PUT_CHECKLIST_ITEM,
+            note_id=note.id,
+            item_id=item.id,
+            item=item.to_dict(),
+            index=index,
+            updated_at=updated.updated_at,
+        )
+        return logged, changed
+
+    @callback
+    def _release_body(self, note: Note) -> None:
+        """Drop a note's body reference, and its HTML once no note uses it."""
+        self.bodies.release(note.content_hash)
+        if not self.bodies.refcount(note.content_hash):
+            self.render_cache.discard(note.content)
+
+    @callback
+    def _replace_note(self, note: Note, updated: Note) -> None:
+        """Swap in a new version of a note; readers holding the old keep it."""
+        self._unindex_note(note)
+        self._unindex_tags(note)
+        self._note_ids_by_title.pop((note.category_id, note.title.lower()))
+        self._notes_by_id[note.id] = updated
+        self._note_ids_by_title[(updated.category_id, updated.title.lower())] = (
+            note.id
+        )
+        self._index_note(updated)
+        self._index_tags(updated)
+
     async def async_update_note_content(self, note_id: str, content: str) -> bool:
         """Update note content."""
         return await self.async_update_note(note_id, content=content)
@@ -262,17 +1231,46 @@ class HaNoteRecordStore:
 
     async def async_delete_note(self, note_id: str) -> bool:
         """Delete a note."""
-        note = self.get_note(note_id)
-        if not note:
+        if not await self.async_delete_notes([note_id]):
             _LOGGER.warning("Note not found: %s", note_id)
             return False
-
-        self._data.notes = [n for n in self._data.notes if n.id != note_id]
-        self._notes_by_id.pop(note_id, None)
-        await self.async_save()
         _LOGGER.debug("Deleted note: %s", note_id)
         return True
 
+    async def async_delete_notes(self, note_ids: list[str]) -> list[Note]:
+        """Delete several notes with a single save.
+
+        Returns the notes that existed and were removed.
+        """
+        async with self._lock:
+            if not (removed := self._remove_notes(note_ids)):
+                return removed
+            changed = self._advance(*(("note", note.id, None) for note in removed))
+            logged = self._log(
+                OP_DELETE_NOTES, note_ids=[note.id for note in removed]
+            )
+        await self._async_commit(logged, changed)
+        return removed
+
+    def _remove_notes(self, note_ids: list[str]) -> list[Note]:
+        """Remove notes from memory and every index."""
+        removed: list[Note] = []
+        for note_id in note_ids:
+            if (note := self._notes_by_id.pop(note_id, None)) is None:
+                continue
+            self._note_ids_by_title.pop((note.category_id, note.title.lower()), None)
+            self._unindex_note(note)
+            self._unindex_tags(note)
+            self._note_titles.remove(note_id)
+            self.expiry.async_unschedule(note_id)
+            self._release_body(note)
+            removed.append(note)
+        if removed:
+            now = timestamp_to_int(self._get_timestamp())
+            for category_id in {note.category_id for note in removed}:
+                self.aggregates.touch(category_id, now)
+        return removed
+
     @callback
     def async_add_listener(
         self, update_callback: Callable[[], None]
@@ -288,7 +1286,83 @@ class HaNoteRecordStore:
 
         return remove_listener
 
+    @callback
+    def async_add_note_listener(
+        self, note_id: str, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Add a listener for updates of one note, including its removal."""
+        self._note_listeners.setdefault(note_id, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            listeners = self._note_listeners.get(note_id, [])
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+            if not listeners:
+                self._note_listeners.pop(note_id, None)
+
+        return remove_listener
+
     def _notify_listeners(self) -> None:
-        """Notify all listeners of a store update."""
+        """Notify all listeners, and those of notes changed since last time."""
         for listener in self._listeners:
             listener()
+        dirty, self._dirty_note_ids = self._dirty_note_ids, set()
+        for note_id in dirty:
+            for listener in self._note_listeners.get(note_id, ()):
+                listener()
+
+
+def _note_changed_data(notes: list[tuple[str, Note | None]]) -> dict[str, Any] | None:
+    """Return the note changed event data for one operation's notes.
+
+    note_ids lists every note; a single note also gets its id and title.
+    category_id is set when the changed notes share one, which deleted
+    notes do not report.
+    """
+    if not notes:
+        return None
+    categories = {note.category_id for _, note in notes if note is not None}
+    data: dict[str, Any] = {
+        ATTR_NOTE_IDS: [note_id for note_id, _ in notes],
+        ATTR_CATEGORY_ID: categories.pop() if len(categories) == 1 else None,
+        ATTR_DELETED: notes[0][1] is None,
+    }
+    if len(notes) == 1:
+        note_id, note = notes[0]
+        data[ATTR_NOTE_ID] = note_id
+        data[ATTR_TITLE] = None if note is None else note.title
+    return data
+
+
+def _log_save_error(future: asyncio.Future[None]) -> None:
+    """Log a failed background snapshot write; the journal keeps its changes."""
+    if not future.cancelled() and (err := future.exception()) is not None:
+        _LOGGER.error("Saving notes failed; changes remain in the journal: %s", err)
+
+
+@callback
+def async_get_store(
+    hass: HomeAssistant, entry_id: str | None = None
+) -> HaNoteRecordStore | None:
+    """Return the store of a loaded notebook.
+
+    Without an entry_id this is the default notebook: the original
+    single-instance entry if loaded, otherwise the oldest loaded entry.
+    """
+    if entry_id is not None:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if (
+            entry is None
+            or entry.domain != DOMAIN
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            return None
+        return entry.runtime_data
+
+    entries = hass.config_entries.async_loaded_entries(DOMAIN)
+    for entry in entries:
+        if entry.unique_id == DOMAIN:
+            return entry.runtime_data
+    return entries[0].runtime_data if entries else None
@@ -10,8 +10,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ATTR_NOTE_ID, DOMAIN, ICON_PINNED, ICON_UNPINNED
+from .const import ATTR_NOTE_ID, ICON_PINNED, ICON_UNPINNED
 from .entity import HaNoteRecordEntity
+from .registry import note_unique_id
 from .store import Category, HaNoteRecordStore, Note
 
 _LOGGER = logging.getLogger(__name__)
@@ -71,36 +72,24 @@ class HaNoteRecordSwitchEntity(HaNoteRecordEntity, SwitchEntity):
     ) -> None:
         """Initialize the switch entity."""
         super().__init__(store, note, category)
-        self._attr_unique_id = f"{DOMAIN}_{category.id}_{note.id}_pinned"
+        self._attr_unique_id = note_unique_id(note.id, "_pinned")
         self._attr_name = f"{note.title} Pinned"
+        self._attr_extra_state_attributes = {ATTR_NOTE_ID: note.id}
 
-    @property
-    def is_on(self) -> bool | None:
-        """Return True if the note is pinned."""
-        if not self._refresh_note():
-            return None
-        return self._note.pinned
-
-    @property
-    def icon(self) -> str:
-        """Return the icon based on pinned status."""
-        return ICON_PINNED if self.is_on else ICON_UNPINNED
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
-        return {
-            ATTR_NOTE_ID: self._note.id,
-        }
+    def _update_from_note(self) -> bool:
+        """Compute the pinned state and its icon."""
+        if self._note.pinned == self._attr_is_on:
+            return False
+        self._attr_is_on = self._note.pinned
+        self._attr_icon = ICON_PINNED if self._note.pinned else ICON_UNPINNED
+        return True
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Pin the note."""
         await self._store.async_update_note_pinned(self._note.id, True)
-        if self._refresh_note():
-            self.async_write_ha_state()
+        self._async_note_updated()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Unpin the note."""
         await self._store.async_update_note_pinned(self._note.id, False)
-        if self._refresh_note():
-            self.async_write_ha_state()
+        self._async_note_updated()
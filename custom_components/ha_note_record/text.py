@@ -16,11 +16,11 @@ from .const import (
     ATTR_RAW_CONTENT,
     ATTR_TITLE,
     ATTR_UPDATED_AT,
-    DOMAIN,
     ICON_NOTE,
     MAX_NOTE_CONTENT_LENGTH,
 )
 from .entity import HaNoteRecordEntity
+from .registry import note_unique_id
 from .store import Category, HaNoteRecordStore, Note
 
 _LOGGER = logging.getLogger(__name__)
@@ -77,6 +77,8 @@ class HaNoteRecordTextEntity(HaNoteRecordEntity, TextEntity):
 
     _attr_mode = TextMode.TEXT
     _attr_icon = ICON_NOTE
+    # Note fields and category name the state was last computed from
+    _shown: tuple[str, str, str, str] | None = None
 
     def __init__(
         self,
@@ -86,31 +88,29 @@ class HaNoteRecordTextEntity(HaNoteRecordEntity, TextEntity):
     ) -> None:
         """Initialize the text entity."""
         super().__init__(store, note, category)
-        self._attr_unique_id = f"{DOMAIN}_{category.id}_{note.id}_content"
+        self._attr_unique_id = note_unique_id(note.id, "_content")
         self._attr_name = note.title
 
-    @property
-    def native_value(self) -> str | None:
-        """Return the state value (truncated if needed)."""
-        if not self._refresh_note():
-            return None
-        content = self._note.content
+    def _update_from_note(self) -> bool:
+        """Compute the state value (truncated if needed) and attributes."""
+        note = self._note
+        shown = (note.content, note.title, note.updated_at, self._category.name)
+        if shown == self._shown:
+            return False
+        self._shown = shown
+        content = note.content
         if len(content) > MAX_STATE_LENGTH:
-            return content[:MAX_STATE_LENGTH] + "..."
-        return content
-
-    @property
-    def extra_state_attributes(self) -> dict[str, str]:
-        """Return extra state attributes."""
-        self._refresh_note()
-        return {
-            ATTR_RAW_CONTENT: self._note.content,
-            ATTR_TITLE: self._note.title,
-            ATTR_NOTE_ID: self._note.id,
+            content = content[:MAX_STATE_LENGTH] + "..."
+        self._attr_native_value = content
+        self._attr_extra_state_attributes = {
+            ATTR_RAW_CONTENT: note.content,
+            ATTR_TITLE: note.title,
+            ATTR_NOTE_ID: note.id,
             ATTR_CATEGORY: self._category.name,
-            ATTR_CREATED_AT: self._note.created_at,
-            ATTR_UPDATED_AT: self._note.updated_at,
+            ATTR_CREATED_AT: note.created_at,
+            ATTR_UPDATED_AT: note.updated_at,
         }
+        return True
 
     async def async_set_value(self, value: str) -> None:
         """Set the note content."""
@@ -121,5 +121,4 @@ class HaNoteRecordTextEntity(HaNoteRecordEntity, TextEntity):
             )
             return
         await self._store.async_update_note_content(self._note.id, value)
-        if self._refresh_note():
-            self.async_write_ha_state()
+        self._async_note_updated()
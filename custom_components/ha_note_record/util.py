@@ -0,0 +1,49 @@
+"""Helpers for Ha Note Record."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+import hashlib
+
+import voluptuous as vol
+
+from .const import MAX_TAG_LENGTH, MAX_TAGS_PER_NOTE
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def content_hash(content: str) -> str:
+    """Return the content address of a note body."""
+    return hashlib.sha1(content.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def utcnow_iso() -> str:
+    """Return the current time as an ISO timestamp in UTC."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def timestamp_to_int(timestamp: str) -> int:
+    """Convert an ISO timestamp to integer microseconds since the epoch."""
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def int_to_datetime(value: int) -> datetime:
+    """Convert integer microseconds since the epoch to an aware datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def normalize_tags(tags: Iterable[str]) -> list[str]:
+    """Strip, lowercase and de-duplicate tags, keeping their order."""
+    return list(dict.fromkeys(t for tag in tags if (t := tag.strip().lower())))
+
+
+TAGS_SCHEMA = vol.All(
+    [vol.All(str, vol.Length(max=MAX_TAG_LENGTH))],
+    normalize_tags,
+    vol.Length(max=MAX_TAGS_PER_NOTE),
+)
@@ -8,59 +8,313 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import UNDEFINED
+from homeassistant.util import dt as dt_util
 
+from .checklist import CHECKLIST_SCHEMA, ITEM_TEXT_SCHEMA
 from .const import (
+    DEFAULT_PAGE_SIZE,
     DOMAIN,
     MAX_CATEGORY_NAME_LENGTH,
     MAX_NOTE_CONTENT_LENGTH,
     MAX_NOTE_TITLE_LENGTH,
+    MAX_PAGE_SIZE,
 )
-from .store import HaNoteRecordStore
+from .patches import Splice
+from .registry import (
+    async_move_note_entities,
+    async_remove_category_device,
+    async_remove_note_entities,
+    async_rename_category_device,
+)
+from .store import (
+    DuplicateNameError,
+    HaNoteRecordStore,
+    PatchConflictError,
+    async_get_store,
+)
+from .util import TAGS_SCHEMA
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def async_register_websocket_api(hass: HomeAssistant) -> None:
     """Register WebSocket API handlers."""
+    websocket_api.async_register_command(hass, websocket_list_notebooks)
     websocket_api.async_register_command(hass, websocket_get_data)
+    websocket_api.async_register_command(hass, websocket_get_note)
+    websocket_api.async_register_command(hass, websocket_list_notes)
+    websocket_api.async_register_command(hass, websocket_query_notes)
+    websocket_api.async_register_command(hass, websocket_list_tags)
+    websocket_api.async_register_command(hass, websocket_changes_since)
     websocket_api.async_register_command(hass, websocket_create_category)
+    websocket_api.async_register_command(hass, websocket_rename_category)
+    websocket_api.async_register_command(hass, websocket_move_notes)
     websocket_api.async_register_command(hass, websocket_create_note)
     websocket_api.async_register_command(hass, websocket_update_note)
+    websocket_api.async_register_command(hass, websocket_patch_note)
+    websocket_api.async_register_command(hass, websocket_add_checklist_item)
+    websocket_api.async_register_command(hass, websocket_update_checklist_item)
+    websocket_api.async_register_command(hass, websocket_remove_checklist_item)
     websocket_api.async_register_command(hass, websocket_delete_note)
+    websocket_api.async_register_command(hass, websocket_archive_notes)
+    websocket_api.async_register_command(hass, websocket_search_archive)
+    websocket_api.async_register_command(hass, websocket_get_archived_note)
+    websocket_api.async_register_command(hass, websocket_restore_note)
     websocket_api.async_register_command(hass, websocket_delete_category)
 
 
-def _get_store(hass: HomeAssistant) -> HaNoteRecordStore | None:
-    """Get the store from hass.data."""
-    if DOMAIN not in hass.data:
+def _expires_at_to_iso(value: Any) -> str | None:
+    """Normalize a validated expires_at value to an ISO timestamp in UTC."""
+    if value is None:
         return None
-    return hass.data[DOMAIN].get("store")
+    return dt_util.as_utc(value).isoformat()
+
+
+def _get_store(
+    hass: HomeAssistant, msg: dict[str, Any]
+) -> HaNoteRecordStore | None:
+    """Get the store of the notebook a message is addressed to."""
+    return async_get_store(hass, msg.get("entry_id"))
+
+
+def _get_entry(hass: HomeAssistant, store: HaNoteRecordStore) -> ConfigEntry | None:
+    """Get the config entry of a store."""
+    for entry in hass.config_entries.async_loaded_entries(DOMAIN):
+        if entry.runtime_data is store:
+            return entry
+    return None
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): "ha_note_record/get_data",
+        vol.Required("type"): "ha_note_record/list_notebooks",
     }
 )
 @callback
-def websocket_get_data(
+def websocket_list_notebooks(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle a request for the loaded notebooks (config entries)."""
+    default = async_get_store(hass)
+    connection.send_result(
+        msg["id"],
+        {
+            "notebooks": [
+                {
+                    "entry_id": entry.entry_id,
+                    "title": entry.title,
+                    "default": entry.runtime_data is default,
+                }
+                for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+            ]
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/get_data",
+        vol.Optional("entry_id"): str,
+        vol.Optional("include_html", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_get_data(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
     """Handle get data request."""
-    store = _get_store(hass)
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    # Serialize a frozen snapshot off the event loop; mutations made in the
+    # meantime produce a new snapshot and cannot tear this one.
+    snapshot = store.snapshot()
+    cursor = store.cursor
+    data = await hass.async_add_executor_job(snapshot.as_dict)
+    if msg["include_html"]:
+        for note_dict, html in zip(
+            data["notes"], await store.async_render_html(snapshot.notes), strict=True
+        ):
+            note_dict["html"] = html
+    data["revision"] = snapshot.revision
+    data["cursor"] = cursor
+    data["archived"] = len(store.archive)
+
+    connection.send_result(msg["id"], data)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/get_note",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_id"): str,
+        vol.Optional("include_html", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_get_note(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle get note request."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    note = store.get_note(msg["note_id"])
+    if note is None:
+        connection.send_error(msg["id"], "not_found", "Note not found")
+        return
+
+    result = note.to_dict()
+    if msg["include_html"]:
+        result["html"] = (await store.async_render_html([note]))[0]
+
+    connection.send_result(msg["id"], result)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/list_notes",
+        vol.Optional("entry_id"): str,
+        vol.Required("category_id"): str,
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            int, vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional("include_html", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_list_notes(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle a paged, ordered listing of one category's notes."""
+    store = _get_store(hass, msg)
     if store is None:
         connection.send_error(msg["id"], "not_found", "Store not initialized")
         return
 
+    category_id = msg["category_id"]
+    if store.get_category(category_id) is None:
+        connection.send_error(msg["id"], "not_found", "Category not found")
+        return
+
+    offset = msg["offset"]
+    notes = list(store.iter_notes_by_category(category_id, offset, msg["limit"]))
+    note_dicts = [n.to_dict() for n in notes]
+    if msg["include_html"]:
+        for note_dict, html in zip(
+            note_dicts, await store.async_render_html(notes), strict=True
+        ):
+            note_dict["html"] = html
+
+    total = store.count_notes_in_category(category_id)
+    next_offset = offset + len(notes)
     connection.send_result(
         msg["id"],
         {
-            "categories": [c.to_dict() for c in store.categories],
-            "notes": [n.to_dict() for n in store.notes],
+            "notes": note_dicts,
+            "total": total,
+            "next_offset": next_offset if next_offset < total else None,
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/query_notes",
+        vol.Optional("entry_id"): str,
+        vol.Optional("tags_all"): TAGS_SCHEMA,
+        vol.Optional("tags_any"): TAGS_SCHEMA,
+        vol.Optional("category_id"): str,
+    }
+)
+@callback
+def websocket_query_notes(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle a tag-filtered note query."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    notes = store.query_notes(
+        tags_all=msg.get("tags_all"),
+        tags_any=msg.get("tags_any"),
+        category_id=msg.get("category_id"),
+    )
+    connection.send_result(msg["id"], {"notes": [n.to_dict() for n in notes]})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/list_tags",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_list_tags(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle a request for all tags and their note counts."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    connection.send_result(msg["id"], {"tags": store.get_tags()})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/changes_since",
+        vol.Optional("entry_id"): str,
+        vol.Required("cursor"): str,
+    }
+)
+@callback
+def websocket_changes_since(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle a request for the changes made after a cursor.
+
+    When the cursor can no longer be resumed the client is told to resync
+    with get_data, which returns a fresh cursor.
+    """
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    changes = store.changes_since(msg["cursor"])
+    connection.send_result(
+        msg["id"],
+        {
+            "cursor": store.cursor,
+            "resync": changes is None,
+            "changes": [change.to_dict() for change in changes or ()],
         },
     )
 
@@ -68,7 +322,9 @@ def websocket_get_data(
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "ha_note_record/create_category",
+        vol.Optional("entry_id"): str,
         vol.Required("name"): str,
+        vol.Optional("default_ttl"): vol.Any(None, cv.positive_int),
     }
 )
 @websocket_api.async_response
@@ -78,7 +334,7 @@ async def websocket_create_category(
     msg: dict[str, Any],
 ) -> None:
     """Handle create category request."""
-    store = _get_store(hass)
+    store = _get_store(hass, msg)
     if store is None:
         connection.send_error(msg["id"], "not_found", "Store not initialized")
         return
@@ -96,23 +352,116 @@ async def websocket_create_category(
         )
         return
 
-    # Check for duplicate name
-    for category in store.categories:
-        if category.name.lower() == name.lower():
-            connection.send_error(msg["id"], "duplicate", "Category already exists")
-            return
+    try:
+        category = await store.async_create_category(
+            name, default_ttl=msg.get("default_ttl")
+        )
+    except DuplicateNameError:
+        connection.send_error(msg["id"], "duplicate", "Category already exists")
+        return
+    connection.send_result(msg["id"], category.to_dict())
+
 
-    category = await store.async_create_category(name)
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/rename_category",
+        vol.Optional("entry_id"): str,
+        vol.Required("category_id"): str,
+        vol.Required("name"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_rename_category(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle rename category request."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    name = msg["name"].strip()
+    if not name:
+        connection.send_error(msg["id"], "invalid_input", "Category name is required")
+        return
+
+    if len(name) > MAX_CATEGORY_NAME_LENGTH:
+        connection.send_error(
+            msg["id"],
+            "invalid_input",
+            f"Category name exceeds maximum length of {MAX_CATEGORY_NAME_LENGTH} characters",
+        )
+        return
+
+    try:
+        category = await store.async_rename_category(msg["category_id"], name)
+    except DuplicateNameError:
+        connection.send_error(msg["id"], "duplicate", "Category already exists")
+        return
+
+    if category is None:
+        connection.send_error(msg["id"], "not_found", "Category not found")
+        return
+
+    async_rename_category_device(hass, category.id, category.name)
     connection.send_result(msg["id"], category.to_dict())
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/move_notes",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_ids"): [str],
+        vol.Required("category_id"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_move_notes(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle move notes request.
+
+    Notes keep their ids and entities; the entities are attached to the
+    target category's device in one registry pass.
+    """
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    try:
+        moved = await store.async_move_notes(msg["note_ids"], msg["category_id"])
+    except DuplicateNameError as err:
+        connection.send_error(msg["id"], "duplicate", str(err))
+        return
+
+    if moved is None:
+        connection.send_error(msg["id"], "not_found", "Category not found")
+        return
+
+    if moved and (entry := _get_entry(hass, store)) is not None:
+        if category := store.get_category(msg["category_id"]):
+            async_move_note_entities(
+                hass, entry, category.id, category.name, (n.id for n in moved)
+            )
+    connection.send_result(msg["id"], {"moved": [note.id for note in moved]})
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "ha_note_record/create_note",
+        vol.Optional("entry_id"): str,
         vol.Required("category_id"): str,
         vol.Required("title"): str,
         vol.Optional("content", default=""): str,
         vol.Optional("pinned", default=False): bool,
+        vol.Optional("expires_at"): vol.Any(None, cv.datetime),
+        vol.Optional("tags", default=list): TAGS_SCHEMA,
+        vol.Optional("checklist"): CHECKLIST_SCHEMA,
     }
 )
 @websocket_api.async_response
@@ -122,7 +471,7 @@ async def websocket_create_note(
     msg: dict[str, Any],
 ) -> None:
     """Handle create note request."""
-    store = _get_store(hass)
+    store = _get_store(hass, msg)
     if store is None:
         connection.send_error(msg["id"], "not_found", "Store not initialized")
         return
@@ -155,18 +504,19 @@ async def websocket_create_note(
         connection.send_error(msg["id"], "not_found", "Category not found")
         return
 
-    # Check for duplicate title in category
-    for note in store.get_notes_by_category(category_id):
-        if note.title.lower() == title.lower():
-            connection.send_error(msg["id"], "duplicate", "Note title already exists in this category")
-            return
-
-    note = await store.async_create_note(
-        category_id=category_id,
-        title=title,
-        content=msg["content"],
-        pinned=msg["pinned"],
-    )
+    try:
+        note = await store.async_create_note(
+            category_id=category_id,
+            title=title,
+            content=msg["content"],
+            pinned=msg["pinned"],
+            expires_at=_expires_at_to_iso(msg.get("expires_at")),
+            tags=msg["tags"],
+            checklist=msg.get("checklist"),
+        )
+    except DuplicateNameError:
+        connection.send_error(msg["id"], "duplicate", "Note title already exists in this category")
+        return
 
     if note is None:
         connection.send_error(msg["id"], "error", "Failed to create note")
@@ -178,10 +528,13 @@ async def websocket_create_note(
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "ha_note_record/update_note",
+        vol.Optional("entry_id"): str,
         vol.Required("note_id"): str,
         vol.Optional("title"): str,
         vol.Optional("content"): str,
         vol.Optional("pinned"): bool,
+        vol.Optional("expires_at"): vol.Any(None, cv.datetime),
+        vol.Optional("tags"): TAGS_SCHEMA,
     }
 )
 @websocket_api.async_response
@@ -191,7 +544,7 @@ async def websocket_update_note(
     msg: dict[str, Any],
 ) -> None:
     """Handle update note request."""
-    store = _get_store(hass)
+    store = _get_store(hass, msg)
     if store is None:
         connection.send_error(msg["id"], "not_found", "Store not initialized")
         return
@@ -219,12 +572,6 @@ async def websocket_update_note(
             )
             return
 
-        # Check for duplicate title in category (excluding current note)
-        for other_note in store.get_notes_by_category(note.category_id):
-            if other_note.id != note_id and other_note.title.lower() == title.lower():
-                connection.send_error(msg["id"], "duplicate", "Note title already exists in this category")
-                return
-
     # Validate content if provided
     content = None
     if "content" in msg:
@@ -240,11 +587,25 @@ async def websocket_update_note(
     # Get pinned if provided
     pinned = msg.get("pinned")
 
-    # Apply all updates atomically (single save)
-    await store.async_update_note(
-        note_id, title=title, content=content, pinned=pinned
+    # None clears the expiry; omitting the key leaves it unchanged
+    expires_at = (
+        _expires_at_to_iso(msg["expires_at"]) if "expires_at" in msg else UNDEFINED
     )
 
+    # Apply all updates atomically (single save)
+    try:
+        await store.async_update_note(
+            note_id,
+            title=title,
+            content=content,
+            pinned=pinned,
+            expires_at=expires_at,
+            tags=msg.get("tags"),
+        )
+    except DuplicateNameError:
+        connection.send_error(msg["id"], "duplicate", "Note title already exists in this category")
+        return
+
     # Refresh note data
     updated_note = store.get_note(note_id)
     if updated_note:
@@ -253,9 +614,175 @@ async def websocket_update_note(
         connection.send_error(msg["id"], "error", "Failed to update note")
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/patch_note",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_id"): str,
+        vol.Required("cursor"): str,
+        vol.Required("splices"): vol.All(
+            [
+                {
+                    vol.Required("offset"): vol.All(int, vol.Range(min=0)),
+                    vol.Optional("delete", default=0): vol.All(
+                        int, vol.Range(min=0)
+                    ),
+                    vol.Optional("insert", default=""): str,
+                }
+            ],
+            vol.Length(min=1),
+        ),
+    }
+)
+@websocket_api.async_response
+async def websocket_patch_note(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle patch note request.
+
+    Splices apply in order to the content as of cursor, with offsets in
+    UTF-16 code units as the frontend counts them. The result carries
+    no content, only a cursor to base the next patch of this note on.
+    """
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    note_id = msg["note_id"]
+    splices = [Splice.from_dict(splice) for splice in msg["splices"]]
+    try:
+        cursor = await store.async_patch_note(note_id, splices, msg["cursor"])
+    except PatchConflictError:
+        connection.send_error(
+            msg["id"], "conflict", "Note changed since the given cursor"
+        )
+        return
+    except ValueError as err:
+        connection.send_error(msg["id"], "invalid_input", str(err))
+        return
+
+    note = store.get_note(note_id)
+    if cursor is None or note is None:
+        connection.send_error(msg["id"], "not_found", "Note not found")
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "cursor": cursor,
+            "content_hash": note.content_hash,
+            "updated_at": note.updated_at,
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/add_checklist_item",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_id"): str,
+        vol.Required("text"): ITEM_TEXT_SCHEMA,
+        vol.Optional("index"): vol.All(int, vol.Range(min=0)),
+    }
+)
+@websocket_api.async_response
+async def websocket_add_checklist_item(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle add checklist item request."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    try:
+        item = await store.async_add_checklist_item(
+            msg["note_id"], msg["text"], msg.get("index")
+        )
+    except ValueError as err:
+        connection.send_error(msg["id"], "invalid_input", str(err))
+        return
+
+    if item is None:
+        connection.send_error(msg["id"], "not_found", "Note not found")
+        return
+
+    connection.send_result(msg["id"], item.to_dict())
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/update_checklist_item",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_id"): str,
+        vol.Required("item_id"): str,
+        vol.Optional("text"): ITEM_TEXT_SCHEMA,
+        vol.Optional("checked"): bool,
+        vol.Optional("index"): vol.All(int, vol.Range(min=0)),
+    }
+)
+@websocket_api.async_response
+async def websocket_update_checklist_item(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle update checklist item request; index moves the item."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    item = await store.async_update_checklist_item(
+        msg["note_id"],
+        msg["item_id"],
+        text=msg.get("text"),
+        checked=msg.get("checked"),
+        index=msg.get("index"),
+    )
+    if item is None:
+        connection.send_error(msg["id"], "not_found", "Checklist item not found")
+        return
+
+    connection.send_result(msg["id"], item.to_dict())
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/remove_checklist_item",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_id"): str,
+        vol.Required("item_id"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_remove_checklist_item(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle remove checklist item request."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    if not await store.async_remove_checklist_item(msg["note_id"], msg["item_id"]):
+        connection.send_error(msg["id"], "not_found", "Checklist item not found")
+        return
+
+    connection.send_result(msg["id"], {"removed": True})
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "ha_note_record/delete_note",
+        vol.Optional("entry_id"): str,
         vol.Required("note_id"): str,
     }
 )
@@ -266,7 +793,7 @@ async def websocket_delete_note(
     msg: dict[str, Any],
 ) -> None:
     """Handle delete note request."""
-    store = _get_store(hass)
+    store = _get_store(hass, msg)
     if store is None:
         connection.send_error(msg["id"], "not_found", "Store not initialized")
         return
@@ -278,25 +805,150 @@ async def websocket_delete_note(
         connection.send_error(msg["id"], "not_found", "Note not found")
         return
 
-    category_id = note.category_id
-
     success = await store.async_delete_note(note_id)
     if success:
         # Clean up entity registry entries
-        ent_reg = er.async_get(hass)
-        for platform, suffix in [("text", "_content"), ("switch", "_pinned")]:
-            unique_id = f"{DOMAIN}_{category_id}_{note_id}{suffix}"
-            entity_id = ent_reg.async_get_entity_id(platform, DOMAIN, unique_id)
-            if entity_id:
-                ent_reg.async_remove(entity_id)
+        async_remove_note_entities(hass, [note_id])
         connection.send_result(msg["id"], {"deleted": True})
     else:
         connection.send_error(msg["id"], "error", "Failed to delete note")
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/archive_notes",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_ids"): [str],
+    }
+)
+@websocket_api.async_response
+async def websocket_archive_notes(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle archive notes request."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    archived = await store.async_archive_notes(msg["note_ids"])
+    # Archived notes have no entities; restoring creates them again
+    async_remove_note_entities(hass, (note.id for note in archived))
+    connection.send_result(msg["id"], {"archived": [note.id for note in archived]})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/search_archive",
+        vol.Optional("entry_id"): str,
+        vol.Optional("query"): str,
+        vol.Optional("category_id"): str,
+        vol.Optional("tags"): TAGS_SCHEMA,
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            int, vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+    }
+)
+@callback
+def websocket_search_archive(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle a search of the archive index; bodies are not included."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    entries = store.archive.search(
+        msg.get("query"), category_id=msg.get("category_id"), tags=msg.get("tags")
+    )
+    offset = msg["offset"]
+    connection.send_result(
+        msg["id"],
+        {
+            "notes": [
+                entry.to_dict() for entry in entries[offset : offset + msg["limit"]]
+            ],
+            "total": len(entries),
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/get_archived_note",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_id"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_get_archived_note(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle a request for an archived note, body included."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    note = await store.async_read_archived_note(msg["note_id"])
+    entry = store.archive.get(msg["note_id"])
+    if note is None or entry is None:
+        connection.send_error(msg["id"], "not_found", "Archived note not found")
+        return
+
+    connection.send_result(
+        msg["id"], {**note.to_dict(), "archived_at": entry.archived_at}
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_note_record/restore_note",
+        vol.Optional("entry_id"): str,
+        vol.Required("note_id"): str,
+        vol.Optional("category_id"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_restore_note(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle restore of an archived note into the hot store."""
+    store = _get_store(hass, msg)
+    if store is None:
+        connection.send_error(msg["id"], "not_found", "Store not initialized")
+        return
+
+    try:
+        note = await store.async_restore_note(msg["note_id"], msg.get("category_id"))
+    except ValueError as err:
+        connection.send_error(msg["id"], "not_found", str(err))
+        return
+    except DuplicateNameError:
+        connection.send_error(msg["id"], "duplicate", "Note title already exists in this category")
+        return
+
+    if note is None:
+        connection.send_error(msg["id"], "not_found", "Archived note not found")
+        return
+
+    connection.send_result(msg["id"], note.to_dict())
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "ha_note_record/delete_category",
+        vol.Optional("entry_id"): str,
         vol.Required("category_id"): str,
     }
 )
@@ -307,7 +959,7 @@ async def websocket_delete_category(
     msg: dict[str, Any],
 ) -> None:
     """Handle delete category request."""
-    store = _get_store(hass)
+    store = _get_store(hass, msg)
     if store is None:
         connection.send_error(msg["id"], "not_found", "Store not initialized")
         return
@@ -318,25 +970,11 @@ async def websocket_delete_category(
         connection.send_error(msg["id"], "not_found", "Category not found")
         return
 
-    # Cascade-delete all notes in this category first
-    notes = store.get_notes_by_category(category_id)
-    ent_reg = er.async_get(hass)
-    for note in notes:
-        await store.async_delete_note(note.id)
-        # Clean up entity registry entries for each deleted note
-        for platform, suffix in [("text", "_content"), ("switch", "_pinned")]:
-            unique_id = f"{DOMAIN}_{category_id}_{note.id}{suffix}"
-            entity_id = ent_reg.async_get_entity_id(platform, DOMAIN, unique_id)
-            if entity_id:
-                ent_reg.async_remove(entity_id)
+    # Delete the category and its notes as one operation (single save)
+    removed = await store.async_delete_category_cascade(category_id)
 
-    success = await store.async_delete_category(category_id)
-    if success:
-        # Clean up device registry entry
-        dev_reg = dr.async_get(hass)
-        device = dev_reg.async_get_device(identifiers={(DOMAIN, category_id)})
-        if device:
-            dev_reg.async_remove_device(device.id)
-        connection.send_result(msg["id"], {"deleted": True})
-    else:
-        connection.send_error(msg["id"], "error", "Failed to delete category")
+    # Clean up entity registry entries for each deleted note
+    async_remove_note_entities(hass, (note.id for note in removed))
+    # Clean up device registry entry
+    async_remove_category_device(hass, category_id)
+    connection.send_result(msg["id"], {"deleted": True})
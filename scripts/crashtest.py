@@ -0,0 +1,225 @@
+"""Crash consistency test for Ha Note Record's durable mode.
+
+Repeatedly starts a writer process that mutates a durable notebook from
+several concurrent workers, kills it with SIGKILL at a random moment, then
+loads the notebook and checks that it is consistent and that every
+acknowledged mutation survived. Requires a development environment with
+Home Assistant installed. Run from the repository root:
+
+    python -m scripts.crashtest --rounds 50
+
+The writer reports each mutation before starting it and again once it
+returns. Workers own disjoint titles and mutate them one at a time, so
+after a crash each note must be in the state of its last acknowledged
+mutation, or of the one mutation that was in flight.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import json
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_note_record.store import HaNoteRecordStore
+
+CATEGORY = "Crash test"
+TITLES_PER_WORKER = 5
+# A missing note
+ABSENT = None
+
+
+@dataclass
+class Mutation:
+    """One mutation as reported by the writer."""
+
+    token: int
+    title: str
+    content: str | None  # None for a delete
+    acked: bool = False
+
+
+def _emit(record: dict[str, Any]) -> None:
+    """Report a record to the parent; it must be on the pipe before returning."""
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+async def _async_open(config_dir: str) -> tuple[HomeAssistant, HaNoteRecordStore]:
+    """Load the notebook under test."""
+    hass = HomeAssistant(config_dir)
+    store = HaNoteRecordStore(hass, durable=True)
+    await store.async_load()
+    return hass, store
+
+
+async def async_writer(args: argparse.Namespace) -> None:
+    """Mutate the notebook until killed or out of operations."""
+    _, store = await _async_open(args.config_dir)
+    if (category := store.get_category_by_name(CATEGORY)) is None:
+        category = await store.async_create_category(CATEGORY)
+    rng = random.Random(args.seed)
+    tokens = iter(range(1, sys.maxsize))
+    _emit({"ready": True})
+
+    async def worker(worker_id: int) -> None:
+        titles = [f"w{worker_id}-{i}" for i in range(TITLES_PER_WORKER)]
+        for _ in range(args.ops):
+            title = rng.choice(titles)
+            note = store.get_note_by_title(category.id, title)
+            token = next(tokens)
+            if note is not None and rng.random() < 0.3:
+                _emit({"token": token, "title": title, "content": None})
+                await store.async_delete_note(note.id)
+            else:
+                content = f"{title} v{token} " + "x" * rng.randrange(2000)
+                _emit({"token": token, "title": title, "content": content})
+                if note is None:
+                    await store.async_create_note(category.id, title, content=content)
+                else:
+                    await store.async_update_note_content(note.id, content)
+            _emit({"ack": token})
+
+    await asyncio.gather(*(worker(i) for i in range(args.workers)))
+    await store.async_flush()
+
+
+def _read_report(output: str) -> tuple[bool, list[Mutation]]:
+    """Parse the writer's complete report lines."""
+    ready = False
+    mutations: dict[int, Mutation] = {}
+    for line in output.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            break  # Torn by the kill; nothing follows it
+        if record.get("ready"):
+            ready = True
+        elif "ack" in record:
+            mutations[record["ack"]].acked = True
+        else:
+            mutations[record["token"]] = Mutation(
+                record["token"], record["title"], record["content"]
+            )
+    return ready, list(mutations.values())
+
+
+def check_consistency(store: HaNoteRecordStore) -> list[str]:
+    """Return problems with the store's indexes."""
+    problems: list[str] = []
+    for category in store.categories:
+        if store.get_category_by_name(category.name) is not category:
+            problems.append(f"category {category.name!r} not indexed by name")
+        notes = [note for note in store.notes if note.category_id == category.id]
+        if store.count_notes_in_category(category.id) != len(notes):
+            problems.append(f"category {category.name!r} note count is off")
+        if {n.id for n in store.iter_notes_by_category(category.id)} != {
+            n.id for n in notes
+        }:
+            problems.append(f"category {category.name!r} order is off")
+    category_ids = {category.id for category in store.categories}
+    for note in store.notes:
+        if note.category_id not in category_ids:
+            problems.append(f"note {note.title!r} has no category")
+        if store.get_note_by_title(note.category_id, note.title) is not note:
+            problems.append(f"note {note.title!r} not indexed by title")
+    return problems
+
+
+def check_durability(
+    before: dict[str, str | None],
+    mutations: list[Mutation],
+    after: dict[str, str | None],
+) -> list[str]:
+    """Return notes whose state no prefix of their mutations explains."""
+    problems: list[str] = []
+    by_title: dict[str, list[Mutation]] = {}
+    for mutation in mutations:
+        by_title.setdefault(mutation.title, []).append(mutation)
+    for title in before.keys() | after.keys() | by_title.keys():
+        allowed = before.get(title, ABSENT)
+        in_flight: set[str | None] = set()
+        for mutation in by_title.get(title, []):
+            if mutation.acked:
+                allowed = mutation.content
+            else:
+                in_flight.add(mutation.content)
+        if after.get(title, ABSENT) not in {allowed} | in_flight:
+            problems.append(f"note {title!r} lost an acknowledged mutation")
+    return problems
+
+
+async def async_verify(config_dir: str) -> tuple[dict[str, str | None], list[str]]:
+    """Load the notebook as after a restart and check its consistency."""
+    _, store = await _async_open(config_dir)
+    problems = check_consistency(store)
+    await store.async_flush()
+    store.expiry.async_stop()
+    return {note.title: note.content for note in store.notes}, problems
+
+
+def main() -> None:
+    """Run crash rounds and report any inconsistency."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=500, help="operations per worker")
+    parser.add_argument(
+        "--max-delay", type=float, default=2.0, help="longest run before the kill (s)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--writer", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.writer:
+        asyncio.run(async_writer(args))
+        return
+
+    rng = random.Random(args.seed)
+    failures = 0
+    with tempfile.TemporaryDirectory() as config_dir:
+        state: dict[str, str | None] = {}
+        for round_no in range(args.rounds):
+            writer = subprocess.Popen(
+                [
+                    sys.executable, "-m", "scripts.crashtest", "--writer",
+                    "--config-dir", config_dir,
+                    "--seed", str(rng.getrandbits(32)),
+                    "--workers", str(args.workers),
+                    "--ops", str(args.ops),
+                ],
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            time.sleep(rng.uniform(0, args.max_delay))
+            writer.send_signal(signal.SIGKILL)
+            output, _ = writer.communicate()
+            ready, mutations = _read_report(output)
+
+            after, problems = asyncio.run(async_verify(config_dir))
+            if ready:
+                problems += check_durability(state, mutations, after)
+            state = after
+            acked = sum(mutation.acked for mutation in mutations)
+            print(  # noqa: T201
+                f"round {round_no}: {acked} acknowledged, "
+                f"{len(mutations) - acked} in flight, {len(after)} notes"
+                + "".join(f"\n  {problem}" for problem in problems)
+            )
+            failures += bool(problems)
+    print(f"{failures} of {args.rounds} rounds inconsistent")  # noqa: T201
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
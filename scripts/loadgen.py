@@ -0,0 +1,654 @@
+"""Load generator for Ha Note Record.
+
+Drives a Home Assistant instance through its public APIs, simulating
+several open panels and many automations against one notebook. Each
+panel has its own WebSocket connection and uses the ha_note_record/*
+commands; automations call the text.set_value and switch.turn_on/turn_off
+actions on note entities. Save and journal counts come from the config
+entry's diagnostics.
+
+With --in-process, it starts a test instance in this process, with a
+new notebook in a temporary config dir, and talks to it through fake
+connections that pass each command to the WebSocket API's own handlers.
+Results then exclude network and proxy noise, and need no running
+instance. Requires the development environment of the test suite
+(pytest-homeassistant-custom-component) plus home-assistant-frontend,
+which the panel depends on. Run from the repository root:
+
+    python -m scripts.loadgen --in-process --panels 20 --automations 50
+
+Otherwise it loads a running instance. Point it at a development
+instance, not one holding notes you care about: it creates its own
+categories and notes and deletes them at the end, but the writes load
+the instance. Needs aiohttp and an administrator's long-lived access
+token:
+
+    HASS_TOKEN=... python -m scripts.loadgen --url http://localhost:8123 \\
+        --panels 20 --automations 50 --duration 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+import random
+import socket
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+try:
+    from homeassistant.components.websocket_api import ActiveConnection
+    from homeassistant.helpers.json import json_bytes
+except ImportError:  # Only the in-process mode needs Home Assistant
+    ActiveConnection = None  # type: ignore[assignment,misc]
+
+if TYPE_CHECKING:
+    from homeassistant.auth.models import RefreshToken, User
+    from homeassistant.core import HomeAssistant
+
+DOMAIN = "ha_note_record"
+TAGS = ("kitchen", "garage", "todo", "family", "work", "garden", "car", "bills")
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua"
+).split()
+ENTITY_WAIT = 30  # seconds to wait for the seeded notes' entities
+
+
+class CommandError(Exception):
+    """A WebSocket command was answered with an error."""
+
+
+@dataclass
+class OpStats:
+    """Latencies of one kind of operation."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def percentile(self, pct: float) -> float:
+        """Return a latency percentile in milliseconds."""
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+        return ordered[index] * 1000
+
+
+@dataclass
+class LoadStats:
+    """Counters collected during a run."""
+
+    ops: dict[str, OpStats] = field(default_factory=dict)
+    bytes_received: int = 0
+    messages_received: int = 0
+    state_writes: int = 0
+    state_bytes: int = 0
+
+    async def async_time(self, name: str, call: Awaitable[Any]) -> None:
+        """Await an operation and record its latency and outcome."""
+        stats = self.ops.setdefault(name, OpStats())
+        start = time.perf_counter()
+        try:
+            await call
+        except CommandError:
+            stats.errors += 1
+        stats.latencies.append(time.perf_counter() - start)
+
+
+class Client:
+    """One WebSocket API connection with pipelined commands.
+
+    Subclasses deliver outgoing messages and pass every incoming one,
+    with its size on the wire, to _dispatch.
+    """
+
+    def __init__(self, stats: LoadStats) -> None:
+        """Initialize the client."""
+        self._stats = stats
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._event_handlers: dict[int, Callable[[dict[str, Any], int], None]] = {}
+
+    async def async_connect(self) -> None:
+        """Open the connection."""
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+
+    async def _async_send(self, msg: dict[str, Any]) -> None:
+        """Deliver a command message."""
+        raise NotImplementedError
+
+    def _dispatch(self, msg: dict[str, Any], size: int) -> None:
+        """Resolve a result or hand an event to its handler."""
+        self._stats.bytes_received += size
+        self._stats.messages_received += 1
+        if msg["type"] == "event":
+            if (handler := self._event_handlers.get(msg["id"])) is not None:
+                handler(msg["event"], size)
+        elif (future := self._pending.pop(msg["id"], None)) is not None:
+            if msg.get("success", True):
+                future.set_result(msg.get("result"))
+            else:
+                future.set_exception(CommandError(msg["error"]["code"]))
+
+    def _fail_pending(self) -> None:
+        """Fail commands still waiting once the connection is gone."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(CommandError("connection_closed"))
+
+    async def async_call(self, command: str, **payload: Any) -> Any:
+        """Send a command and return its result; raise CommandError on error."""
+        self._next_id += 1
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        await self._async_send({"id": self._next_id, "type": command, **payload})
+        return await future
+
+    async def async_subscribe(
+        self, event_type: str, handler: Callable[[dict[str, Any], int], None]
+    ) -> None:
+        """Subscribe to an event type; handler gets each event and its size."""
+        self._event_handlers[self._next_id + 1] = handler
+        await self.async_call("subscribe_events", event_type=event_type)
+
+
+class WebSocketClient(Client):
+    """An authenticated connection to a running instance's WebSocket API."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        args: argparse.Namespace,
+        stats: LoadStats,
+    ) -> None:
+        """Initialize the client."""
+        super().__init__(stats)
+        self._session = session
+        self._args = args
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._reader: asyncio.Task[None] | None = None
+
+    async def async_connect(self) -> None:
+        """Open the connection and authenticate."""
+        self._ws = ws = await self._session.ws_connect(
+            self._args.url.rstrip("/") + "/api/websocket", max_msg_size=0
+        )
+        await ws.receive_json()  # auth_required
+        await ws.send_json({"type": "auth", "access_token": self._args.token})
+        if (reply := await ws.receive_json())["type"] != "auth_ok":
+            raise SystemExit(f"Authentication failed: {reply.get('message')}")
+        self._reader = asyncio.create_task(self._async_read())
+
+    async def _async_read(self) -> None:
+        """Dispatch results and events, counting what the server sends."""
+        assert self._ws is not None
+        async for message in self._ws:
+            if message.type is not aiohttp.WSMsgType.TEXT:
+                break
+            self._dispatch(json.loads(message.data), len(message.data.encode()))
+        self._fail_pending()
+
+    async def _async_send(self, msg: dict[str, Any]) -> None:
+        """Send a command message over the socket."""
+        assert self._ws is not None
+        await self._ws.send_json(msg)
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await self._reader
+
+
+class InProcessClient(Client):
+    """A fake connection handing commands to an in-process instance's handlers.
+
+    Messages go through Home Assistant's own connection class, so commands
+    are validated, authorized and answered as over a socket, and replies
+    are serialized to count their size.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        user: User,
+        refresh_token: RefreshToken,
+        stats: LoadStats,
+    ) -> None:
+        """Initialize the client."""
+        super().__init__(stats)
+        self._connection = ActiveConnection(
+            logging.getLogger(__name__), hass, self._receive, user, refresh_token
+        )
+
+    def _receive(self, message: bytes | str | dict[str, Any]) -> None:
+        """Take a message the connection would write to the socket."""
+        if isinstance(message, dict):
+            message = json_bytes(message)
+        elif isinstance(message, str):
+            message = message.encode()
+        self._dispatch(json.loads(message), len(message))
+
+    async def _async_send(self, msg: dict[str, Any]) -> None:
+        """Hand a command message to the connection."""
+        self._connection.async_handle(msg)
+
+    async def async_close(self) -> None:
+        """End the connection's subscriptions."""
+        self._connection.async_handle_close()
+        self._fail_pending()
+
+
+@dataclass
+class Notebook:
+    """The categories, notes and entities a run created."""
+
+    entry_id: str
+    category_ids: list[str] = field(default_factory=list)
+    note_ids: list[str] = field(default_factory=list)
+    note_categories: dict[str, str] = field(default_factory=dict)
+    text_entities: list[str] = field(default_factory=list)
+    switch_entities: list[str] = field(default_factory=list)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    """Return random filler text."""
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+async def async_find_entry(client: Client, entry_id: str | None) -> str:
+    """Return the notebook to load, the default one unless entry_id is given."""
+    notebooks = (await client.async_call(f"{DOMAIN}/list_notebooks"))["notebooks"]
+    for notebook in notebooks:
+        if entry_id is None and notebook["default"]:
+            return notebook["entry_id"]
+        if notebook["entry_id"] == entry_id:
+            return entry_id
+    raise SystemExit("Notebook not found; is Ha Note Record set up?")
+
+
+async def async_seed(
+    client: Client, rng: random.Random, args: argparse.Namespace
+) -> Notebook:
+    """Create this run's categories and notes and find their entities."""
+    notebook = Notebook(await async_find_entry(client, args.entry_id))
+    run = f"{rng.getrandbits(32):08x}"
+    for i in range(args.categories):
+        category = await client.async_call(
+            f"{DOMAIN}/create_category",
+            entry_id=notebook.entry_id,
+            name=f"Load test {run} {i}",
+        )
+        notebook.category_ids.append(category["id"])
+    # Sent concurrently so the writes coalesce into a few saves
+    notes = await asyncio.gather(
+        *(
+            client.async_call(
+                f"{DOMAIN}/create_note",
+                entry_id=notebook.entry_id,
+                category_id=rng.choice(notebook.category_ids),
+                title=f"Note {i}",
+                content=_text(rng, args.content_words),
+                pinned=rng.random() < 0.1,
+                tags=rng.sample(TAGS, rng.randint(0, 3)),
+            )
+            for i in range(args.notes)
+        )
+    )
+    for note in notes:
+        notebook.note_ids.append(note["id"])
+        notebook.note_categories[note["id"]] = note["category_id"]
+
+    # Entities are added shortly after their notes and carry their note_id
+    wanted = set(notebook.note_ids)
+    deadline = time.monotonic() + ENTITY_WAIT
+    while True:
+        states = [
+            state
+            for state in await client.async_call("get_states")
+            if state["attributes"].get("note_id") in wanted
+            and state["entity_id"].startswith(("text.", "switch."))
+        ]
+        if len(states) == 2 * len(wanted) or time.monotonic() > deadline:
+            break
+        await asyncio.sleep(1)
+    for state in states:
+        if state["entity_id"].startswith("text."):
+            notebook.text_entities.append(state["entity_id"])
+        else:
+            notebook.switch_entities.append(state["entity_id"])
+    return notebook
+
+
+async def async_cleanup(client: Client, notebook: Notebook) -> None:
+    """Delete this run's categories along with their notes and entities."""
+    for category_id in notebook.category_ids:
+        await client.async_call(
+            f"{DOMAIN}/delete_category",
+            entry_id=notebook.entry_id,
+            category_id=category_id,
+        )
+
+
+async def async_diagnostics(
+    session: aiohttp.ClientSession, args: argparse.Namespace, entry_id: str
+) -> dict[str, Any]:
+    """Return the notebook's diagnostics."""
+    async with session.get(
+        f"{args.url.rstrip('/')}/api/diagnostics/config_entry/{entry_id}",
+        headers={"Authorization": f"Bearer {args.token}"},
+    ) as response:
+        response.raise_for_status()
+        return (await response.json())["data"]
+
+
+async def async_panel(
+    client: Client,
+    notebook: Notebook,
+    stats: LoadStats,
+    rng: random.Random,
+    deadline: float,
+    think: float,
+) -> None:
+    """Behave like an open panel: load, browse, search and edit."""
+    entry_id = notebook.entry_id
+    await stats.async_time(
+        "get_data", client.async_call(f"{DOMAIN}/get_data", entry_id=entry_id)
+    )
+    while time.monotonic() < deadline:
+        roll = rng.random()
+        note_id = rng.choice(notebook.note_ids)
+        category_id = notebook.note_categories[note_id]
+        if roll < 0.05:
+            name, command = "get_data_html", "get_data"
+            payload: dict[str, Any] = {"include_html": True}
+        elif roll < 0.30:
+            name = command = "list_notes"
+            payload = {"category_id": category_id, "offset": 0, "limit": 50}
+        elif roll < 0.50:
+            name = command = "query_notes"
+            payload = {"tags_any": [rng.choice(TAGS)]}
+        elif roll < 0.75:
+            name = command = "get_note"
+            payload = {"note_id": note_id}
+        elif roll < 0.95:
+            name = command = "update_note"
+            payload = {"note_id": note_id, "content": _text(rng, 40)}
+        else:
+            name = command = "create_note"
+            payload = {
+                "category_id": category_id,
+                "title": f"Panel note {rng.getrandbits(64):x}",
+                "content": _text(rng, 20),
+            }
+        await stats.async_time(
+            name,
+            client.async_call(f"{DOMAIN}/{command}", entry_id=entry_id, **payload),
+        )
+        await asyncio.sleep(rng.expovariate(1 / think) if think else 0)
+
+
+async def async_automation(
+    client: Client,
+    notebook: Notebook,
+    stats: LoadStats,
+    rng: random.Random,
+    deadline: float,
+    think: float,
+) -> None:
+    """Behave like an automation writing to note entities."""
+    while time.monotonic() < deadline:
+        if notebook.text_entities and (
+            not notebook.switch_entities or rng.random() < 0.7
+        ):
+            call = client.async_call(
+                "call_service",
+                domain="text",
+                service="set_value",
+                service_data={"value": _text(rng, 10)},
+                target={"entity_id": rng.choice(notebook.text_entities)},
+            )
+            await stats.async_time("text_set_value", call)
+        else:
+            call = client.async_call(
+                "call_service",
+                domain="switch",
+                service=rng.choice(("turn_on", "turn_off")),
+                target={"entity_id": rng.choice(notebook.switch_entities)},
+            )
+            await stats.async_time("switch_turn", call)
+        await asyncio.sleep(rng.expovariate(1 / think) if think else 0)
+
+
+def report(
+    stats: LoadStats,
+    elapsed: float,
+    before: dict[str, Any],
+    after: dict[str, Any],
+) -> dict[str, Any]:
+    """Summarize a run."""
+    total = sum(len(op.latencies) for op in stats.ops.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "operations": total,
+        "throughput_ops_s": round(total / elapsed, 1),
+        "ops": {
+            name: {
+                "count": len(op.latencies),
+                "errors": op.errors,
+                "p50_ms": round(op.percentile(50), 3),
+                "p99_ms": round(op.percentile(99), 3),
+                "max_ms": round(max(op.latencies) * 1000, 3),
+            }
+            for name, op in sorted(stats.ops.items())
+            if op.latencies
+        },
+        "ws_messages": stats.messages_received,
+        "ws_bytes": stats.bytes_received,
+        "state_writes": stats.state_writes,
+        "state_bytes": stats.state_bytes,
+        "saves": after["saves"] - before["saves"],
+        "journal": after["journal"],
+        "notes": after["notes"],
+    }
+
+
+async def async_load(
+    args: argparse.Namespace,
+    new_client: Callable[[LoadStats], Client],
+    diagnostics: Callable[[str], Awaitable[dict[str, Any]]],
+) -> dict[str, Any]:
+    """Seed a notebook, run the simulated clients and return the report."""
+    rng = random.Random(args.seed)
+    stats = LoadStats()
+    control = new_client(LoadStats())
+    await control.async_connect()
+    notebook = await async_seed(control, rng, args)
+    if args.automations and not notebook.text_entities:
+        raise SystemExit("No note entities appeared for the seeded notes")
+    entities = {*notebook.text_entities, *notebook.switch_entities}
+
+    def count_state_write(event: dict[str, Any], size: int) -> None:
+        if event["data"]["entity_id"] in entities:
+            stats.state_writes += 1
+            stats.state_bytes += size
+
+    panels = [new_client(stats) for _ in range(args.panels)]
+    automations = new_client(stats)
+    try:
+        for client in (*panels, automations):
+            await client.async_connect()
+        await control.async_subscribe("state_changed", count_state_write)
+        before = await diagnostics(notebook.entry_id)
+
+        deadline = time.monotonic() + args.duration
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                async_panel(
+                    client,
+                    notebook,
+                    stats,
+                    random.Random(rng.random()),
+                    deadline,
+                    args.think,
+                )
+                for client in panels
+            ),
+            *(
+                async_automation(
+                    automations,
+                    notebook,
+                    stats,
+                    random.Random(rng.random()),
+                    deadline,
+                    args.think,
+                )
+                for _ in range(args.automations)
+            ),
+        )
+        elapsed = time.perf_counter() - start
+        after = await diagnostics(notebook.entry_id)
+    finally:
+        for client in (*panels, automations):
+            await client.async_close()
+        if not args.keep:
+            await async_cleanup(control, notebook)
+        await control.async_close()
+    return report(stats, elapsed, before, after)
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Load a running instance over its WebSocket API."""
+    async with aiohttp.ClientSession() as session:
+        return await async_load(
+            args,
+            lambda stats: WebSocketClient(session, args, stats),
+            lambda entry_id: async_diagnostics(session, args, entry_id),
+        )
+
+
+def _free_port() -> int:
+    """Return a local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def async_run_in_process(args: argparse.Namespace) -> dict[str, Any]:
+    """Load a test instance started in this process with a new notebook.
+
+    The instance has its own config dir, so storage and journal writes hit
+    the disk as in production, and serves HTTP only on a free local port.
+    """
+    # Test helpers from a development environment, as the test suite uses
+    from pytest_homeassistant_custom_component.common import (  # noqa: PLC0415
+        MockConfigEntry,
+        async_test_home_assistant,
+    )
+
+    from homeassistant import loader  # noqa: PLC0415
+    from homeassistant.auth.const import GROUP_ID_ADMIN  # noqa: PLC0415
+    from homeassistant.setup import async_setup_component  # noqa: PLC0415
+
+    from custom_components.ha_note_record.const import (  # noqa: PLC0415
+        CONF_DURABLE_WRITES,
+    )
+    from custom_components.ha_note_record.diagnostics import (  # noqa: PLC0415
+        async_get_config_entry_diagnostics,
+    )
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            # As the enable_custom_integrations fixture does
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            assert await async_setup_component(
+                hass,
+                "http",
+                {"http": {"server_host": ["127.0.0.1"], "server_port": _free_port()}},
+            )
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title="Load test",
+                options={CONF_DURABLE_WRITES: args.durable},
+            )
+            entry.add_to_hass(hass)
+            if not await hass.config_entries.async_setup(entry.entry_id):
+                raise SystemExit("Setting up Ha Note Record failed")
+            await hass.async_block_till_done()
+            user = await hass.auth.async_create_system_user(
+                "Load generator", group_ids=[GROUP_ID_ADMIN]
+            )
+            refresh_token = await hass.auth.async_create_refresh_token(user)
+
+            async def diagnostics(entry_id: str) -> dict[str, Any]:
+                entry = hass.config_entries.async_get_entry(entry_id)
+                return await async_get_config_entry_diagnostics(hass, entry)
+
+            result = await async_load(
+                args,
+                lambda stats: InProcessClient(hass, user, refresh_token, stats),
+                diagnostics,
+            )
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+    return result
+
+
+def main() -> None:
+    """Parse arguments, run the load and print the report as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8123")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("HASS_TOKEN"),
+        help="long-lived access token (default: $HASS_TOKEN)",
+    )
+    parser.add_argument("--entry-id", help="notebook to load (default: the default)")
+    parser.add_argument("--panels", type=int, default=10, help="open panels")
+    parser.add_argument("--automations", type=int, default=20, help="automations")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to run")
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--content-words", type=int, default=100)
+    parser.add_argument(
+        "--think", type=float, default=0.01, help="mean pause between ops (s)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--keep", action="store_true", help="keep the seeded categories and notes"
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="load a test instance started in this process instead of --url",
+    )
+    parser.add_argument(
+        "--durable",
+        action="store_true",
+        help="turn on durable writes for the in-process notebook",
+    )
+    args = parser.parse_args()
+    if args.in_process:
+        if ActiveConnection is None:
+            parser.error("--in-process needs a Home Assistant development environment")
+        run = async_run_in_process(args)
+    elif not args.token:
+        parser.error("an access token is required (--token or $HASS_TOKEN)")
+    else:
+        run = async_run(args)
+    print(json.dumps(asyncio.run(run), indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
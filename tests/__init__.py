@@ -0,0 +1 @@
+"""Tests for the Ha Note Record integration."""
@@ -0,0 +1,25 @@
+"""Fixtures for Ha Note Record tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_note_record.store import HaNoteRecordStore
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable custom integrations in every test."""
+
+
+@pytest.fixture
+async def store(hass: HomeAssistant) -> AsyncGenerator[HaNoteRecordStore]:
+    """Return a loaded, empty notebook store."""
+    store = HaNoteRecordStore(hass)
+    await store.async_load()
+    yield store
+    store.expiry.async_stop()
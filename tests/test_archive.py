@@ -0,0 +1,67 @@
+"""Tests for the cold archive tier."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_note_record.archive import NoteArchive, archive_dir
+from custom_components.ha_note_record.const import STORAGE_KEY
+from custom_components.ha_note_record.store import HaNoteRecordStore
+
+INDEX_KEY = f"{STORAGE_KEY}.archive_index"
+
+
+async def _async_archive(store: HaNoteRecordStore, count: int) -> list[str]:
+    """Archive count new notes, two per segment; return their ids."""
+    category = await store.async_create_category("Home")
+    notes = [
+        await store.async_create_note(category.id, f"Note {i}", content=f"Body {i}")
+        for i in range(count)
+    ]
+    with patch(
+        "custom_components.ha_note_record.archive.ARCHIVE_SEGMENT_MAX_NOTES", 2
+    ):
+        await store.async_archive_notes([note.id for note in notes])
+    return [note.id for note in notes]
+
+
+async def test_archive_splits_segments(
+    hass: HomeAssistant, store: HaNoteRecordStore
+) -> None:
+    """Test a large archive operation writes several capped segments."""
+    note_ids = await _async_archive(store, 5)
+
+    assert store.archive.as_diagnostics()["segments"] == 3
+    assert len(list(archive_dir(hass, STORAGE_KEY).iterdir())) == 3
+    assert not store.notes
+    for note_id in note_ids:
+        note = await store.async_read_archived_note(note_id)
+        assert note is not None
+        assert note.content == f"Body {note_ids.index(note_id)}"
+
+
+async def test_load_prunes_notes_back_in_hot_store(
+    hass: HomeAssistant, store: HaNoteRecordStore, hass_storage: dict[str, Any]
+) -> None:
+    """Test loading saves the pruned index and deletes unused segments."""
+    note_ids = await _async_archive(store, 3)
+    directory = archive_dir(hass, STORAGE_KEY)
+    # Left by an archive operation interrupted before its index was saved
+    (directory / "orphan.json.gz.tmp").write_bytes(b"")
+    segments = {entry.segment for entry in store.archive.search()}
+
+    # The first two notes share a segment and were restored, but the
+    # operation was interrupted before the archive dropped them
+    archive = NoteArchive(hass, STORAGE_KEY)
+    await archive.async_load(set(note_ids[:2]))
+
+    assert len(archive) == 1
+    assert [note["id"] for note in hass_storage[INDEX_KEY]["data"]["notes"]] == [
+        note_ids[2]
+    ]
+    kept = archive.get(note_ids[2]).segment
+    assert {path.name for path in directory.iterdir()} == {kept}
+    assert segments == {kept, store.archive.get(note_ids[0]).segment}
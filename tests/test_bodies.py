@@ -0,0 +1,156 @@
+"""Tests for note body deduplication."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_note_record.const import STORAGE_KEY
+from custom_components.ha_note_record.patches import Splice
+from custom_components.ha_note_record.store import HaNoteRecordStore
+from custom_components.ha_note_record.util import content_hash
+
+SHARED = "Buy milk, eggs and bread."
+OTHER = "Call the plumber."
+
+
+def assert_pool_matches(store: HaNoteRecordStore) -> None:
+    """Assert the pool holds exactly one reference per note body."""
+    expected = Counter(content_hash(note.content) for note in store.notes)
+    assert len(store.bodies) == len(expected)
+    for key, count in expected.items():
+        assert store.bodies.refcount(key) == count
+    assert all(note.content_hash == content_hash(note.content) for note in store.notes)
+    diagnostics = store.bodies.as_diagnostics()
+    assert diagnostics["references"] == len(store.notes)
+
+
+async def test_identical_bodies_share_one_entry(store: HaNoteRecordStore) -> None:
+    """Test notes with the same content share one pooled string."""
+    category = await store.async_create_category("Home")
+    notes = [
+        await store.async_create_note(category.id, f"Note {i}", content=SHARED)
+        for i in range(3)
+    ]
+
+    assert len(store.bodies) == 1
+    assert store.bodies.refcount(content_hash(SHARED)) == 3
+    assert notes[0].content is notes[1].content is notes[2].content
+    assert_pool_matches(store)
+
+
+async def test_update_releases_old_body(store: HaNoteRecordStore) -> None:
+    """Test content updates move references between bodies."""
+    category = await store.async_create_category("Home")
+    first = await store.async_create_note(category.id, "First", content=SHARED)
+    second = await store.async_create_note(category.id, "Second", content=SHARED)
+
+    await store.async_update_note(first.id, content=OTHER)
+    assert store.bodies.refcount(content_hash(SHARED)) == 1
+    assert store.bodies.refcount(content_hash(OTHER)) == 1
+    assert_pool_matches(store)
+
+    await store.async_update_note_content(second.id, OTHER)
+    assert store.bodies.refcount(content_hash(SHARED)) == 0
+    assert store.bodies.refcount(content_hash(OTHER)) == 2
+    assert len(store.bodies) == 1
+    assert_pool_matches(store)
+
+    # Updating other fields or writing the same content keeps the reference
+    await store.async_update_note(second.id, title="Renamed", content=OTHER)
+    await store.async_update_note_pinned(second.id, True)
+    assert store.bodies.refcount(content_hash(OTHER)) == 2
+    assert_pool_matches(store)
+
+
+async def test_patch_moves_reference(store: HaNoteRecordStore) -> None:
+    """Test a content patch releases the old body and acquires the new one."""
+    category = await store.async_create_category("Home")
+    note = await store.async_create_note(category.id, "Note", content=SHARED)
+    await store.async_create_note(category.id, "Copy", content=SHARED)
+
+    await store.async_patch_note(note.id, [Splice(0, 3, "Get")], store.cursor)
+
+    assert store.bodies.refcount(content_hash(SHARED)) == 1
+    patched = store.get_note(note.id).content
+    assert patched == "Get" + SHARED[3:]
+    assert store.bodies.refcount(content_hash(patched)) == 1
+    assert_pool_matches(store)
+
+
+async def test_delete_frees_unreferenced_bodies(store: HaNoteRecordStore) -> None:
+    """Test deleting notes drops references and frees the last one."""
+    category = await store.async_create_category("Home")
+    first = await store.async_create_note(category.id, "First", content=SHARED)
+    second = await store.async_create_note(category.id, "Second", content=SHARED)
+    third = await store.async_create_note(category.id, "Third", content=OTHER)
+
+    await store.async_delete_note(first.id)
+    assert store.bodies.refcount(content_hash(SHARED)) == 1
+    assert_pool_matches(store)
+
+    await store.async_delete_notes([second.id, third.id])
+    assert len(store.bodies) == 0
+    assert_pool_matches(store)
+
+
+async def test_cascade_delete_releases_category_bodies(
+    store: HaNoteRecordStore,
+) -> None:
+    """Test deleting a category releases only its notes' references."""
+    home = await store.async_create_category("Home")
+    work = await store.async_create_category("Work")
+    for i in range(3):
+        await store.async_create_note(home.id, f"Home {i}", content=SHARED)
+    await store.async_create_note(home.id, "Home other", content=OTHER)
+    kept = await store.async_create_note(work.id, "Work", content=SHARED)
+
+    removed = await store.async_delete_category_cascade(home.id)
+
+    assert len(removed) == 4
+    assert store.bodies.refcount(content_hash(SHARED)) == 1
+    assert store.bodies.refcount(content_hash(OTHER)) == 0
+    assert store.get_note(kept.id).content == SHARED
+    assert_pool_matches(store)
+
+
+async def test_reload_rebuilds_pool(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test deduplicated storage writes each body once and reloads refcounts."""
+    store = HaNoteRecordStore(hass, dedupe_storage=True)
+    await store.async_load()
+    category = await store.async_create_category("Home")
+    for i in range(4):
+        await store.async_create_note(category.id, f"Note {i}", content=SHARED)
+    await store.async_create_note(category.id, "Other", content=OTHER)
+    store.expiry.async_stop()
+
+    data = hass_storage[STORAGE_KEY]["data"]
+    assert data["bodies"] == {content_hash(SHARED): SHARED, content_hash(OTHER): OTHER}
+    assert all("content" not in note for note in data["notes"])
+
+    reloaded = HaNoteRecordStore(hass, dedupe_storage=True)
+    await reloaded.async_load()
+    assert reloaded.bodies.refcount(content_hash(SHARED)) == 4
+    assert reloaded.bodies.refcount(content_hash(OTHER)) == 1
+    assert_pool_matches(reloaded)
+    reloaded.expiry.async_stop()
+
+
+async def test_shared_body_keeps_rendered_html(store: HaNoteRecordStore) -> None:
+    """Test cached HTML is dropped only when the last note using it changes."""
+    category = await store.async_create_category("Home")
+    first = await store.async_create_note(category.id, "First", content=SHARED)
+    second = await store.async_create_note(category.id, "Second", content=SHARED)
+    await store.async_create_note(category.id, "Third", content=SHARED)
+    store.render_cache.put(SHARED, "<p>shared</p>")
+
+    await store.async_delete_note(first.id)
+    await store.async_update_note(second.id, content=OTHER)
+    assert store.render_cache.get(SHARED) == "<p>shared</p>"
+
+    await store.async_delete_notes([note.id for note in store.notes])
+    assert store.render_cache.get(SHARED) is None
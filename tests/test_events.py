@@ -0,0 +1,123 @@
+"""Tests for the note changed event."""
+
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_note_record.const import EVENT_NOTE_CHANGED
+from custom_components.ha_note_record.store import DuplicateNameError, HaNoteRecordStore
+
+
+async def test_single_note_changes(
+    hass: HomeAssistant, store: HaNoteRecordStore
+) -> None:
+    """Test each single-note change fires one event with the note's details."""
+    events = async_capture_events(hass, EVENT_NOTE_CHANGED)
+    category = await store.async_create_category("Kitchen")
+    assert not events
+
+    note = await store.async_create_note(category.id, "Shopping list")
+    await store.async_update_note(note.id, content="Milk")
+    await store.async_delete_note(note.id)
+
+    assert [event.data for event in events] == [
+        {
+            "note_ids": [note.id],
+            "note_id": note.id,
+            "category_id": category.id,
+            "title": "Shopping list",
+            "deleted": False,
+        },
+    ] * 2 + [
+        {
+            "note_ids": [note.id],
+            "note_id": note.id,
+            "category_id": None,
+            "title": None,
+            "deleted": True,
+        },
+    ]
+
+
+async def test_bulk_changes_fire_one_event(
+    hass: HomeAssistant, store: HaNoteRecordStore
+) -> None:
+    """Test bulk operations fire one event listing every note."""
+    home = await store.async_create_category("Home")
+    work = await store.async_create_category("Work")
+    notes = [
+        await store.async_create_note(home.id, f"Note {i}") for i in range(3)
+    ]
+    note_ids = [note.id for note in notes]
+    events = async_capture_events(hass, EVENT_NOTE_CHANGED)
+
+    await store.async_move_notes(note_ids, work.id)
+    await store.async_delete_category_cascade(work.id)
+
+    assert len(events) == 2
+    moved, removed = (dict(event.data) for event in events)
+    assert sorted(moved.pop("note_ids")) == sorted(note_ids)
+    assert moved == {"category_id": work.id, "deleted": False}
+    assert sorted(removed.pop("note_ids")) == sorted(note_ids)
+    assert removed == {"category_id": None, "deleted": True}
+
+
+async def test_failed_change_fires_nothing(
+    hass: HomeAssistant, store: HaNoteRecordStore
+) -> None:
+    """Test a rejected change does not fire an event."""
+    category = await store.async_create_category("Home")
+    await store.async_create_note(category.id, "Taken")
+    events = async_capture_events(hass, EVENT_NOTE_CHANGED)
+
+    with pytest.raises(DuplicateNameError):
+        await store.async_create_note(category.id, "taken")
+
+    assert not events
+
+
+async def test_unchanged_update_is_a_no_op(
+    hass: HomeAssistant, store: HaNoteRecordStore
+) -> None:
+    """Test an update repeating the note's fields fires and saves nothing."""
+    category = await store.async_create_category("Kitchen")
+    note = await store.async_create_note(
+        category.id, "Shopping list", content="Milk", tags=["food"]
+    )
+    revision = store.revision
+    save_count = store.save_count
+    events = async_capture_events(hass, EVENT_NOTE_CHANGED)
+
+    assert await store.async_update_note(
+        note.id, title="Shopping list", content="Milk", pinned=False, tags=["food"]
+    )
+
+    assert not events
+    assert store.get_note(note.id) is note
+    assert store.get_note(note.id).updated_at == note.updated_at
+    assert store.revision == revision
+    assert store.save_count == save_count
+
+
+async def test_note_listeners_follow_their_note(store: HaNoteRecordStore) -> None:
+    """Test note listeners run only for changes of their own note."""
+    category = await store.async_create_category("Kitchen")
+    first = await store.async_create_note(category.id, "First")
+    second = await store.async_create_note(category.id, "Second")
+    calls: list[str] = []
+    remove = store.async_add_note_listener(first.id, lambda: calls.append("first"))
+    store.async_add_note_listener(second.id, lambda: calls.append("second"))
+
+    await store.async_update_note(first.id, content="Eggs")
+    assert calls == ["first"]
+
+    await store.async_rename_category(category.id, "Pantry")
+    assert sorted(calls) == ["first", "first", "second"]
+
+    remove()
+    await store.async_delete_note(first.id)
+    await store.async_delete_note(second.id)
+    assert sorted(calls) == ["first", "first", "second", "second"]
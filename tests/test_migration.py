@@ -0,0 +1,69 @@
+"""Tests for repairing stored records."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_note_record.const import (
+    STORAGE_KEY,
+    STORAGE_MINOR_VERSION,
+    STORAGE_VERSION,
+)
+from custom_components.ha_note_record.migration import repair_category
+from custom_components.ha_note_record.store import HaNoteRecordStore
+
+NOW = "2026-01-01T00:00:00+00:00"
+
+
+def _category(**fields: Any) -> dict[str, Any]:
+    """Return a valid stored category with fields overridden."""
+    return {"id": "abcdef0123", "name": "Home", "created_at": NOW} | fields
+
+
+@pytest.mark.parametrize("ttl", [None, 1, 86400])
+def test_repair_category_keeps_valid_ttl(ttl: int | None) -> None:
+    """Test a valid default TTL is kept."""
+    raw = _category(default_ttl=ttl)
+    assert repair_category(raw, NOW) is False
+    assert raw["default_ttl"] == ttl
+
+
+@pytest.mark.parametrize("ttl", [0, -5, "3600", 1.5, True, [3600]])
+def test_repair_category_resets_invalid_ttl(ttl: Any) -> None:
+    """Test an invalid default TTL is cleared."""
+    raw = _category(default_ttl=ttl)
+    assert repair_category(raw, NOW) is True
+    assert raw["default_ttl"] is None
+
+
+def test_repair_category_fixes_name_and_timestamp() -> None:
+    """Test a blank name and bad timestamp are replaced, and bad ids dropped."""
+    raw = _category(name=" ", created_at="yesterday")
+    assert repair_category(raw, NOW) is True
+    assert raw["name"] == "abcdef01"
+    assert raw["created_at"] == NOW
+    assert repair_category({"name": "No id"}, NOW) is None
+
+
+async def test_load_repairs_ttl_so_notes_can_be_created(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test a category stored with a bad TTL loads and accepts new notes."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": STORAGE_MINOR_VERSION,
+        "key": STORAGE_KEY,
+        "data": {"categories": [_category(default_ttl="soon")], "notes": []},
+    }
+    store = HaNoteRecordStore(hass)
+    await store.async_load()
+
+    assert store.load_report.repaired == 1
+    note = await store.async_create_note("abcdef0123", "Note")
+    assert note is not None
+    assert note.expires_at is None
+    store.expiry.async_stop()
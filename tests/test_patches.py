@@ -0,0 +1,41 @@
+"""Tests for note content splices."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.ha_note_record.patches import Splice, apply_splices
+from custom_components.ha_note_record.store import HaNoteRecordStore
+
+# "🛒" is outside the BMP: one character, two UTF-16 code units
+CONTENT = "🛒 Milk"
+
+
+def test_offsets_count_utf16_code_units() -> None:
+    """Test offsets after a non-BMP character count it as two units."""
+    assert apply_splices(CONTENT, [Splice(3, 4, "Eggs")]) == "🛒 Eggs"
+    assert apply_splices(CONTENT, [Splice(0, 2, "🥚")]) == "🥚 Milk"
+    # Each splice counts against the previous one's result
+    assert apply_splices(
+        CONTENT, [Splice(7, 0, " 🧀"), Splice(10, 0, "!")]
+    ) == "🛒 Milk 🧀!"
+
+
+@pytest.mark.parametrize(
+    "splice",
+    [Splice(1), Splice(0, 1), Splice(8), Splice(0, 0, "\ud83d")],
+)
+def test_rejects_split_surrogates_and_overruns(splice: Splice) -> None:
+    """Test splices splitting a pair, past the end, or with a lone half fail."""
+    with pytest.raises(ValueError):
+        apply_splices(CONTENT, [splice])
+
+
+async def test_patch_after_non_bmp_character(store: HaNoteRecordStore) -> None:
+    """Test the store applies a frontend patch after a non-BMP character."""
+    category = await store.async_create_category("Home")
+    note = await store.async_create_note(category.id, "Shopping", content=CONTENT)
+
+    await store.async_patch_note(note.id, [Splice(3, 4, "Bread")], store.cursor)
+
+    assert store.get_note(note.id).content == "🛒 Bread"
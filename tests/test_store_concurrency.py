@@ -0,0 +1,139 @@
+"""Stress tests for concurrent store mutations."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_note_record.const import STORAGE_KEY
+from custom_components.ha_note_record.store import DuplicateNameError, HaNoteRecordStore
+
+WORKERS = 8
+OPS_PER_WORKER = 60
+CATEGORY_NAMES = ("Home", "Work", "Garden")
+# A small title pool so concurrent creates and renames collide
+TITLES = tuple(f"Note {i}" for i in range(6))
+
+
+async def _async_worker(store: HaNoteRecordStore, rng: random.Random) -> None:
+    """Run random mutations, tolerating the clashes they provoke."""
+    for _ in range(OPS_PER_WORKER):
+        categories = store.categories
+        notes = store.notes
+        op = rng.random()
+        try:
+            if op < 0.1 or not categories:
+                name = rng.choice(CATEGORY_NAMES)
+                if store.get_category_by_name(name) is None:
+                    await store.async_create_category(name)
+            elif op < 0.45 or not notes:
+                await store.async_create_note(
+                    rng.choice(categories).id,
+                    rng.choice(TITLES),
+                    content=f"body {rng.randrange(4)}",
+                )
+            elif op < 0.65:
+                await store.async_update_note(
+                    rng.choice(notes).id,
+                    title=rng.choice(TITLES),
+                    content=f"body {rng.randrange(4)}",
+                )
+            elif op < 0.75:
+                await store.async_update_note_content(
+                    rng.choice(notes).id, f"body {rng.randrange(4)}"
+                )
+            elif op < 0.9:
+                await store.async_delete_note(rng.choice(notes).id)
+            else:
+                await store.async_delete_category_cascade(rng.choice(categories).id)
+        except DuplicateNameError:
+            pass
+        await asyncio.sleep(0)
+
+
+def assert_indexes_match(store: HaNoteRecordStore) -> None:
+    """Assert titles are unique per category and every index matches the notes."""
+    notes = store.notes
+    categories = {category.id: category for category in store.categories}
+    titles = [(note.category_id, note.title.lower()) for note in notes]
+    assert len(set(titles)) == len(titles)
+    assert store._note_ids_by_title == {  # noqa: SLF001
+        (note.category_id, note.title.lower()): note.id for note in notes
+    }
+    assert store._category_ids_by_name == {  # noqa: SLF001
+        category.name.lower(): category.id for category in categories.values()
+    }
+    for note in notes:
+        assert note.category_id in categories
+        assert store.get_note_by_title(note.category_id, note.title) is note
+    for category in categories.values():
+        in_category = {note.id for note in notes if note.category_id == category.id}
+        assert {
+            note.id for note in store.iter_notes_by_category(category.id)
+        } == in_category
+        assert store.count_notes_in_category(category.id) == len(in_category)
+
+
+def assert_saved_matches(
+    store: HaNoteRecordStore, hass_storage: dict[str, Any]
+) -> None:
+    """Assert the last save holds the store's current state."""
+    data = hass_storage[STORAGE_KEY]["data"]
+    assert {note["id"]: note for note in data["notes"]} == {
+        note.id: note.to_dict() for note in store.notes
+    }
+    assert {category["id"]: category for category in data["categories"]} == {
+        category.id: category.to_dict() for category in store.categories
+    }
+
+
+async def test_concurrent_mutations_keep_indexes_consistent(
+    store: HaNoteRecordStore, hass_storage: dict[str, Any]
+) -> None:
+    """Test racing creates, updates and deletes leave a consistent store."""
+    rng = random.Random(35)
+    await asyncio.gather(
+        *(
+            _async_worker(store, random.Random(rng.getrandbits(32)))
+            for _ in range(WORKERS)
+        )
+    )
+
+    assert_indexes_match(store)
+    assert_saved_matches(store, hass_storage)
+
+
+async def test_concurrent_durable_mutations_reload_consistent(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test racing durable mutations save and reload their final state."""
+    store = HaNoteRecordStore(hass, durable=True)
+    await store.async_load()
+    try:
+        rng = random.Random(36)
+        await asyncio.gather(
+            *(
+                _async_worker(store, random.Random(rng.getrandbits(32)))
+                for _ in range(WORKERS)
+            )
+        )
+        # Durable mutations return before their snapshot is written
+        await store.async_flush()
+
+        assert_indexes_match(store)
+        assert_saved_matches(store, hass_storage)
+
+        reloaded = HaNoteRecordStore(hass, durable=True)
+        await reloaded.async_load()
+        reloaded.expiry.async_stop()
+        assert [note.to_dict() for note in reloaded.notes] == [
+            note.to_dict() for note in store.notes
+        ]
+        assert_indexes_match(reloaded)
+    finally:
+        store.expiry.async_stop()
+        # The journal is a plain file in the config dir, not in hass_storage
+        await store.journal.async_remove()